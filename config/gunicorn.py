@@ -0,0 +1,33 @@
+"""
+Gunicorn configuration: gunicorn -c config/gunicorn.py config.wsgi
+
+The application and the modules it otherwise loads lazily are imported
+once in the master, so forked workers share them. Each worker then runs
+the rest of the warm-up before it accepts requests, so the first requests
+after a deploy don't pay for it. Unless DJANGO_SETTINGS_MODULE says
+otherwise, workers run with the production settings.
+"""
+import multiprocessing
+import os
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.production')
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+preload_app = True
+
+
+def when_ready(server):
+    from contracts.services import warmup
+    warmup.preload_modules()
+
+
+def post_fork(server, worker):
+    from django.db import connections
+    from contracts.services import warmup
+
+    # Never share a connection opened before the fork
+    connections.close_all()
+    steps = [(name, step) for name, step in warmup.STEPS if name != 'modules']
+    for line in warmup.format_timings(warmup.run(steps)):
+        worker.log.info('warm-up %s', line)
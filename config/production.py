@@ -0,0 +1,30 @@
+"""
+Production settings: DJANGO_SETTINGS_MODULE=config.production
+
+Everything in config/settings.py, with debugging off, the secret and hosts
+taken from the environment, and templates compiled once per process by the
+cached loader instead of being re-read and re-compiled on every request.
+"""
+import copy
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, MIDDLEWARE, TEMPLATES
+
+DEBUG = False
+BROWSER_RELOAD = False
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app != 'django_browser_reload']
+MIDDLEWARE = [name for name in MIDDLEWARE if not name.startswith('django_browser_reload.')]
+
+SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+ALLOWED_HOSTS = [host for host in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',') if host]
+
+# The loaders option replaces APP_DIRS, so the app directories loader is listed explicitly
+TEMPLATES = copy.deepcopy(TEMPLATES)
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -27,6 +29,10 @@ DEBUG = True
 
 ALLOWED_HOSTS = ['*']
 
+# Live reload only matters under the development server; other commands and
+# workers skip loading it
+BROWSER_RELOAD = DEBUG and 'runserver' in sys.argv
+
 # CSRF trusted origins for Replit
 CSRF_TRUSTED_ORIGINS = [
     'https://*.replit.dev',
@@ -44,7 +50,6 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
 
-    'django_browser_reload',
     'theme',
     'contracts',
 ]
@@ -57,9 +62,12 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'django_browser_reload.middleware.BrowserReloadMiddleware',
 ]
 
+if BROWSER_RELOAD:
+    INSTALLED_APPS.append('django_browser_reload')
+    MIDDLEWARE.append('django_browser_reload.middleware.BrowserReloadMiddleware')
+
 ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
@@ -73,12 +81,23 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'contracts.context_processors.feature_flags',
+                'contracts.context_processors.fragment_caching',
             ],
         },
     },
 ]
 
+# Seconds a cached template fragment ({% cache %}) is kept. Card fragments are
+# keyed by the object's updated_at and the navigation by the dashboard counter
+# version, which every counted write replaces (queryset updates included, see
+# kanban.apply_moves), so edits show at once. The timeout bounds how long
+# related data a card shows (such as an assignee's name) can lag.
+FRAGMENT_CACHE_TIMEOUT = 600
+
 WSGI_APPLICATION = 'config.wsgi.application'
+# The event stream endpoint holds streams open only under an ASGI server; through
+# WSGI it answers each connection with the new events and the client polls
+ASGI_APPLICATION = 'config.asgi.application'
 
 
 # Database
@@ -92,6 +111,21 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Local memory per process by default. Point CACHE_BACKEND / CACHE_LOCATION at a
+# shared backend (e.g. django.core.cache.backends.redis.RedisCache) so workers
+# share entries, invalidations and recompute locks.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'contracts'),
+        'TIMEOUT': 300,
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
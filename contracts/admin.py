@@ -2,9 +2,15 @@ from django.contrib import admin
 from .models import (
     TrademarkRequest, LegalTask, RiskLog, ComplianceChecklist,
     Workflow, WorkflowTemplate, WorkflowTemplateStep, WorkflowStep, ChecklistItem,
-    DueDiligenceProcess, DueDiligenceTask, DueDiligenceRisk, Budget, BudgetExpense
+    DueDiligenceProcess, DueDiligenceTask, DueDiligenceRisk, Budget, BudgetExpense, Job, Counterparty
 )
 
+@admin.register(Counterparty)
+class CounterpartyAdmin(admin.ModelAdmin):
+    list_display = ('name', 'canonical_name', 'updated_at')
+    search_fields = ('name', 'canonical_name')
+    readonly_fields = ('canonical_name',)
+
 @admin.register(RiskLog)
 class RiskLogAdmin(admin.ModelAdmin):
     list_display = ('title', 'risk_level', 'created_at')
@@ -108,4 +114,11 @@ class WorkflowTemplateStepAdmin(admin.ModelAdmin):
 class WorkflowStepAdmin(admin.ModelAdmin):
     list_display = ['workflow', 'title', 'status', 'assigned_to', 'due_date']
     list_filter = ['status', 'due_date']
-    search_fields = ['workflow__title', 'title']
\ No newline at end of file
+    search_fields = ['workflow__title', 'title']
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'priority', 'attempts', 'progress', 'run_after', 'locked_by']
+    list_filter = ['status', 'name']
+    search_fields = ['name', 'last_error']
+    readonly_fields = ['created_at', 'updated_at', 'finished_at']
@@ -2,63 +2,190 @@
 """
 API views for Ironclad-mode functionality
 """
+import codecs
 import json
-from django.http import JsonResponse
+from collections import Counter
+from datetime import date
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.contrib.auth.decorators import login_required
+from contracts.models import (
+    ClauseUsage, ComplianceChecklist, DueDiligenceProcess, Job, ObligationCandidate, SavedView, TextSignature,
+)
+from contracts.services import (
+    checklists, clause_usage, counterparties, delta_sync, due_diligence, events, expense_import, facets, jobs, kanban,
+    saved_views, snapshots, trademarks,
+)
+# forecasting, near_duplicates and obligation_extraction load NumPy; the
+# views using them import them on first call to keep worker startup light
+from contracts.services import repository
 from contracts.services.repository import get_repository_service
 from contracts.domain.contracts import ListParams, ContractStatus
 
+
+def _list_params(request) -> ListParams:
+    """ListParams from the repository list query string"""
+    status_param = request.GET.getlist('status')
+    contract_type_param = request.GET.getlist('contract_type')
+    counterparty_param = request.GET.getlist('counterparty')
+    people_param = request.GET.getlist('people')
+    risk_min = request.GET.get('risk_min')
+    value_min = request.GET.get('value_min')
+    value_max = request.GET.get('value_max')
+    return ListParams(
+        q=request.GET.get('q'),
+        status=[ContractStatus(s) for s in status_param if s] or None,
+        contract_type=contract_type_param or None,
+        counterparty=[int(c) for c in counterparty_param if c] or None,
+        people=people_param or None,
+        date_from=request.GET.get('date_from') or None,
+        date_to=request.GET.get('date_to') or None,
+        value_min=float(value_min) if value_min else None,
+        value_max=float(value_max) if value_max else None,
+        page=int(request.GET.get('page', 1)),
+        page_size=int(request.GET.get('page_size', 25)),
+        risk_min=float(risk_min) if risk_min else None,
+        sort=request.GET.get('sort'),
+    )
+
 @login_required
 @require_http_methods(["GET"])
 def contracts_api(request):
     """API endpoint for contract listing with filters"""
     try:
-        # Parse query parameters
-        q = request.GET.get('q')
-        status_param = request.GET.getlist('status')
-        contract_type_param = request.GET.getlist('contract_type')
-        page = int(request.GET.get('page', 1))
-        page_size = int(request.GET.get('page_size', 25))
-        sort = request.GET.get('sort')
-        
-        # Convert status strings to enum
-        status_list = None
-        if status_param:
-            status_list = [ContractStatus(s) for s in status_param if s]
-        
-        params = ListParams(
-            q=q,
-            status=status_list,
-            contract_type=contract_type_param if contract_type_param else None,
-            page=page,
-            page_size=page_size,
-            sort=sort
-        )
-        
-        service = get_repository_service(request.user)
-        result = service.list(params)
+        params = _list_params(request)
         
         return JsonResponse({
             'success': True,
-            'data': {
-                'rows': [
-                    {
-                        'id': row.id,
-                        'title': row.title,
-                        'counterparty': row.counterparty,
-                        'status': row.status.value,
-                        'hint': row.hint,
-                        'updated_at': row.updated_at,
-                        'contract_type': row.contract_type,
-                        'value': row.value
-                    } for row in result.rows
-                ],
-                'total': result.total,
-                'page': result.page,
-                'page_size': result.page_size
-            }
+            'data': repository.list_page(request.user, params)
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+@login_required
+@require_http_methods(["GET"])
+def contract_facets_api(request):
+    """Facet counts for the repository filter chips under the current filters"""
+    try:
+        return JsonResponse({
+            'success': True,
+            'data': facets.facet_counts(_list_params(request), request.user)
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+@login_required
+@require_http_methods(["GET"])
+def counterparty_autocomplete_api(request):
+    """Counterparties with a name word starting with ?q="""
+    try:
+        limit = min(int(request.GET.get('limit', counterparties.DEFAULT_LIMIT)), 50)
+        return JsonResponse({
+            'success': True,
+            'data': counterparties.autocomplete(request.GET.get('q', ''), limit)
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+def _saved_view_dict(view):
+    return {
+        'id': view.pk,
+        'name': view.name,
+        'params': view.params,
+        'starred': view.starred,
+        'count': saved_views.cached_count(view),
+        'updated_at': view.updated_at.isoformat(),
+    }
+
+def _saved_view_params(data):
+    """Validated, normalized params for a view from a request body"""
+    return saved_views.params_to_dict(saved_views.params_from_dict(data.get('params') or {}))
+
+@login_required
+@require_http_methods(["GET", "POST"])
+def saved_views_api(request):
+    """API endpoint for listing and creating the user's saved repository views"""
+    try:
+        if request.method == 'POST':
+            data = json.loads(request.body)
+            view = SavedView.objects.create(
+                user=request.user,
+                name=data['name'],
+                params=_saved_view_params(data),
+                starred=bool(data.get('starred', False)),
+            )
+            if view.starred:
+                saved_views.refresh(view)
+            return JsonResponse({
+                'success': True,
+                'data': _saved_view_dict(view)
+            }, status=201)
+        return JsonResponse({
+            'success': True,
+            'data': {'views': [_saved_view_dict(view) for view in request.user.saved_views.all()]}
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+@login_required
+@require_http_methods(["PATCH", "DELETE"])
+def saved_view_api(request, pk):
+    """API endpoint for renaming, starring, re-filtering or deleting one saved view"""
+    view = SavedView.objects.filter(pk=pk, user=request.user).first()
+    if view is None:
+        return JsonResponse({'success': False, 'error': 'Saved view not found'}, status=404)
+    try:
+        if request.method == 'DELETE':
+            view.delete()
+            return JsonResponse({'success': True})
+        data = json.loads(request.body)
+        if 'name' in data:
+            view.name = data['name']
+        if 'params' in data:
+            view.params = _saved_view_params(data)
+        if 'starred' in data:
+            view.starred = bool(data['starred'])
+        view.save()
+        if view.starred:
+            saved_views.refresh(view)
+        return JsonResponse({
+            'success': True,
+            'data': _saved_view_dict(view)
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+@login_required
+@require_http_methods(["GET"])
+def saved_view_results_api(request, pk):
+    """API endpoint for a saved view's result count and first page, served from cache when warm"""
+    view = SavedView.objects.select_related('user').filter(pk=pk, user=request.user).first()
+    if view is None:
+        return JsonResponse({'success': False, 'error': 'Saved view not found'}, status=404)
+    try:
+        result, cached = saved_views.results(view)
+        return JsonResponse({
+            'success': True,
+            'data': dict(result, cached=cached)
         })
     except Exception as e:
         return JsonResponse({
@@ -76,6 +203,18 @@ def bulk_update_contracts(request):
         ids = data.get('ids', [])
         patch = data.get('patch', {})
         
+        if data.get('async'):
+            job = jobs.enqueue(
+                'contracts.bulk_update',
+                {'ids': ids, 'patch': patch, 'user_id': request.user.pk},
+                user=request.user,
+            )
+            return JsonResponse({
+                'success': True,
+                'job_id': job.pk,
+                'message': f'Queued update of {len(ids)} contracts'
+            }, status=202)
+        
         service = get_repository_service(request.user)
         service.bulk_update(ids, patch)
         
@@ -115,3 +254,461 @@ def contract_detail_api(request, contract_id):
             'success': False,
             'error': str(e)
         }, status=404)
+
+@login_required
+@require_http_methods(["GET"])
+def delta_sync_api(request):
+    """API endpoint for contracts, tasks, workflows and obligations changed since ?since=<token>"""
+    try:
+        return JsonResponse({
+            'success': True,
+            'data': delta_sync.changes(request.user, request.GET.get('since'))
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+@login_required
+@require_http_methods(["GET"])
+async def event_stream_api(request):
+    """Server-sent event stream of contract, task and workflow changes; ?topics=contracts,tasks"""
+    topics = [topic for topic in request.GET.get('topics', '').split(',') if topic] or events.TOPICS
+    unknown = set(topics) - set(events.TOPICS)
+    if unknown:
+        return JsonResponse({
+            'success': False,
+            'error': f"Unknown topics: {', '.join(sorted(unknown))}"
+        }, status=400)
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    if last_event_id and not last_event_id.isdigit():
+        return JsonResponse({
+            'success': False,
+            'error': f'Invalid event id: {last_event_id}'
+        }, status=400)
+    user = await request.auser()
+    if isinstance(request, ASGIRequest):
+        content = events.stream(user.pk, topics, last_event_id)
+    else:
+        # A WSGI worker can't hold the stream open; send what is new and let the client reconnect
+        content = events.poll(user.pk, topics, last_event_id)
+    response = StreamingHttpResponse(content, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Stop nginx buffering the stream
+    return response
+
+@login_required
+@require_http_methods(["GET"])
+def job_status_api(request, job_id):
+    """API endpoint for polling background job progress"""
+    try:
+        job = Job.objects.get(pk=job_id, created_by=request.user)
+    except Job.DoesNotExist:
+        return JsonResponse({
+            'success': False,
+            'error': 'Job not found'
+        }, status=404)
+    
+    return JsonResponse({
+        'success': True,
+        'data': {
+            'id': job.pk,
+            'name': job.name,
+            'status': job.status,
+            'progress': job.progress,
+            'progress_message': job.progress_message,
+            'attempts': job.attempts,
+            'result': job.result,
+            'error': job.last_error.splitlines()[-1] if job.last_error else None,
+            'created_at': job.created_at.isoformat(),
+            'finished_at': job.finished_at.isoformat() if job.finished_at else None
+        }
+    })
+
+@login_required
+@require_http_methods(["POST"])
+def legal_task_moves_api(request):
+    """API endpoint for applying a batch of kanban card moves"""
+    try:
+        data = json.loads(request.body)
+        results = kanban.apply_moves(data.get('moves'))
+        return JsonResponse({
+            'success': True,
+            'data': {'moves': results}
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+@login_required
+@require_http_methods(["POST"])
+def legal_task_update_status(request, pk):
+    """API endpoint for moving a single kanban card"""
+    try:
+        data = json.loads(request.body)
+        move = {
+            'id': pk,
+            'status': data.get('status'),
+            'after_id': data.get('after_id'),
+            'before_id': data.get('before_id'),
+            'position': data.get('position'),
+        }
+        result = kanban.apply_moves([move])[0]
+        return JsonResponse({
+            'success': True,
+            'data': result
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+@login_required
+@require_http_methods(["GET"])
+def legal_task_column_api(request, status):
+    """API endpoint for lazily loading more cards into a kanban column"""
+    try:
+        limit = min(int(request.GET.get('limit', kanban.DEFAULT_COLUMN_SIZE)), 100)
+        page = kanban.column_page(status, request.GET.get('cursor'), limit)
+        today = timezone.localdate()
+        return JsonResponse({
+            'success': True,
+            'data': {
+                'status': page['status'],
+                'html': ''.join(
+                    render_to_string('contracts/_task_card.html', {'task': task, 'today': today}, request=request)
+                    for task in page['tasks']
+                ),
+                'ids': [task.pk for task in page['tasks']],
+                'next_cursor': page['next_cursor']
+            }
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+@login_required
+@require_http_methods(["GET"])
+def due_diligence_rollups_api(request):
+    """API endpoint for progress and risk rollups of many due diligence processes"""
+    try:
+        ids = [int(pk) for pk in request.GET.getlist('id') if pk]
+        rollups = due_diligence.get_rollups(ids)
+        return JsonResponse({
+            'success': True,
+            'data': {
+                'rollups': [rollup.to_dict() for rollup in rollups.values()]
+            }
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+@login_required
+@require_http_methods(["POST"])
+def checklist_items_bulk_api(request, pk):
+    """API endpoint for completing or toggling many checklist items at once"""
+    try:
+        if not ComplianceChecklist.objects.filter(pk=pk).exists():
+            return JsonResponse({'success': False, 'error': 'Checklist not found'}, status=404)
+        data = json.loads(request.body)
+        result = checklists.update_checklist_items(
+            pk, data.get('ids', []), data.get('action', 'toggle'), data.get('items', [])
+        )
+        return JsonResponse({
+            'success': True,
+            'data': result
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+@login_required
+@require_http_methods(["POST"])
+def dd_tasks_bulk_api(request, pk):
+    """API endpoint for completing or toggling many due diligence tasks at once"""
+    try:
+        if not DueDiligenceProcess.objects.filter(pk=pk).exists():
+            return JsonResponse({'success': False, 'error': 'Process not found'}, status=404)
+        data = json.loads(request.body)
+        result = checklists.update_dd_tasks(
+            pk, data.get('ids', []), data.get('action', 'toggle'), data.get('items', [])
+        )
+        return JsonResponse({
+            'success': True,
+            'data': result
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+@login_required
+@require_http_methods(["GET"])
+def budget_forecast_api(request):
+    """API endpoint for budget burn-rate forecasts (all budgets unless ids are given)"""
+    from contracts.services import forecasting
+    try:
+        ids = [int(pk) for pk in request.GET.getlist('id') if pk]
+        as_of = request.GET.get('as_of')
+        forecasts = forecasting.forecast_budgets(
+            ids or None,
+            as_of=date.fromisoformat(as_of) if as_of else None
+        )
+        return JsonResponse({
+            'success': True,
+            'data': {
+                'forecasts': [forecast.to_dict() for forecast in forecasts.values()],
+                'status_counts': dict(Counter(forecast.status for forecast in forecasts.values())),
+            }
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+@login_required
+@require_http_methods(["POST"])
+def budget_expense_import_api(request):
+    """API endpoint for importing budget expenses from an uploaded CSV file"""
+    try:
+        upload = request.FILES.get('file')
+        if upload is None:
+            return JsonResponse({'success': False, 'error': 'No file uploaded'}, status=400)
+        # Decode line by line so large files are never held in memory as text
+        report = expense_import.import_expenses(
+            codecs.iterdecode(upload, 'utf-8-sig'),
+            user=request.user,
+            dry_run=request.POST.get('dry_run') in ('1', 'true', 'on'),
+        )
+        return JsonResponse({
+            'success': True,
+            'data': report.to_dict()
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+@login_required
+@require_http_methods(["GET"])
+def trademark_similar_api(request):
+    """API endpoint for existing trademarks that resemble a proposed mark"""
+    try:
+        exclude = [int(pk) for pk in request.GET.getlist('exclude') if pk]
+        matches = trademarks.find_similar(
+            request.GET.get('q', ''),
+            limit=min(int(request.GET.get('limit', trademarks.DEFAULT_LIMIT)), 50),
+            min_score=float(request.GET.get('min_score', trademarks.DEFAULT_MIN_SCORE)),
+            exclude_ids=exclude,
+        )
+        return JsonResponse({
+            'success': True,
+            'data': {
+                'results': [match.to_dict() for match in matches],
+                'conflict_score': trademarks.CONFLICT_SCORE,
+            }
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+@login_required
+@require_http_methods(["GET"])
+def clause_usage_api(request):
+    """API endpoint for clause usage counts, or the contracts using one clause"""
+    try:
+        clause_id = request.GET.get('clause_id')
+        if not clause_id:
+            return JsonResponse({
+                'success': True,
+                'data': {'clauses': clause_usage.usage_counts()}
+            })
+        usages = (
+            ClauseUsage.objects.filter(clause_id=clause_id)
+            .select_related('contract')
+            .order_by('-occurrences', 'contract_id')[:int(request.GET.get('limit', 100))]
+        )
+        return JsonResponse({
+            'success': True,
+            'data': {
+                'clause_id': clause_id,
+                'contracts': [
+                    {
+                        'id': usage.contract_id,
+                        'title': usage.contract.title,
+                        'status': usage.contract.status,
+                        'occurrences': usage.occurrences,
+                    }
+                    for usage in usages
+                ],
+            }
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+
+def _signature_kind(request):
+    kind = request.GET.get('kind', TextSignature.Kind.CONTRACT)
+    if kind not in TextSignature.Kind.values:
+        raise ValueError(f'Unknown kind: {kind}')
+    return kind
+
+
+@login_required
+@require_http_methods(["GET"])
+def near_duplicates_api(request):
+    """API endpoint for contracts or clauses that nearly duplicate one given by `kind` and `id`"""
+    from contracts.services import near_duplicates
+    try:
+        kind = _signature_kind(request)
+        object_id = request.GET.get('id')
+        if not object_id:
+            raise ValueError('id is required')
+        threshold = float(request.GET.get('threshold', near_duplicates.DEFAULT_THRESHOLD))
+        matches = near_duplicates.find_near_duplicates(kind, object_id, threshold=threshold)
+        return JsonResponse({
+            'success': True,
+            'data': {
+                'kind': kind,
+                'id': object_id,
+                'threshold': threshold,
+                'results': [match.to_dict() for match in matches],
+            }
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+
+@login_required
+@require_http_methods(["GET"])
+def duplicate_clusters_api(request):
+    """API endpoint for the groups of near-duplicate contracts or clauses"""
+    from contracts.services import near_duplicates
+    try:
+        kind = _signature_kind(request)
+        threshold = float(request.GET.get('threshold', near_duplicates.DEFAULT_THRESHOLD))
+        clusters = near_duplicates.duplicate_clusters(kind, threshold=threshold)
+        return JsonResponse({
+            'success': True,
+            'data': {
+                'kind': kind,
+                'threshold': threshold,
+                'clusters': [cluster.to_dict() for cluster in clusters],
+            }
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+
+def _candidate_dict(candidate):
+    return {
+        'id': candidate.pk,
+        'contract_id': candidate.contract_id,
+        'contract_title': candidate.contract.title,
+        'rule': candidate.rule,
+        'title': candidate.title,
+        'due_date': candidate.due_date.isoformat() if candidate.due_date else None,
+        'excerpt': candidate.excerpt,
+        'status': candidate.status,
+        'obligation_id': candidate.obligation_id,
+    }
+
+
+@login_required
+@require_http_methods(["GET"])
+def obligation_candidates_api(request):
+    """API endpoint for extracted obligation candidates, proposed ones by default"""
+    try:
+        candidates = ObligationCandidate.objects.select_related('contract').filter(
+            status=request.GET.get('status', ObligationCandidate.Status.PROPOSED)
+        )
+        if request.GET.get('contract_id'):
+            candidates = candidates.filter(contract_id=request.GET['contract_id'])
+        candidates = candidates[:int(request.GET.get('limit', 100))]
+        return JsonResponse({
+            'success': True,
+            'data': {'candidates': [_candidate_dict(candidate) for candidate in candidates]}
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+
+@login_required
+@require_http_methods(["POST"])
+def obligation_candidate_review_api(request, pk):
+    """API endpoint for accepting or rejecting one obligation candidate"""
+    from contracts.services import obligation_extraction
+    try:
+        candidate = ObligationCandidate.objects.select_related('contract').filter(pk=pk).first()
+        if candidate is None:
+            return JsonResponse({'success': False, 'error': 'Candidate not found'}, status=404)
+        data = json.loads(request.body)
+        action = data.get('action')
+        if action == 'accept':
+            obligation_extraction.accept(
+                candidate, request.user,
+                assigned_to=data.get('assigned_to', ''), priority=data.get('priority', 'medium'),
+            )
+        elif action == 'reject':
+            obligation_extraction.reject(candidate, request.user)
+        else:
+            raise ValueError(f'Unknown action: {action}')
+        return JsonResponse({
+            'success': True,
+            'data': _candidate_dict(candidate)
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+
+@login_required
+@require_http_methods(["GET"])
+def trend_api(request, source):
+    """API endpoint for status-over-time series, read from the daily snapshot table only"""
+    try:
+        data = snapshots.trend(
+            source,
+            days=int(request.GET.get('days', snapshots.DEFAULT_TREND_DAYS)),
+            owner_id=request.GET.get('owner') or None,
+            metric=request.GET.get('metric', 'count'),
+        )
+        return JsonResponse({
+            'success': True,
+            'data': data
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
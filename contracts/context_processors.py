@@ -1,11 +1,26 @@
-
 """
 Context processors for adding global template variables
 """
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+
 from config.feature_flags import ironclad_mode
+from contracts.services import caching, dashboard
 
 def feature_flags(request):
     """Add feature flags to template context"""
     return {
         'ironclad_mode': ironclad_mode(),
     }
+
+def fragment_caching(request):
+    """Add the values {% cache %} fragments are timed and keyed by.
+
+    The navigation counts are lazy, so a page whose navigation fragment is
+    cached never reads them.
+    """
+    return {
+        'fragment_timeout': settings.FRAGMENT_CACHE_TIMEOUT,
+        'nav_counts': SimpleLazyObject(dashboard.counters),
+        'nav_version': SimpleLazyObject(lambda: caching.version(dashboard.CACHE_NAMESPACE)),
+    }
@@ -0,0 +1,91 @@
+"""
+Aho-Corasick multi-pattern matching
+
+Builds one automaton from many patterns so a text is scanned once, in time
+linear in its length plus the number of matches, however many patterns
+there are. Texts and patterns are normalized the same way (lowercase words
+separated by single spaces) so formatting differences do not hide matches.
+"""
+import re
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+
+def normalize(text: str) -> str:
+    return _NON_WORD.sub(' ', (text or '').lower()).strip()
+
+
+class Automaton:
+    """Matches whole-word occurrences of normalized patterns, keyed by pattern id"""
+
+    def __init__(self, patterns: Iterable[Tuple[str, str]]):
+        # Node 0 is the root; each node has goto edges, a failure link and
+        # the (pattern key, pattern length) pairs that end there.
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[str, int]]] = [[]]
+        for key, pattern in patterns:
+            pattern = normalize(pattern)
+            if pattern:
+                self._add(key, pattern)
+        self._link()
+
+    def __len__(self) -> int:
+        return sum(len(out) for out in self._out)
+
+    def _add(self, key: str, pattern: str) -> None:
+        node = 0
+        for char in pattern:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((key, len(pattern)))
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def iter_matches(self, text: str, normalized: bool = False) -> Iterator[Tuple[str, int]]:
+        """Yield (pattern key, start offset in the normalized text) per match"""
+        if not normalized:
+            text = normalize(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        last = len(text) - 1
+        for end, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if not out[node]:
+                continue
+            # Only whole-word matches count
+            if end != last and text[end + 1] != ' ':
+                continue
+            for key, length in out[node]:
+                start = end - length + 1
+                if start == 0 or text[start - 1] == ' ':
+                    yield key, start
+
+    def summarize(self, text: str) -> Dict[str, Tuple[int, int]]:
+        """pattern key -> (occurrences, first offset) for one text"""
+        found: Dict[str, Tuple[int, int]] = {}
+        for key, start in self.iter_matches(text):
+            count, first = found.get(key, (0, start))
+            found[key] = (count + 1, first)
+        return found
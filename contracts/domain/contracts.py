@@ -11,6 +11,11 @@ class ContractStatus(str, Enum):
     ACTIVE = "ACTIVE" 
     INACTIVE = "INACTIVE"
     UNVERIFIED = "UNVERIFIED"
+    # Lifecycle statuses stored on Contract.status
+    UNDER_REVIEW = "UNDER_REVIEW"
+    APPROVED = "APPROVED"
+    EXECUTED = "EXECUTED"
+    EXPIRED = "EXPIRED"
 
 @dataclass
 class ContractData:
@@ -22,15 +27,33 @@ class ContractData:
     updated_at: str = ""
     contract_type: Optional[str] = None
     value: Optional[float] = None
+    risk_score: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'title': self.title,
+            'counterparty': self.counterparty,
+            'status': self.status.value,
+            'hint': self.hint,
+            'updated_at': self.updated_at,
+            'contract_type': self.contract_type,
+            'value': self.value,
+            'risk_score': self.risk_score
+        }
 
 @dataclass
 class ListParams:
     q: Optional[str] = None
     status: Optional[List[ContractStatus]] = None
     contract_type: Optional[List[str]] = None
+    counterparty: Optional[List[int]] = None
     people: Optional[List[str]] = None
     date_from: Optional[str] = None
     date_to: Optional[str] = None
+    value_min: Optional[float] = None
+    value_max: Optional[float] = None
+    risk_min: Optional[float] = None
     sort: Optional[str] = None
     page: int = 1
     page_size: int = 25
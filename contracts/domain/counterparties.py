@@ -0,0 +1,37 @@
+"""
+Canonical counterparty names
+
+"Apple Inc.", "APPLE, INC" and "apple" name the same party. The canonical
+form is the normalized name without trailing legal-form suffixes, and is
+what Counterparty rows are deduplicated and prefix-searched on.
+"""
+from typing import List
+
+from contracts.domain.similarity import normalize
+
+# Trailing words dropped from canonical names, in normalized form
+LEGAL_SUFFIXES = frozenset({
+    'inc', 'incorporated', 'corp', 'corporation', 'co', 'company', 'llc', 'llp', 'lp', 'ltd', 'limited',
+    'plc', 'gmbh', 'ag', 'sa', 'sas', 'sarl', 'bv', 'nv', 'srl', 'spa', 'pty', 'kk', 'oy', 'ab',
+})
+
+
+def _join_initials(words: List[str]) -> List[str]:
+    """Initialisms like "S.A." normalize to "s a"; rejoin runs of single letters"""
+    joined: List[str] = []
+    in_run = False
+    for word in words:
+        if len(word) == 1 and in_run:
+            joined[-1] += word
+        else:
+            joined.append(word)
+        in_run = len(word) == 1
+    return joined
+
+
+def canonical_name(name: str) -> str:
+    """e.g. 'Spotify Technology S.A.' -> 'spotify technology'"""
+    words = _join_initials(normalize(name).split())
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
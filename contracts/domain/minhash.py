@@ -0,0 +1,72 @@
+"""
+MinHash signatures and LSH banding for near-duplicate text detection
+
+A text is reduced to its set of word shingles; NUM_PERM seeded hash
+functions each keep the minimum hash over that set. The fraction of equal
+positions in two signatures estimates the Jaccard similarity of the texts.
+Splitting a signature into BANDS bands and hashing each band gives bucket
+keys that near-duplicates are likely to share, so candidates are found by
+key lookup instead of comparing every pair.
+"""
+import hashlib
+import zlib
+from typing import List, Set
+
+import numpy as np
+
+from contracts.domain.similarity import normalize
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+
+# a * x + b stays below 2**64 with a < 2**31 and 32-bit shingle hashes
+_PRIME = np.uint64(4294967311)
+_rng = np.random.default_rng(20240601)
+_A = _rng.integers(1, 2 ** 31, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, 2 ** 32, NUM_PERM, dtype=np.uint64)
+
+SIGNATURE_DTYPE = np.uint32
+
+
+def shingles(text: str) -> Set[str]:
+    words = normalize(text).split()
+    if len(words) <= SHINGLE_SIZE:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def signature(text: str) -> np.ndarray:
+    """NUM_PERM-long uint32 signature; all-max for texts without words"""
+    hashed = np.fromiter((zlib.crc32(s.encode()) for s in shingles(text)), dtype=np.uint64)
+    if not len(hashed):
+        return np.full(NUM_PERM, np.iinfo(SIGNATURE_DTYPE).max, dtype=SIGNATURE_DTYPE)
+    permuted = (np.outer(_A, hashed) + _B[:, None]) % _PRIME
+    return permuted.min(axis=1).astype(SIGNATURE_DTYPE)
+
+
+def to_bytes(sig: np.ndarray) -> bytes:
+    return sig.astype(SIGNATURE_DTYPE).tobytes()
+
+
+def from_bytes(data: bytes) -> np.ndarray:
+    return np.frombuffer(bytes(data), dtype=SIGNATURE_DTYPE)
+
+
+def band_keys(sig: np.ndarray) -> List[int]:
+    """One signed 64-bit bucket key per band"""
+    return [
+        int.from_bytes(hashlib.blake2b(sig[band * ROWS:(band + 1) * ROWS].tobytes(), digest_size=8).digest(),
+                       'big', signed=True)
+        for band in range(BANDS)
+    ]
+
+
+def estimate_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+def is_empty(sig: np.ndarray) -> bool:
+    """True for the signature of a text without words, which should not be banded"""
+    return bool((sig == np.iinfo(SIGNATURE_DTYPE).max).all())
@@ -0,0 +1,201 @@
+"""
+Rule-based obligation extraction
+
+Contract text is split into sentences; a sentence that imposes a duty
+("shall", "must", "agrees to", ...) and contains a recognised deadline
+phrase yields one candidate obligation. Deadlines are either relative
+("within 30 days"), absolute ("no later than March 1, 2025"), anniversaries
+("annually on June 30") or recurring ("quarterly"), and are resolved
+against a reference date such as the contract's start.
+"""
+import calendar
+import re
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+# Bump when rules change so incremental runs re-extract every contract
+RULES_VERSION = 1
+
+TITLE_LENGTH = 80
+
+_MONTHS = {name.lower(): number for number, name in enumerate(calendar.month_name) if name}
+_MONTHS.update({name.lower(): number for number, name in enumerate(calendar.month_abbr) if name})
+_MONTH = r'(?P<month>' + '|'.join(sorted(_MONTHS, key=len, reverse=True)) + r')\.?'
+
+_NUMBER_WORDS = {
+    'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7, 'eight': 8,
+    'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12, 'fourteen': 14, 'fifteen': 15, 'twenty': 20,
+    'thirty': 30, 'forty-five': 45, 'forty five': 45, 'sixty': 60, 'ninety': 90,
+}
+# "30", "thirty" or "thirty (30)"
+_COUNT = (r'(?:(?P<word>' + '|'.join(sorted(_NUMBER_WORDS, key=len, reverse=True)) + r')\s*)?'
+          r'(?:\(?(?P<digits>\d{1,4})\)?)?')
+
+_SENTENCE = re.compile(r'[^.;!?\n]+(?:[.;!?]|\n|$)')
+_DUTY = re.compile(r'\b(?:shall|must|will|agrees? to|is required to|are required to)\s+(?:not\s+)?', re.I)
+
+
+@dataclass
+class Candidate:
+    rule: str
+    title: str
+    due_date: Optional[date]
+    excerpt: str
+    offset: int
+
+    def to_dict(self) -> Dict:
+        return {
+            'rule': self.rule,
+            'title': self.title,
+            'due_date': self.due_date.isoformat() if self.due_date else None,
+            'excerpt': self.excerpt,
+            'offset': self.offset,
+        }
+
+
+@dataclass
+class Rule:
+    name: str
+    pattern: re.Pattern
+    resolve: Callable[[re.Match, date], Optional[date]]
+
+
+def _count(match: re.Match) -> Optional[int]:
+    if match.group('digits'):
+        return int(match.group('digits'))
+    if match.group('word'):
+        return _NUMBER_WORDS[match.group('word').lower()]
+    return None
+
+
+def add_months(start: date, months: int) -> date:
+    month = start.month - 1 + months
+    year = start.year + month // 12
+    month = month % 12 + 1
+    return date(year, month, min(start.day, calendar.monthrange(year, month)[1]))
+
+
+def _relative(match: re.Match, reference: date) -> Optional[date]:
+    count = _count(match)
+    if count is None:
+        return None
+    unit = match.group('unit').lower()
+    if unit.startswith('business'):
+        return np.busday_offset(np.datetime64(reference, 'D'), count, roll='forward').astype(date)
+    if unit.startswith('week'):
+        return reference + timedelta(weeks=count)
+    if unit.startswith('month'):
+        return add_months(reference, count)
+    if unit.startswith('year'):
+        return add_months(reference, 12 * count)
+    return reference + timedelta(days=count)
+
+
+def _month_day(match: re.Match) -> Optional[date]:
+    year = int(match.group('year')) if match.groupdict().get('year') else 2000
+    month = _MONTHS[(match.group('month') or match.group('month2')).lower()]
+    day = int(match.group('day') or match.group('day2'))
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _absolute(match: re.Match, reference: date) -> Optional[date]:
+    if match.group('iso'):
+        try:
+            return date.fromisoformat(match.group('iso'))
+        except ValueError:
+            return None
+    return _month_day(match)
+
+
+def _anniversary(match: re.Match, reference: date) -> Optional[date]:
+    day = _month_day(match)
+    if day is None:
+        return None
+    for year in (reference.year, reference.year + 1):
+        try:
+            due = day.replace(year=year)
+        except ValueError:  # 29 February
+            due = date(year, 3, 1)
+        if due >= reference:
+            return due
+    return None
+
+
+_PERIODS = {'weekly': 0, 'monthly': 1, 'quarterly': 3, 'semi-annually': 6, 'annually': 12, 'yearly': 12}
+
+
+def _recurring(match: re.Match, reference: date) -> Optional[date]:
+    months = _PERIODS[match.group('period').lower()]
+    return reference + timedelta(weeks=1) if not months else add_months(reference, months)
+
+
+# "June 30" or "30th of June"
+_DAY_MONTH = (
+    rf'(?:{_MONTH}\s+(?P<day>\d{{1,2}})(?:st|nd|rd|th)?'
+    rf'|(?P<day2>\d{{1,2}})(?:st|nd|rd|th)?\s+(?:of\s+)?{_MONTH.replace("month", "month2")})'
+)
+
+RULES: List[Rule] = [
+    Rule('relative', re.compile(
+        rf'\b(?:within|no later than|not later than|not more than)\s+{_COUNT}\s*'
+        r'(?P<unit>business days?|calendar days?|days?|weeks?|months?|years?)\b', re.I), _relative),
+    Rule('anniversary', re.compile(
+        rf'\b(?:annually|yearly|each year|every year)\s+(?:on|by|before)\s+(?:the\s+)?{_DAY_MONTH}', re.I),
+        _anniversary),
+    Rule('anniversary', re.compile(
+        rf'\b(?:on|by|before)\s+(?:the\s+)?{_DAY_MONTH}\s+(?:of\s+)?(?:each|every)\s+year', re.I), _anniversary),
+    Rule('absolute', re.compile(
+        rf'\b(?:on or before|no later than|not later than|by|before|on)\s+(?:the\s+)?'
+        rf'(?:(?P<iso>\d{{4}}-\d{{2}}-\d{{2}})|{_DAY_MONTH},?\s+(?P<year>\d{{4}}))', re.I), _absolute),
+    Rule('recurring', re.compile(
+        r'\b(?P<period>weekly|monthly|quarterly|semi-annually|annually|yearly)\b', re.I), _recurring),
+]
+
+
+def _title(sentence: str, duty: re.Match, deadline: re.Match) -> str:
+    """The duty's verb phrase, without the deadline: 'Deliver the goods'"""
+    start = duty.end()
+    end = deadline.start() if deadline.start() > start else len(sentence)
+    phrase = re.sub(r'\s+', ' ', sentence[start:end]).strip(' ,.;:')
+    phrase = re.sub(r'\s+(?:and|or|,)$', '', phrase)
+    if not phrase:
+        phrase = re.sub(r'\s+', ' ', sentence).strip(' ,.;:')
+    if len(phrase) > TITLE_LENGTH:
+        phrase = phrase[:TITLE_LENGTH - 3].rsplit(' ', 1)[0] + '...'
+    return phrase[:1].upper() + phrase[1:]
+
+
+def extract(text: str, reference: date) -> List[Candidate]:
+    """Candidate obligations in `text`, in document order"""
+    candidates = []
+    for sentence_match in _SENTENCE.finditer(text or ''):
+        sentence = sentence_match.group()
+        duty = _DUTY.search(sentence)
+        if not duty:
+            continue
+        for rule in RULES:
+            deadline = rule.pattern.search(sentence, duty.end())
+            if not deadline:
+                continue
+            due = rule.resolve(deadline, reference)
+            if due is None:
+                continue
+            candidates.append(Candidate(
+                rule=rule.name,
+                title=_title(sentence, duty, deadline),
+                due_date=due,
+                excerpt=re.sub(r'\s+', ' ', sentence).strip(),
+                offset=sentence_match.start(),
+            ))
+            break
+    return candidates
+
+
+def rules_fingerprint() -> str:
+    return f'{RULES_VERSION}:' + '|'.join(rule.pattern.pattern for rule in RULES)
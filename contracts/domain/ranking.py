@@ -0,0 +1,94 @@
+"""
+Lexicographic rank keys for manually ordered lists (kanban columns)
+
+Keys are base-36 fractions written without the leading "0.", so plain string
+comparison orders them and a key can always be generated strictly between any
+two others. Moving a card therefore rewrites only that card's key instead of
+renumbering the whole column.
+"""
+from typing import List, Optional
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+
+# Appends and prepends step through fixed-width keys so that the common
+# "add to end of column" case keeps keys short instead of growing by a digit
+# every few inserts.
+KEY_WIDTH = 6
+STEP = BASE ** 2
+
+
+def _to_int(key: str) -> int:
+    value = 0
+    for char in key:
+        value = value * BASE + DIGITS.index(char)
+    return value
+
+
+def _to_key(value: int, width: int = KEY_WIDTH) -> str:
+    chars = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        chars.append(DIGITS[digit])
+    return ''.join(reversed(chars)).rstrip('0')
+
+
+def _validate(key: Optional[str]) -> None:
+    if key is None:
+        return
+    if key == '' or key.endswith('0') or any(c not in DIGITS for c in key):
+        raise ValueError(f"Invalid rank key: {key!r}")
+
+
+def _midpoint(a: str, b: Optional[str]) -> str:
+    """Key strictly between a and b, where '' is the start and None the end"""
+    if b is not None:
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else '0') == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + _midpoint(a[n:], b[n:])
+
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else BASE
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b) // 2]
+    if b is not None and len(b) > 1:
+        return b[0]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def key_after(a: str) -> str:
+    value = _to_int(a[:KEY_WIDTH].ljust(KEY_WIDTH, '0')) + STEP
+    if value < BASE ** KEY_WIDTH:
+        return _to_key(value)
+    return _midpoint(a, None)
+
+
+def key_before(b: str) -> str:
+    value = _to_int(b[:KEY_WIDTH].ljust(KEY_WIDTH, '0')) - STEP
+    if value > 0:
+        return _to_key(value)
+    return _midpoint('', b)
+
+
+def key_between(a: Optional[str], b: Optional[str]) -> str:
+    """Generate a key that sorts strictly after `a` and strictly before `b`"""
+    _validate(a)
+    _validate(b)
+    if a is not None and b is not None and a >= b:
+        raise ValueError(f"Rank keys out of order: {a!r} >= {b!r}")
+    if a is None and b is None:
+        return _to_key(BASE ** KEY_WIDTH // 2)
+    if b is None:
+        return key_after(a)
+    if a is None:
+        return key_before(b)
+    return _midpoint(a, b)
+
+
+def spread_keys(count: int) -> List[str]:
+    """Evenly spaced keys for initially ranking `count` existing rows"""
+    span = BASE ** KEY_WIDTH
+    gap = span // (count + 1)
+    return [_to_key(gap * (i + 1)) for i in range(count)]
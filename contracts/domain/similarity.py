@@ -0,0 +1,78 @@
+"""
+Text keys for trademark similarity search
+
+Marks are compared on padded character trigrams (spelling) and Soundex codes
+(sound). Both reduce a mark to a small set of short terms, so candidates can
+be found by exact term lookups instead of scoring every stored mark.
+"""
+import re
+import unicodedata
+from typing import Set
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys('bfpv', '1'),
+    **dict.fromkeys('cgjkqsxz', '2'),
+    **dict.fromkeys('dt', '3'),
+    'l': '4',
+    **dict.fromkeys('mn', '5'),
+    'r': '6',
+}
+
+# Weight of spelling vs. sound in the combined score
+TRIGRAM_WEIGHT = 0.75
+PHONETIC_WEIGHT = 0.25
+
+
+def normalize(text: str) -> str:
+    """Lowercase ASCII words separated by single spaces"""
+    text = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode('ascii')
+    return _NON_ALNUM.sub(' ', text.lower()).strip()
+
+
+def trigrams(text: str) -> Set[str]:
+    """Character trigrams of the normalized mark, padded so short marks still match"""
+    normalized = normalize(text)
+    if not normalized:
+        return set()
+    padded = f'  {normalized} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def soundex(word: str) -> str:
+    """American Soundex code of one word, e.g. 'robert' -> 'R163'"""
+    word = ''.join(c for c in word.lower() if c.isalpha())
+    if not word:
+        return ''
+    code = word[0].upper()
+    previous = _SOUNDEX_CODES.get(word[0], '')
+    for char in word[1:]:
+        digit = _SOUNDEX_CODES.get(char, '')
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # h and w do not separate letters with the same code; vowels do
+        if char not in 'hw':
+            previous = digit
+    return code.ljust(4, '0')
+
+
+def phonetic_keys(text: str) -> Set[str]:
+    """Soundex of each word plus of the whole mark run together"""
+    words = normalize(text).split()
+    keys = {soundex(word) for word in words}
+    if len(words) > 1:
+        keys.add(soundex(''.join(words)))
+    keys.discard('')
+    return keys
+
+
+def score(query_grams: Set[str], query_keys: Set[str], grams: Set[str], keys: Set[str]) -> float:
+    """Dice coefficient of trigrams blended with the share of matching sound keys"""
+    if not query_grams or not grams:
+        return 0.0
+    dice = 2 * len(query_grams & grams) / (len(query_grams) + len(grams))
+    phonetic = len(query_keys & keys) / len(query_keys) if query_keys else 0.0
+    return round(TRIGRAM_WEIGHT * dice + PHONETIC_WEIGHT * phonetic, 3)
@@ -13,7 +13,7 @@ User = get_user_model()
 class ContractForm(forms.ModelForm):
     class Meta:
         model = Contract
-        fields = ['title', 'content', 'status']
+        fields = ['title', 'counterparty', 'contract_type', 'content', 'status', 'value']
         widgets = {
             'content': forms.Textarea(attrs={'rows': 10}),
         }
@@ -68,7 +68,7 @@ class DueDiligenceRiskForm(forms.ModelForm):
     class Meta:
         model = DueDiligenceRisk
         fields = ['title', 'category', 'description', 'risk_level', 'likelihood',
-                 'impact', 'mitigation_strategy', 'owner', 'target_resolution_date']
+                 'impact', 'mitigation_strategy', 'owner', 'target_resolution_date', 'contract']
         widgets = {
             'target_resolution_date': forms.DateInput(attrs={'type': 'date'}),
             'description': forms.Textarea(attrs={'rows': 3}),
@@ -124,7 +124,7 @@ class LegalTaskForm(forms.ModelForm):
 class RiskLogForm(forms.ModelForm):
     class Meta:
         model = RiskLog
-        fields = ['title', 'description', 'risk_level', 'mitigation_strategy']
+        fields = ['title', 'description', 'risk_level', 'mitigation_strategy', 'linked_contract']
 
 
 class ComplianceChecklistForm(forms.ModelForm):
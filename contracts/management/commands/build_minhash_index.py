@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from contracts.services import near_duplicates
+
+
+class Command(BaseCommand):
+    help = 'Compute MinHash signatures and LSH bands for all contracts and library clauses'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=near_duplicates.BUILD_BATCH_SIZE,
+                            help='Contracts signed per transaction')
+        parser.add_argument('--force', action='store_true',
+                            help='Recompute signatures even for unchanged texts')
+
+    def handle(self, *args, **options):
+        stats = near_duplicates.build_all(force=options['force'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Signed {stats['contracts']} contracts and {stats['clauses']} clauses."
+        ))
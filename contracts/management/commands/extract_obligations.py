@@ -0,0 +1,26 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from contracts.services import obligation_extraction
+
+
+class Command(BaseCommand):
+    help = 'Propose obligations found in contract text for review'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Extraction processes (1 extracts in this process)')
+        parser.add_argument('--batch-size', type=int, default=obligation_extraction.SCAN_BATCH_SIZE,
+                            help='Contracts per batch sent to a worker')
+        parser.add_argument('--force', action='store_true',
+                            help='Re-extract contracts even if neither they nor the rules changed')
+
+    def handle(self, *args, **options):
+        stats = obligation_extraction.extract_all(
+            workers=options['workers'], force=options['force'], batch_size=options['batch_size']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Extracted {stats['scanned']} contracts ({stats['skipped']} unchanged), "
+            f"proposed {stats['candidates']} obligations."
+        ))
@@ -0,0 +1,46 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from contracts.services import expense_import
+
+
+class Command(BaseCommand):
+    help = 'Import budget expenses from a CSV file (year, quarter, department, description, amount, category, date)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file to import')
+        parser.add_argument('--chunk-size', type=int, default=expense_import.DEFAULT_CHUNK_SIZE,
+                            help='Rows written per bulk insert')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Validate the file without creating any expenses')
+        parser.add_argument('--user', help='Username recorded as creator of the expenses')
+        parser.add_argument('--report', help='Write the full error report to this JSON file')
+
+    def handle(self, *args, **options):
+        user = None
+        if options['user']:
+            user = User.objects.filter(username=options['user']).first()
+            if user is None:
+                raise CommandError(f"Unknown user: {options['user']}")
+
+        try:
+            with open(options['path'], newline='', encoding='utf-8-sig') as handle:
+                report = expense_import.import_expenses(
+                    handle, user=user, chunk_size=options['chunk_size'], dry_run=options['dry_run']
+                )
+        except (OSError, expense_import.ExpenseImportError) as e:
+            raise CommandError(str(e))
+
+        if options['report']:
+            with open(options['report'], 'w') as handle:
+                json.dump(report.to_dict(), handle, indent=2)
+
+        for error in report.errors[:20]:
+            self.stdout.write(self.style.WARNING(f"Line {error['line']}: {error['errors']}"))
+        verb = 'Validated' if options['dry_run'] else 'Imported'
+        count = report.valid if options['dry_run'] else report.created
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {count} of {report.rows} rows ({report.error_count} rejected).'
+        ))
@@ -0,0 +1,17 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from contracts.services import events
+
+
+class Command(BaseCommand):
+    help = 'Delete logged change events older than the replay window (run every few minutes, e.g. from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--minutes', type=int, default=int(events.EVENT_RETENTION.total_seconds() // 60),
+                            help='Keep events from this many minutes back')
+
+    def handle(self, *args, **options):
+        deleted = events.prune(timedelta(minutes=options['minutes']))
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} change events."))
@@ -0,0 +1,17 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from contracts.services import delta_sync
+
+
+class Command(BaseCommand):
+    help = 'Delete delta sync tombstones older than the retention window (run daily)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=delta_sync.TOMBSTONE_RETENTION.days,
+                            help='Keep tombstones from this many days back')
+
+    def handle(self, *args, **options):
+        deleted = delta_sync.prune_tombstones(timedelta(days=options['days']))
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} tombstones."))
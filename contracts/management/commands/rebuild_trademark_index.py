@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from contracts.services import trademarks
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the trademark similarity index from all trademark requests'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Index entries written per bulk insert')
+
+    def handle(self, *args, **options):
+        indexed = trademarks.rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} trademark requests.'))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from contracts.services import budgets
+
+
+class Command(BaseCommand):
+    help = 'Recompute budget spend counters from expenses and repair any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report drifted budgets without changing them')
+
+    def handle(self, *args, **options):
+        drifted = budgets.reconcile(fix=not options['dry_run'])
+        for row in drifted:
+            self.stdout.write(self.style.WARNING(
+                f"Budget {row['budget_id']}: spent {row['spent_total']} -> {row['actual_total']}, "
+                f"count {row['expense_count']} -> {row['actual_count']}"
+            ))
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS('All budget counters are in sync.'))
+        elif options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{len(drifted)} budgets have drifted.'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Repaired {len(drifted)} budgets.'))
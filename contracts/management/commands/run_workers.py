@@ -0,0 +1,93 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from contracts.services import catalogs, jobs
+
+
+class Command(BaseCommand):
+    help = 'Run background job workers against the database-backed job queue'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2,
+                            help='Number of concurrent worker threads')
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Seconds to sleep when the queue is empty')
+        parser.add_argument('--burst', action='store_true',
+                            help='Exit once the queue is drained instead of polling forever')
+        parser.add_argument('--stale-after', type=int, default=jobs.STALE_LOCK_SECONDS,
+                            help='Requeue RUNNING jobs whose lock is older than this many seconds')
+
+    def handle(self, *args, **options):
+        jobs.autodiscover()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._stats = {'succeeded': 0, 'failed': 0, 'retried': 0}
+
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, self._request_stop)
+            signal.signal(signal.SIGTERM, self._request_stop)
+
+        requeued = jobs.requeue_stale(options['stale_after'])
+        if requeued:
+            self.stdout.write(self.style.WARNING(f'Requeued {requeued} stale jobs.'))
+
+        worker_count = max(1, options['workers'])
+        base_id = jobs.default_worker_id()
+        threads = [
+            threading.Thread(
+                target=self._work,
+                args=(f'{base_id}/{i}', options['poll_interval'], options['burst']),
+                daemon=True,
+            )
+            for i in range(worker_count)
+        ]
+        self.stdout.write(self.style.SUCCESS(f'Starting {worker_count} workers...'))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(timeout=0.5)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Workers stopped: {self._stats['succeeded']} succeeded, "
+            f"{self._stats['retried']} retried, {self._stats['failed']} failed."
+        ))
+
+    def _request_stop(self, signum, frame):
+        self.stdout.write('Shutting down after current jobs finish...')
+        self._stop.set()
+
+    def _work(self, worker_id, poll_interval, burst):
+        try:
+            while not self._stop.is_set():
+                close_old_connections()
+                # Re-check the shared service catalogs for each job, as for each request
+                catalogs.expire_all()
+                job_row = jobs.run_once(worker_id)
+                if job_row is None:
+                    if burst:
+                        return
+                    self._stop.wait(poll_interval)
+                    continue
+                self._report(worker_id, job_row)
+        finally:
+            connection.close()
+
+    def _report(self, worker_id, job_row):
+        status = job_row.status
+        with self._lock:
+            if status == job_row.Status.SUCCEEDED:
+                self._stats['succeeded'] += 1
+                self.stdout.write(f'[{worker_id}] {job_row} done')
+            elif status == job_row.Status.QUEUED:
+                self._stats['retried'] += 1
+                self.stdout.write(self.style.WARNING(
+                    f'[{worker_id}] {job_row} failed, retry {job_row.attempts}/{job_row.max_attempts} '
+                    f'at {job_row.run_after:%H:%M:%S}'
+                ))
+            else:
+                self._stats['failed'] += 1
+                self.stdout.write(self.style.ERROR(f'[{worker_id}] {job_row} failed permanently'))
@@ -0,0 +1,26 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from contracts.services import clause_usage
+
+
+class Command(BaseCommand):
+    help = 'Scan contracts for clause library usage and update the usage index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Matcher processes (1 scans in this process)')
+        parser.add_argument('--batch-size', type=int, default=clause_usage.SCAN_BATCH_SIZE,
+                            help='Contracts per batch sent to a worker')
+        parser.add_argument('--force', action='store_true',
+                            help='Rescan contracts even if neither they nor the library changed')
+
+    def handle(self, *args, **options):
+        stats = clause_usage.scan_all(
+            workers=options['workers'], force=options['force'], batch_size=options['batch_size']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Scanned {stats['scanned']} contracts ({stats['skipped']} unchanged), "
+            f"recorded {stats['usages']} clause usages."
+        ))
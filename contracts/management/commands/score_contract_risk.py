@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from contracts.services import risk_scoring
+
+
+class Command(BaseCommand):
+    help = 'Recompute the risk score of every contract'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=risk_scoring.SCORE_BATCH_SIZE,
+                            help='Contracts scored per batch')
+
+    def handle(self, *args, **options):
+        stats = risk_scoring.score_all(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Scored {stats['scored']} contracts, {stats['changed']} changed."
+        ))
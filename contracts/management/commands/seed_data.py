@@ -78,6 +78,9 @@ class Command(BaseCommand):
         for i, (title, counterparty) in enumerate(contract_data):
             contract = Contract.objects.create(
                 title=title,
+                counterparty=counterparty,
+                contract_type=random.choice(Contract.ContractType.values),
+                created_by=random.choice(users),
                 content=f"Contract content for {title}. This is a sample contract with standard terms and conditions.",
                 status=random.choice(statuses)
             )
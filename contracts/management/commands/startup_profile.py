@@ -0,0 +1,80 @@
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# What the profiled interpreter runs for each target
+TARGETS = {
+    'setup': 'import django; django.setup()',
+    'urls': (
+        'import django, importlib; django.setup(); '
+        'from django.conf import settings; importlib.import_module(settings.ROOT_URLCONF)'
+    ),
+}
+
+
+def parse_importtime(output: str) -> List[Tuple[str, int, int]]:
+    """(module, self µs, cumulative µs) for each line of `python -X importtime` output"""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if self_us.strip().isdigit():
+            rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def group_self_time(rows: List[Tuple[str, int, int]], depth: int) -> Dict[str, int]:
+    """Self time summed per module name cut to `depth` dotted parts"""
+    totals: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in rows:
+        totals['.'.join(name.split('.')[:depth])] += self_us
+    return totals
+
+
+class Command(BaseCommand):
+    help = 'Report import-time cost per module for a cold start of Django, the URLconf or a command'
+
+    def add_arguments(self, parser):
+        parser.add_argument('target', nargs='?', default='urls',
+                            help="'setup', 'urls' (setup plus the URLconf, as a web worker) or a "
+                                 "management command name to run")
+        parser.add_argument('args', nargs='*', help='Arguments for a profiled management command')
+        parser.add_argument('--limit', type=int, default=25, help='Rows to show')
+        parser.add_argument('--depth', type=int, default=2,
+                            help='Group modules by this many leading name parts (0 lists every module)')
+
+    def handle(self, *args, target='urls', limit=25, depth=2, **options):
+        if target in TARGETS:
+            code = TARGETS[target]
+        else:
+            code = ('from django.core.management import execute_from_command_line; '
+                    f'execute_from_command_line({["manage.py", target, *args]!r})')
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings')}
+        started = time.perf_counter()
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=settings.BASE_DIR, env=env,
+                                capture_output=True, text=True)
+        elapsed = time.perf_counter() - started
+        rows = parse_importtime(result.stderr)
+        if result.returncode != 0 and not rows:
+            raise CommandError(result.stderr.strip()[-2000:])
+
+        if depth > 0:
+            costs = sorted(group_self_time(rows, depth).items(), key=lambda item: -item[1])
+        else:
+            costs = sorted(((name, cumulative) for name, _, cumulative in rows), key=lambda item: -item[1])
+        total_us = sum(self_us for _, self_us, _ in rows)
+
+        self.stdout.write(f"{'Module':<50} {'ms':>9} {'share':>7}")
+        for name, cost_us in costs[:limit]:
+            self.stdout.write(f'{name:<50} {cost_us / 1000:>9.1f} {cost_us / max(total_us, 1):>7.1%}')
+        self.stdout.write(self.style.SUCCESS(
+            f"'{target}': {len(rows)} modules imported in {total_us / 1000:.0f} ms "
+            f"({elapsed * 1000:.0f} ms wall clock)."
+        ))
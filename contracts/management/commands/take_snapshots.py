@@ -0,0 +1,19 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from contracts.services import snapshots
+
+
+class Command(BaseCommand):
+    help = 'Record the daily status snapshot used by trend reports (run nightly)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', type=date.fromisoformat, default=None,
+                            help='Snapshot day as YYYY-MM-DD (default: today); rewrites that day')
+
+    def handle(self, *args, **options):
+        written = snapshots.take_snapshot(options['date'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {sum(written.values())} snapshot rows for {len(written)} sources."
+        ))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from contracts.services import warmup
+
+
+class Command(BaseCommand):
+    help = 'Resolve URLs, compile templates, load models and prime caches, reporting each step\'s time'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--skip', action='append', default=[], choices=[name for name, _ in warmup.STEPS],
+                            help='Step to leave out (repeatable)')
+
+    def handle(self, *args, **options):
+        steps = [(name, step) for name, step in warmup.STEPS if name not in options['skip']]
+        if not steps:
+            raise CommandError('Every step was skipped')
+        for line in warmup.format_timings(warmup.run(steps)):
+            self.stdout.write(line)
+        self.stdout.write(self.style.SUCCESS('Warm-up complete.'))
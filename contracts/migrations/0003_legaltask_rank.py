@@ -0,0 +1,37 @@
+# Generated by Django 5.2.5 on 2026-10-19 18:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+from contracts.domain.ranking import spread_keys
+
+
+def backfill_ranks(apps, schema_editor):
+    LegalTask = apps.get_model('contracts', 'LegalTask')
+    statuses = LegalTask.objects.values_list('status', flat=True).distinct()
+    for status in list(statuses):
+        tasks = list(LegalTask.objects.filter(status=status).order_by('due_date', 'id'))
+        for task, rank in zip(tasks, spread_keys(len(tasks))):
+            task.rank = rank
+        LegalTask.objects.bulk_update(tasks, ['rank'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0002_job'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='legaltask',
+            name='rank',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.RunPython(backfill_ranks, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='legaltask',
+            index=models.Index(fields=['status', 'rank'], name='legaltask_status_rank_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.5 on 2026-10-19 18:27
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_counters(apps, schema_editor):
+    Budget = apps.get_model('contracts', 'Budget')
+    BudgetExpense = apps.get_model('contracts', 'BudgetExpense')
+    totals = BudgetExpense.objects.order_by().values('budget_id').annotate(total=Sum('amount'), count=Count('id'))
+    budgets = []
+    for row in totals:
+        budgets.append(Budget(pk=row['budget_id'], spent_total=row['total'], expense_count=row['count']))
+    Budget.objects.bulk_update(budgets, ['spent_total', 'expense_count'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0003_legaltask_rank'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='budget',
+            name='expense_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='budget',
+            name='spent_total',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0'), editable=False, max_digits=14),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-19 18:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from contracts.domain import similarity
+
+
+def index_existing_marks(apps, schema_editor):
+    TrademarkRequest = apps.get_model('contracts', 'TrademarkRequest')
+    TrademarkIndexEntry = apps.get_model('contracts', 'TrademarkIndexEntry')
+    entries = []
+    for pk, mark_text in TrademarkRequest.objects.values_list('pk', 'mark_text'):
+        entries += [TrademarkIndexEntry(trademark_id=pk, kind='T', term=gram) for gram in similarity.trigrams(mark_text)]
+        entries += [TrademarkIndexEntry(trademark_id=pk, kind='P', term=key) for key in similarity.phonetic_keys(mark_text)]
+    TrademarkIndexEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0004_budget_spend_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrademarkIndexEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('T', 'Trigram'), ('P', 'Phonetic')], max_length=1)),
+                ('term', models.CharField(max_length=8)),
+                ('trademark', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='index_entries', to='contracts.trademarkrequest')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'term', 'trademark'], name='trademark_term_idx')],
+            },
+        ),
+        migrations.RunPython(index_existing_marks, migrations.RunPython.noop),
+    ]
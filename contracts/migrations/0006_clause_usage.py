@@ -0,0 +1,42 @@
+# Generated by Django 5.2.5 on 2026-10-19 18:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0005_trademark_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClauseUsage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('clause_id', models.CharField(max_length=64)),
+                ('occurrences', models.PositiveIntegerField(default=1)),
+                ('first_offset', models.PositiveIntegerField(default=0)),
+                ('contract', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='clause_usages', to='contracts.contract')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['clause_id', 'contract'], name='clause_usage_clause_idx')],
+                'constraints': [models.UniqueConstraint(fields=('contract', 'clause_id'), name='unique_clause_usage')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ContractScan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('analyzer', models.CharField(choices=[('clauses', 'Clause usage')], max_length=20)),
+                ('content_hash', models.CharField(max_length=40)),
+                ('rules_version', models.CharField(max_length=40)),
+                ('scanned_at', models.DateTimeField(auto_now=True)),
+                ('contract', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scans', to='contracts.contract')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('contract', 'analyzer'), name='unique_contract_scan')],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.5 on 2026-10-19 18:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0006_clause_usage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TextSignature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('contract', 'Contract'), ('clause', 'Clause')], max_length=10)),
+                ('object_id', models.CharField(max_length=64)),
+                ('content_hash', models.CharField(max_length=40)),
+                ('signature', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_text_signature')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SignatureBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('bucket', models.BigIntegerField()),
+                ('signature', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bands', to='contracts.textsignature')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['band', 'bucket'], name='signature_band_bucket_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.5 on 2026-10-19 18:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0007_text_signatures'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='contractscan',
+            name='analyzer',
+            field=models.CharField(choices=[('clauses', 'Clause usage'), ('obligations', 'Obligation extraction')], max_length=20),
+        ),
+        migrations.CreateModel(
+            name='ObligationCandidate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rule', models.CharField(max_length=20)),
+                ('title', models.CharField(max_length=200)),
+                ('due_date', models.DateField(blank=True, null=True)),
+                ('excerpt', models.TextField()),
+                ('offset', models.PositiveIntegerField(default=0)),
+                ('status', models.CharField(choices=[('PROPOSED', 'Proposed'), ('ACCEPTED', 'Accepted'), ('REJECTED', 'Rejected')], default='PROPOSED', max_length=10)),
+                ('obligation_id', models.CharField(blank=True, max_length=64)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('contract', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='obligation_candidates', to='contracts.contract')),
+                ('reviewed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reviewed_obligation_candidates', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['contract', 'offset'],
+                'indexes': [models.Index(fields=['status', 'due_date'], name='obligation_cand_status_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-19 18:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0008_obligation_candidates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contract',
+            name='risk_score',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='contract',
+            name='value',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=15, null=True),
+        ),
+        migrations.AddField(
+            model_name='duediligencerisk',
+            name='contract',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='dd_risks', to='contracts.contract'),
+        ),
+        migrations.AddField(
+            model_name='risklog',
+            name='linked_contract',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='risk_logs', to='contracts.contract'),
+        ),
+        migrations.AddIndex(
+            model_name='contract',
+            index=models.Index(fields=['risk_score'], name='contract_risk_score_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-19 18:49
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0009_contract_risk_score'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('source', models.CharField(max_length=30)),
+                ('status', models.CharField(max_length=30)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total', models.DecimalField(blank=True, decimal_places=2, max_digits=18, null=True)),
+                ('owner', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['source', 'date'], name='status_snapshot_source_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-19 18:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0010_status_snapshots'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contract',
+            name='contract_type',
+            field=models.CharField(blank=True, choices=[('NDA', 'NDA'), ('MSA', 'Master Services Agreement'), ('SOW', 'Statement of Work'), ('EMPLOYMENT', 'Employment'), ('LICENSE', 'License'), ('DPA', 'Data Processing Agreement'), ('SLA', 'Service Level Agreement'), ('PARTNERSHIP', 'Partnership'), ('OTHER', 'Other')], max_length=20),
+        ),
+        migrations.AddField(
+            model_name='contract',
+            name='counterparty',
+            field=models.CharField(blank=True, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='contract',
+            name='created_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='contracts', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.5 on 2026-10-19 18:56
+
+import django.db.models.deletion
+from collections import Counter
+
+from django.db import migrations, models
+
+from contracts.domain.counterparties import canonical_name
+
+
+def backfill_counterparties(apps, schema_editor):
+    Contract = apps.get_model('contracts', 'Contract')
+    Counterparty = apps.get_model('contracts', 'Counterparty')
+    raw_names = Counter(Contract.objects.exclude(counterparty='').values_list('counterparty', flat=True))
+    # Each canonical name keeps its most used spelling as the display name
+    names = {}
+    for raw, _ in raw_names.most_common():
+        names.setdefault(canonical_name(raw), raw.strip())
+    entities = {
+        entity.canonical_name: entity.pk
+        for entity in Counterparty.objects.bulk_create(
+            Counterparty(name=name, canonical_name=canonical) for canonical, name in names.items() if canonical
+        )
+    }
+    for raw in raw_names:
+        entity_id = entities.get(canonical_name(raw))
+        if entity_id:
+            Contract.objects.filter(counterparty=raw).update(counterparty_entity_id=entity_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0011_contract_type_counterparty_owner'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Counterparty',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('canonical_name', models.CharField(max_length=200, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'counterparties',
+            },
+        ),
+        migrations.AddField(
+            model_name='contract',
+            name='counterparty_entity',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='contracts', to='contracts.counterparty'),
+        ),
+        migrations.RunPython(backfill_counterparties, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0012_counterparty'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='contract',
+            name='created_by',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='contracts', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='contract',
+            index=models.Index(fields=['created_by', 'updated_at'], name='contract_owner_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contract',
+            index=models.Index(fields=['created_by', 'value'], name='contract_owner_value_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contract',
+            index=models.Index(fields=['created_by', 'counterparty_entity', 'updated_at'], name='contract_owner_party_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contract',
+            index=models.Index(fields=['created_by', 'counterparty'], name='contract_owner_party_name_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:08
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0014_saved_view'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('contract', 'Contract'), ('legal_task', 'Legal task'), ('workflow', 'Workflow')], max_length=20)),
+                ('object_id', models.CharField(max_length=64)),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='workflow',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='legaltask',
+            index=models.Index(fields=['updated_at'], name='legaltask_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workflow',
+            index=models.Index(fields=['updated_at'], name='workflow_updated_idx'),
+        ),
+        migrations.AddField(
+            model_name='tombstone',
+            name='owner',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['kind', 'deleted_at'], name='tombstone_kind_deleted_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0015_delta_sync'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('topic', models.CharField(max_length=20)),
+                ('type', models.CharField(max_length=40)),
+                ('payload', models.JSONField(default=dict)),
+                ('origin', models.CharField(max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('owner', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:26
+
+import contracts.models
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0016_change_event'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogVersion',
+            fields=[
+                ('kind', models.CharField(max_length=20, primary_key=True, serialize=False)),
+                ('version', models.BigIntegerField(default=0)),
+                ('epoch', models.CharField(default=contracts.models._new_epoch, max_length=32)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CatalogRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=20)),
+                ('key', models.CharField(max_length=64)),
+                ('data', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('deleted', models.BooleanField(default=False)),
+                ('version', models.BigIntegerField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'version'], name='catalog_record_version_idx')],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'key'), name='unique_catalog_record')],
+            },
+        ),
+    ]
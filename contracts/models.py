@@ -1,12 +1,38 @@
 
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MinValueValidator
+from django.utils import timezone
 from decimal import Decimal
+import uuid
+
+from contracts.domain import counterparties
+from contracts.domain.ranking import key_between
 
 User = get_user_model()
 
 
+class Counterparty(models.Model):
+    """A distinct contract party; Contract.counterparty strings resolve to one by canonical name"""
+    name = models.CharField(max_length=200)
+    # Set from the first name seen; renaming keeps the identity
+    canonical_name = models.CharField(max_length=200, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'counterparties'
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        if not self.canonical_name:
+            self.canonical_name = counterparties.canonical_name(self.name)
+        super().save(*args, **kwargs)
+
+
 class Contract(models.Model):
     class Status(models.TextChoices):
         DRAFT = 'DRAFT', 'Draft'
@@ -15,16 +41,177 @@ class Contract(models.Model):
         EXECUTED = 'EXECUTED', 'Executed'
         EXPIRED = 'EXPIRED', 'Expired'
 
+    class ContractType(models.TextChoices):
+        NDA = 'NDA', 'NDA'
+        MSA = 'MSA', 'Master Services Agreement'
+        SOW = 'SOW', 'Statement of Work'
+        EMPLOYMENT = 'EMPLOYMENT', 'Employment'
+        LICENSE = 'LICENSE', 'License'
+        DPA = 'DPA', 'Data Processing Agreement'
+        SLA = 'SLA', 'Service Level Agreement'
+        PARTNERSHIP = 'PARTNERSHIP', 'Partnership'
+        OTHER = 'OTHER', 'Other'
+
     title = models.CharField(max_length=200)
     content = models.TextField()
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.DRAFT)
+    contract_type = models.CharField(max_length=20, choices=ContractType.choices, blank=True)
+    counterparty = models.CharField(max_length=200, blank=True)
+    # Resolved from `counterparty` on save
+    counterparty_entity = models.ForeignKey(Counterparty, on_delete=models.SET_NULL, null=True, blank=True,
+                                            editable=False, related_name='contracts')
+    # Indexed as the leading column of the owner_* indexes below
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True,
+                                   related_name='contracts', db_index=False)
+    value = models.DecimalField(max_digits=15, decimal_places=2, null=True, blank=True)
+    # 0-100, maintained by contracts.services.risk_scoring
+    risk_score = models.FloatField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['risk_score'], name='contract_risk_score_idx'),
+            # Repository lists are scoped to an owner, then filtered or sorted
+            models.Index(fields=['created_by', 'updated_at'], name='contract_owner_updated_idx'),
+            models.Index(fields=['created_by', 'value'], name='contract_owner_value_idx'),
+            models.Index(fields=['created_by', 'counterparty_entity', 'updated_at'], name='contract_owner_party_idx'),
+            models.Index(fields=['created_by', 'counterparty'], name='contract_owner_party_name_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
 
+class SavedView(models.Model):
+    """A user's named repository filter combination, stored as serialized ListParams"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='saved_views')
+    name = models.CharField(max_length=100)
+    params = models.JSONField(default=dict, blank=True)
+    # Starred views have their first page kept warm by contracts.services.saved_views
+    starred = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-starred', 'name']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'name'], name='unique_saved_view_name'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class ContractScan(models.Model):
+    """Which version of a contract's content an analyzer last processed"""
+    class Analyzer(models.TextChoices):
+        CLAUSES = 'clauses', 'Clause usage'
+        OBLIGATIONS = 'obligations', 'Obligation extraction'
+
+    contract = models.ForeignKey(Contract, on_delete=models.CASCADE, related_name='scans')
+    analyzer = models.CharField(max_length=20, choices=Analyzer.choices)
+    content_hash = models.CharField(max_length=40)
+    # Fingerprint of the analyzer's rules (e.g. the clause library) at scan time
+    rules_version = models.CharField(max_length=40)
+    scanned_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['contract', 'analyzer'], name='unique_contract_scan'),
+        ]
+
+    def __str__(self):
+        return f'{self.contract_id} {self.analyzer}'
+
+
+class ClauseUsage(models.Model):
+    """A library clause found in a contract's content"""
+    clause_id = models.CharField(max_length=64)
+    contract = models.ForeignKey(Contract, on_delete=models.CASCADE, related_name='clause_usages')
+    occurrences = models.PositiveIntegerField(default=1)
+    first_offset = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['contract', 'clause_id'], name='unique_clause_usage'),
+        ]
+        indexes = [
+            models.Index(fields=['clause_id', 'contract'], name='clause_usage_clause_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.clause_id} in {self.contract_id}'
+
+
+class ObligationCandidate(models.Model):
+    """An obligation proposed by rule-based extraction, pending review"""
+    class Status(models.TextChoices):
+        PROPOSED = 'PROPOSED', 'Proposed'
+        ACCEPTED = 'ACCEPTED', 'Accepted'
+        REJECTED = 'REJECTED', 'Rejected'
+
+    contract = models.ForeignKey(Contract, on_delete=models.CASCADE, related_name='obligation_candidates')
+    rule = models.CharField(max_length=20)
+    title = models.CharField(max_length=200)
+    due_date = models.DateField(null=True, blank=True)
+    excerpt = models.TextField()
+    offset = models.PositiveIntegerField(default=0)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PROPOSED)
+    # Id in the obligation service once accepted
+    obligation_id = models.CharField(max_length=64, blank=True)
+    reviewed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True,
+                                    related_name='reviewed_obligation_candidates')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['contract', 'offset']
+        indexes = [
+            models.Index(fields=['status', 'due_date'], name='obligation_cand_status_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.contract_id}: {self.title}'
+
+
+class TextSignature(models.Model):
+    """MinHash signature of a contract or library clause; see contracts.services.near_duplicates"""
+    class Kind(models.TextChoices):
+        CONTRACT = 'contract', 'Contract'
+        CLAUSE = 'clause', 'Clause'
+
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    # Contract pk or library clause id
+    object_id = models.CharField(max_length=64)
+    content_hash = models.CharField(max_length=40)
+    # uint32 array as raw bytes (contracts.domain.minhash.to_bytes)
+    signature = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_text_signature'),
+        ]
+
+    def __str__(self):
+        return f'{self.kind}:{self.object_id}'
+
+
+class SignatureBand(models.Model):
+    """LSH bucket of one band of a TextSignature"""
+    signature = models.ForeignKey(TextSignature, on_delete=models.CASCADE, related_name='bands')
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['band', 'bucket'], name='signature_band_bucket_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.signature_id}:{self.band}:{self.bucket}'
+
+
 class NegotiationThread(models.Model):
     contract = models.ForeignKey(Contract, on_delete=models.CASCADE, related_name='negotiation_threads')
     round_number = models.PositiveIntegerField()
@@ -68,6 +255,25 @@ class TrademarkRequest(models.Model):
         return self.mark_text
 
 
+class TrademarkIndexEntry(models.Model):
+    """One similarity search term of a trademark; see contracts.services.trademarks"""
+    class Kind(models.TextChoices):
+        TRIGRAM = 'T', 'Trigram'
+        PHONETIC = 'P', 'Phonetic'
+
+    trademark = models.ForeignKey(TrademarkRequest, on_delete=models.CASCADE, related_name='index_entries')
+    kind = models.CharField(max_length=1, choices=Kind.choices)
+    term = models.CharField(max_length=8)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['kind', 'term', 'trademark'], name='trademark_term_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.trademark_id}:{self.kind}:{self.term}'
+
+
 class LegalTask(models.Model):
     class Priority(models.TextChoices):
         LOW = 'LOW', 'Low'
@@ -87,12 +293,28 @@ class LegalTask(models.Model):
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
     assigned_to = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
     due_date = models.DateField()
+    rank = models.CharField(max_length=255, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'rank'], name='legaltask_status_rank_idx'),
+            models.Index(fields=['updated_at'], name='legaltask_updated_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # New cards go to the bottom of their kanban column
+        if not self.rank:
+            last = (LegalTask.objects.filter(status=self.status)
+                    .exclude(rank='').order_by('-rank')
+                    .values_list('rank', flat=True).first())
+            self.rank = key_between(last, None)
+        super().save(*args, **kwargs)
+
 
 class RiskLog(models.Model):
     class RiskLevel(models.TextChoices):
@@ -104,6 +326,8 @@ class RiskLog(models.Model):
     description = models.TextField()
     risk_level = models.CharField(max_length=10, choices=RiskLevel.choices)
     mitigation_strategy = models.TextField(blank=True)
+    linked_contract = models.ForeignKey(Contract, on_delete=models.SET_NULL, null=True, blank=True,
+                                        related_name='risk_logs')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -186,6 +410,13 @@ class Workflow(models.Model):
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.ACTIVE)
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Also touched when one of its steps changes
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['updated_at'], name='workflow_updated_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -292,6 +523,9 @@ class DueDiligenceRisk(models.Model):
         STRATEGIC = 'STRATEGIC', 'Strategic'
 
     process = models.ForeignKey(DueDiligenceProcess, on_delete=models.CASCADE, related_name='dd_risks')
+    # The contract the risk was found in, if any
+    contract = models.ForeignKey(Contract, on_delete=models.SET_NULL, null=True, blank=True,
+                                 related_name='dd_risks')
     title = models.CharField(max_length=200)
     category = models.CharField(max_length=20, choices=RiskCategory.choices)
     description = models.TextField()
@@ -321,6 +555,9 @@ class Budget(models.Model):
     department = models.CharField(max_length=100)
     allocated_amount = models.DecimalField(max_digits=12, decimal_places=2, validators=[MinValueValidator(Decimal('0'))])
     description = models.TextField(blank=True)
+    # Maintained from BudgetExpense writes; see contracts.services.budgets
+    spent_total = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0'), editable=False)
+    expense_count = models.PositiveIntegerField(default=0, editable=False)
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -332,7 +569,13 @@ class Budget(models.Model):
 
     @property
     def spent_amount(self):
-        return self.expenses.aggregate(total=models.Sum('amount'))['total'] or Decimal('0')
+        return self.spent_total
+
+    @property
+    def utilization_percentage(self):
+        if not self.allocated_amount:
+            return 0
+        return round(self.spent_total * 100 / self.allocated_amount, 1)
 
     @property
     def remaining_amount(self):
@@ -363,3 +606,129 @@ class BudgetExpense(models.Model):
 
     def __str__(self):
         return f'{self.budget} - {self.description} (${self.amount})'
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what the budget counters currently include for this row
+        instance._counted = (instance.__dict__.get('budget_id'), instance.__dict__.get('amount'))
+        return instance
+
+    def save(self, *args, **kwargs):
+        # The post_save counter update must commit or roll back with the row
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
+
+class Tombstone(models.Model):
+    """Marker left by a deleted row so delta sync clients can drop it"""
+    class Kind(models.TextChoices):
+        CONTRACT = 'contract', 'Contract'
+        LEGAL_TASK = 'legal_task', 'Legal task'
+        WORKFLOW = 'workflow', 'Workflow'
+
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    object_id = models.CharField(max_length=64)
+    # Set for kinds whose rows are only synced to their owner
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['kind', 'deleted_at'], name='tombstone_kind_deleted_idx'),
+        ]
+
+
+class ChangeEvent(models.Model):
+    """Published change event; the shared log other processes poll for live streams"""
+    topic = models.CharField(max_length=20)
+    type = models.CharField(max_length=40)
+    payload = models.JSONField(default=dict)
+    # Set for events only their owner may receive
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    # Publishing process, which has already delivered the event locally
+    origin = models.CharField(max_length=100)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+
+def _new_epoch():
+    return uuid.uuid4().hex
+
+
+class CatalogVersion(models.Model):
+    """Change counter of one in-memory service catalog, bumped by every write to it"""
+    kind = models.CharField(max_length=20, primary_key=True)
+    version = models.BigIntegerField(default=0)
+    # Changes when the row is recreated, so counters restarting from zero are noticed
+    epoch = models.CharField(max_length=32, default=_new_epoch)
+
+
+class CatalogRecord(models.Model):
+    """Latest state of one catalog entry, so other processes can apply the change"""
+    kind = models.CharField(max_length=20)
+    key = models.CharField(max_length=64)
+    data = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    deleted = models.BooleanField(default=False)
+    # CatalogVersion.version of the write that last touched this entry
+    version = models.BigIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'key'], name='unique_catalog_record'),
+        ]
+        indexes = [
+            models.Index(fields=['kind', 'version'], name='catalog_record_version_idx'),
+        ]
+
+
+class StatusSnapshot(models.Model):
+    """Daily count and sum of one model's rows per status and owner; see contracts.services.snapshots"""
+    date = models.DateField()
+    source = models.CharField(max_length=30)
+    status = models.CharField(max_length=30)
+    owner = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    count = models.PositiveIntegerField(default=0)
+    total = models.DecimalField(max_digits=18, decimal_places=2, null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['source', 'date'], name='status_snapshot_source_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.date} {self.source} {self.status}: {self.count}'
+
+
+class Job(models.Model):
+    class Status(models.TextChoices):
+        QUEUED = 'QUEUED', 'Queued'
+        RUNNING = 'RUNNING', 'Running'
+        SUCCEEDED = 'SUCCEEDED', 'Succeeded'
+        FAILED = 'FAILED', 'Failed'
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+    priority = models.IntegerField(default=0)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    progress = models.PositiveSmallIntegerField(default=0)
+    progress_message = models.CharField(max_length=200, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-priority', 'run_after', 'id']
+        indexes = [
+            models.Index(fields=['status', '-priority', 'run_after'], name='job_claim_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.name} #{self.pk} ({self.status})'
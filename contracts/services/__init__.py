@@ -1,18 +1,17 @@
-
 """
 Services package for contract operations
 """
 """
 Service factory for switching between mock and real services based on feature flags
+
+Nothing is imported or built until a getter is first called, so importing
+the package (or any one service module) stays cheap.
 """
 from config.feature_flags import is_test_mode
-from .repository import MockRepositoryService
-from .templates import template_service
-from .clauses import clause_service
-from .obligations import obligation_service
 
 def get_repository_service():
     """Get repository service - mock in test mode, real service otherwise"""
+    from .repository import MockRepositoryService
     if is_test_mode():
         return MockRepositoryService()
     else:
@@ -21,15 +20,18 @@ def get_repository_service():
 
 def get_template_service():
     """Get template service"""
-    return template_service
+    from .templates import get_template_service
+    return get_template_service()
 
 def get_clause_service():
     """Get clause service"""
-    return clause_service
+    from .clauses import get_clause_service
+    return get_clause_service()
 
 def get_obligation_service():
     """Get obligation service"""
-    return obligation_service
+    from .obligations import get_obligation_service
+    return get_obligation_service()
 
 # Export services for easy import
 __all__ = [
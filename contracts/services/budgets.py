@@ -0,0 +1,132 @@
+"""
+Denormalized budget spend counters
+
+Budget.spent_total and Budget.expense_count are adjusted with F() updates
+in the same transaction as each expense write, so reading a budget's spend
+never aggregates the expense table. Writes that bypass model signals
+(queryset.update, raw SQL) can make the counters drift; reconcile() finds
+and repairs that in bulk.
+"""
+import logging
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db.models import Count, DecimalField, F, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.dispatch import Signal
+
+from contracts.models import Budget, BudgetExpense
+
+logger = logging.getLogger(__name__)
+
+# Utilization percentages that trigger budget_threshold_crossed
+ALERT_THRESHOLDS = (80, 100)
+
+# Sent with budget_id, threshold, spent_total and allocated_amount when an
+# expense write takes a budget across one of ALERT_THRESHOLDS
+budget_threshold_crossed = Signal()
+
+Counted = Optional[Tuple[int, Decimal]]
+
+
+def _as_decimal(amount) -> Decimal:
+    # Unsaved or just-saved expenses hold whatever was assigned; DecimalField
+    # accepts floats and strings too. str() keeps floats at their shortest form
+    return amount if isinstance(amount, Decimal) else Decimal(str(amount))
+
+
+def apply_deltas(deltas: Dict[int, Tuple[Decimal, int]]) -> None:
+    """Add (amount, count) deltas to each budget's counters and fire alerts"""
+    for budget_id, (amount, count) in deltas.items():
+        if not amount and not count:
+            continue
+        Budget.objects.filter(pk=budget_id).update(
+            spent_total=F('spent_total') + amount,
+            expense_count=F('expense_count') + count,
+        )
+        if amount > 0:
+            _check_thresholds(budget_id, amount)
+
+
+def _check_thresholds(budget_id: int, amount: Decimal) -> None:
+    row = Budget.objects.filter(pk=budget_id).values_list('spent_total', 'allocated_amount').first()
+    if row is None:
+        return
+    spent, allocated = row
+    before = spent - _as_decimal(amount)
+    for threshold in ALERT_THRESHOLDS:
+        limit = allocated * threshold / 100
+        if before < limit <= spent:
+            logger.warning("Budget %s passed %s%% of its allocation (%s of %s)",
+                           budget_id, threshold, spent, allocated)
+            budget_threshold_crossed.send(
+                sender=Budget, budget_id=budget_id, threshold=threshold,
+                spent_total=spent, allocated_amount=allocated,
+            )
+
+
+def record_change(before: Counted, after: Counted) -> None:
+    """Move an expense's contribution from `before` to `after` (None for absent)"""
+    deltas: Dict[int, List] = defaultdict(lambda: [Decimal('0'), 0])
+    if before and before[0] is not None:
+        deltas[before[0]][0] -= _as_decimal(before[1])
+        deltas[before[0]][1] -= 1
+    if after and after[0] is not None:
+        deltas[after[0]][0] += _as_decimal(after[1])
+        deltas[after[0]][1] += 1
+    apply_deltas({pk: tuple(delta) for pk, delta in deltas.items()})
+
+
+def record_created(expenses: Iterable[BudgetExpense]) -> None:
+    """Counter update for expenses inserted with bulk_create, which sends no signals"""
+    deltas: Dict[int, List] = defaultdict(lambda: [Decimal('0'), 0])
+    for expense in expenses:
+        deltas[expense.budget_id][0] += _as_decimal(expense.amount)
+        deltas[expense.budget_id][1] += 1
+    apply_deltas({pk: tuple(delta) for pk, delta in deltas.items()})
+
+
+def _with_actuals(queryset):
+    expenses = BudgetExpense.objects.filter(budget=OuterRef('pk')).order_by().values('budget')
+    money = DecimalField(max_digits=14, decimal_places=2)
+    return queryset.annotate(
+        actual_total=Coalesce(
+            Subquery(expenses.annotate(total=Sum('amount')).values('total'), output_field=money),
+            Value(Decimal('0')), output_field=money,
+        ),
+        actual_count=Coalesce(
+            Subquery(expenses.annotate(count=Count('id')).values('count'), output_field=IntegerField()),
+            Value(0),
+        ),
+    )
+
+
+def reconcile(fix: bool = True) -> List[Dict]:
+    """
+    Recompute every budget's counters from its expenses.
+
+    Returns the budgets whose stored counters differed; with `fix` they are
+    corrected with one bulk update.
+    """
+    drifted = list(
+        _with_actuals(Budget.objects.only('id', 'spent_total', 'expense_count'))
+        .exclude(spent_total=F('actual_total'), expense_count=F('actual_count'))
+        .order_by('id')
+    )
+    report = [
+        {
+            'budget_id': budget.pk,
+            'spent_total': budget.spent_total,
+            'actual_total': budget.actual_total,
+            'expense_count': budget.expense_count,
+            'actual_count': budget.actual_count,
+        }
+        for budget in drifted
+    ]
+    if fix and drifted:
+        for budget in drifted:
+            budget.spent_total = budget.actual_total
+            budget.expense_count = budget.actual_count
+        Budget.objects.bulk_update(drifted, ['spent_total', 'expense_count'], batch_size=500)
+    return report
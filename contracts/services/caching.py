@@ -0,0 +1,124 @@
+"""
+Read-through caching for expensive read paths
+
+Entries live in Django's default cache, which defaults to local memory and
+can be switched to a shared backend with CACHE_BACKEND / CACHE_LOCATION
+(see config/settings.py). Keys carry a per-namespace version token, so
+`invalidate(namespace)` drops every entry of a namespace with one write.
+
+Each entry is stored with the time it stops being fresh, and is kept for a
+further stale window. A fresh hit is returned as-is. A stale hit is also
+returned, except to the one caller that wins the recompute lock, so only
+one request per key pays for a refresh. On a miss the lock winner computes
+while the others briefly wait for its result instead of all querying the
+database at once. Timeouts are jittered so keys filled together after a
+deploy do not all expire together.
+"""
+import functools
+import hashlib
+import json
+import random
+import time
+import uuid
+from typing import Any, Callable, Optional, Union
+
+from django.core.cache import cache
+
+CACHE_PREFIX = 'cached'
+
+JITTER = 0.1  # timeouts vary by up to this fraction either way
+LOCK_TIMEOUT = 30  # seconds a recompute may hold a key's lock
+LOCK_WAIT = 2.0  # seconds a miss waits for another caller's recompute
+LOCK_POLL = 0.05
+
+
+def _version_key(namespace: str) -> str:
+    return f'{CACHE_PREFIX}:version:{namespace}'
+
+
+def version(namespace: str) -> str:
+    # A random token rather than a counter, as for saved views: an evicted
+    # version can never come back and expose entries it had invalidated
+    return cache.get_or_set(_version_key(namespace), lambda: uuid.uuid4().hex[:12], None)
+
+
+def invalidate(namespace: str) -> None:
+    """Make every cached entry of `namespace` unreachable"""
+    cache.set(_version_key(namespace), uuid.uuid4().hex[:12], None)
+
+
+def make_key(namespace: str, parts: Any) -> str:
+    digest = hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+    return f'{CACHE_PREFIX}:{namespace}:{version(namespace)}:{digest}'
+
+
+def jittered(timeout: float) -> int:
+    return max(1, round(timeout * random.uniform(1 - JITTER, 1 + JITTER)))
+
+
+def _store(key: str, value: Any, timeout: int, stale_timeout: int) -> Any:
+    fresh_for = jittered(timeout)
+    cache.set(key, (value, time.time() + fresh_for), fresh_for + stale_timeout)
+    return value
+
+
+def _recompute(key: str, compute: Callable[[], Any], timeout: int, stale_timeout: int) -> Any:
+    try:
+        return _store(key, compute(), timeout, stale_timeout)
+    finally:
+        cache.delete(f'{key}:lock')
+
+
+def get_or_compute(namespace: str, parts: Any, compute: Callable[[], Any], timeout: int,
+                   stale_timeout: Optional[int] = None) -> Any:
+    """
+    The cached value for `parts` in `namespace`, computing it on a miss.
+
+    Values stay fresh for about `timeout` seconds and may then be served
+    stale for `stale_timeout` more (default: `timeout`) while one caller
+    refreshes them.
+    """
+    stale_timeout = timeout if stale_timeout is None else stale_timeout
+    # The key is built before computing, so an invalidation that lands
+    # mid-compute leaves the result under the old, unreachable version
+    key = make_key(namespace, parts)
+    lock_key = f'{key}:lock'
+    entry = cache.get(key)
+    if entry is not None:
+        value, fresh_until = entry
+        if time.time() < fresh_until or not cache.add(lock_key, True, LOCK_TIMEOUT):
+            return value
+        return _recompute(key, compute, timeout, stale_timeout)
+
+    if cache.add(lock_key, True, LOCK_TIMEOUT):
+        return _recompute(key, compute, timeout, stale_timeout)
+    deadline = time.monotonic() + LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0]
+    # The lock holder is slow or gone; don't leave this request waiting
+    return compute()
+
+
+def cached(namespace: Union[str, Callable[..., str]], timeout: int, stale_timeout: Optional[int] = None,
+           key: Optional[Callable[..., Any]] = None):
+    """
+    Decorator caching a function's result with get_or_compute.
+
+    `namespace` may be a callable taking the function's arguments, e.g. to
+    give each user a namespace. `key` maps the arguments to JSON-ready key
+    parts and defaults to the arguments themselves. The undecorated function
+    stays available as `.uncached`.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            name = namespace(*args, **kwargs) if callable(namespace) else namespace
+            parts = key(*args, **kwargs) if key else [args, kwargs]
+            return get_or_compute(name, [func.__qualname__, parts], lambda: func(*args, **kwargs),
+                                  timeout, stale_timeout)
+        wrapper.uncached = func
+        return wrapper
+    return decorator
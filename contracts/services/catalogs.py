@@ -0,0 +1,108 @@
+"""
+Cross-process coherence for the in-memory service catalogs
+
+The template, clause and obligation services keep their records in
+process-local dicts. Every write is also stored as a CatalogRecord and
+bumps that catalog's CatalogVersion row in the same transaction, so writes
+to one catalog are numbered in commit order. Before serving a read, a
+service checks the version row (one primary-key lookup, once per request
+or job) and, if it moved, fetches only the records written since the
+version it last applied. If the version row was recreated (a new epoch),
+the catalog is reloaded from scratch.
+"""
+import threading
+from typing import Any, Callable, Dict, List
+
+from django.db import transaction
+from django.db.models import F
+
+from contracts.models import CatalogRecord, CatalogVersion
+
+
+def restore_object(cls: type, data: Dict[str, Any]) -> Any:
+    """Rebuild a plain record object from its stored attributes"""
+    obj = cls.__new__(cls)
+    obj.__dict__.update(data)
+    return obj
+
+
+_catalogs: List['SharedCatalog'] = []
+
+
+def expire_all(**kwargs) -> None:
+    """Have every catalog check its version once more; connected to request_started"""
+    for catalog in _catalogs:
+        catalog.expire()
+
+
+class SharedCatalog:
+    """Keeps one service's record dict in step with writes from other processes"""
+
+    def __init__(self, kind: str, restore: Callable[[Dict[str, Any]], Any], seed: Callable[[], Dict[str, Any]]):
+        self.kind = kind
+        self._restore = restore
+        self._seed = seed
+        self._lock = threading.Lock()
+        self._epoch = None
+        self._applied = 0
+        self._stale = True
+        self._expirations = 0
+        _catalogs.append(self)
+
+    def expire(self) -> None:
+        """Check the version again on the next read"""
+        self._expirations += 1
+        self._stale = True
+
+    def sync(self, records: Dict[str, Any]) -> None:
+        """Apply other processes' changes to `records` in place, if the catalog may be stale"""
+        if not self._stale:
+            return
+        with self._lock:
+            # Readers wait here while another thread syncs, then find nothing to do
+            if not self._stale:
+                return
+            expirations = self._expirations
+            epoch, current = CatalogVersion.objects.filter(kind=self.kind).values_list(
+                'epoch', 'version').first() or (None, 0)
+            reset = epoch != self._epoch
+            applied = 0 if reset else self._applied
+            # Fetch and rebuild everything before touching `records`, which
+            # other threads may be reading; None marks a deleted key
+            changes: Dict[str, Any] = {}
+            if current != applied:
+                changed = CatalogRecord.objects.filter(kind=self.kind, version__gt=applied).order_by('version')
+                for record in changed:
+                    changes[record.key] = None if record.deleted else self._restore(record.data)
+                    applied = record.version
+            if reset and self._applied:
+                fresh = self._seed()
+                fresh.update(changes)
+                changes = {key: None for key in records.keys() - fresh.keys()}
+                changes.update(fresh)
+            for key, obj in changes.items():
+                if obj is None:
+                    records.pop(key, None)
+                else:
+                    records[key] = obj
+            self._epoch, self._applied = epoch, applied
+            # An expire() from another thread during the sync still counts
+            if self._expirations == expirations:
+                self._stale = False
+
+    def _write(self, key: str, data: Dict[str, Any], deleted: bool) -> None:
+        with transaction.atomic():
+            # Updating the version row serializes writers, so versions commit in order
+            CatalogVersion.objects.get_or_create(kind=self.kind)
+            CatalogVersion.objects.filter(kind=self.kind).update(version=F('version') + 1)
+            version = CatalogVersion.objects.values_list('version', flat=True).get(kind=self.kind)
+            CatalogRecord.objects.update_or_create(
+                kind=self.kind, key=key, defaults={'data': data, 'deleted': deleted, 'version': version},
+            )
+
+    def saved(self, key: str, obj: Any) -> None:
+        """Record a created or updated entry for the other processes"""
+        self._write(key, dict(vars(obj)), deleted=False)
+
+    def deleted(self, key: str) -> None:
+        self._write(key, {}, deleted=True)
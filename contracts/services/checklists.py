@@ -0,0 +1,148 @@
+"""
+Bulk completion updates for compliance checklist items and due diligence tasks
+
+Every operation is a single conditional UPDATE evaluated inside the database,
+so concurrent clicks on the same rows cannot overwrite each other the way a
+read-modify-write per row can.
+"""
+from typing import Any, Dict, Iterable, List
+
+from django.db import transaction
+from django.db.models import BooleanField, Case, CharField, Count, DateField, Q, Value, When
+from django.utils import timezone
+
+from contracts.models import ChecklistItem, DueDiligenceTask
+from contracts.services import due_diligence
+
+ACTIONS = ('toggle', 'complete', 'reopen')
+
+
+class ChecklistError(ValueError):
+    """Raised for malformed bulk update requests"""
+
+
+def _ids(values: Iterable[Any]) -> List[int]:
+    try:
+        return [int(value) for value in values]
+    except (TypeError, ValueError):
+        raise ChecklistError("Item ids must be integers")
+
+
+def _split_items(items: Iterable[Dict[str, Any]]):
+    """Partition explicit [{"id": .., "is_completed": ..}] updates by target state"""
+    done, not_done = [], []
+    for item in items:
+        try:
+            (done if item['is_completed'] else not_done).append(int(item['id']))
+        except (KeyError, TypeError, ValueError):
+            raise ChecklistError("Each item needs an id and is_completed")
+    return done, not_done
+
+
+# --- Compliance checklist items ---
+
+def checklist_counts(checklist_id: int) -> Dict[str, int]:
+    return ChecklistItem.objects.filter(checklist_id=checklist_id).aggregate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(is_completed=True)),
+    )
+
+
+def update_checklist_items(checklist_id: int, ids: Iterable[Any] = (), action: str = 'toggle',
+                           items: Iterable[Dict[str, Any]] = ()) -> Dict[str, int]:
+    """
+    Apply `action` to `ids`, and/or set explicit states from `items`, in one
+    transaction. Returns the number of rows changed plus the checklist's
+    updated completion counts.
+    """
+    if action not in ACTIONS:
+        raise ChecklistError(f"Invalid action: {action}")
+    ids = _ids(ids)
+    done, not_done = _split_items(items)
+
+    scoped = ChecklistItem.objects.filter(checklist_id=checklist_id)
+    updated = 0
+    with transaction.atomic():
+        if ids:
+            if action == 'toggle':
+                value = Case(
+                    When(is_completed=True, then=Value(False)),
+                    default=Value(True),
+                    output_field=BooleanField(),
+                )
+            else:
+                value = Value(action == 'complete')
+            updated += scoped.filter(pk__in=ids).update(is_completed=value)
+        if done or not_done:
+            updated += scoped.filter(pk__in=done + not_done).update(is_completed=Case(
+                When(pk__in=done, then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            ))
+        counts = checklist_counts(checklist_id)
+    return {'updated': updated, **counts}
+
+
+# --- Due diligence tasks ---
+
+def dd_task_counts(process_id: int) -> Dict[str, int]:
+    return DueDiligenceTask.objects.filter(process_id=process_id).aggregate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(status=DueDiligenceTask.TaskStatus.COMPLETED)),
+    )
+
+
+def _completed_case(when_completed: Q) -> Dict[str, Case]:
+    """status/completion_date assignments completing the rows matching `when_completed`"""
+    return {
+        'status': Case(
+            When(when_completed, then=Value(DueDiligenceTask.TaskStatus.COMPLETED)),
+            default=Value(DueDiligenceTask.TaskStatus.PENDING),
+            output_field=CharField(),
+        ),
+        'completion_date': Case(
+            When(when_completed, then=Value(timezone.localdate())),
+            default=Value(None),
+            output_field=DateField(),
+        ),
+    }
+
+
+def update_dd_tasks(process_id: int, ids: Iterable[Any] = (), action: str = 'toggle',
+                    items: Iterable[Dict[str, Any]] = ()) -> Dict[str, int]:
+    """
+    Due diligence equivalent of update_checklist_items. Completing sets
+    COMPLETED and today's completion date; un-completing returns a task to
+    PENDING. Rows already in the requested state are left untouched.
+    """
+    if action not in ACTIONS:
+        raise ChecklistError(f"Invalid action: {action}")
+    ids = _ids(ids)
+    done, not_done = _split_items(items)
+
+    scoped = DueDiligenceTask.objects.filter(process_id=process_id)
+    is_completed = Q(status=DueDiligenceTask.TaskStatus.COMPLETED)
+    updated = 0
+    with transaction.atomic():
+        if ids:
+            rows = scoped.filter(pk__in=ids)
+            if action == 'toggle':
+                # Both CASEs read the pre-update status, so they flip together
+                updated += rows.update(**_completed_case(~is_completed))
+            elif action == 'complete':
+                updated += rows.exclude(is_completed).update(
+                    status=DueDiligenceTask.TaskStatus.COMPLETED,
+                    completion_date=timezone.localdate(),
+                )
+            else:
+                updated += rows.filter(is_completed).update(
+                    status=DueDiligenceTask.TaskStatus.PENDING,
+                    completion_date=None,
+                )
+        if done or not_done:
+            changing = (Q(pk__in=done) & ~is_completed) | (Q(pk__in=not_done) & is_completed)
+            updated += scoped.filter(changing).update(**_completed_case(Q(pk__in=done)))
+        counts = dd_task_counts(process_id)
+    if updated:
+        due_diligence.invalidate(process_id)
+    return {'updated': updated, **counts}
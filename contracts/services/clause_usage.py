@@ -0,0 +1,136 @@
+"""
+Clause usage index: which library clauses appear in which contracts
+
+The clause library is compiled into one Aho-Corasick automaton and every
+contract is scanned in a single streaming pass, fanned out over a process
+pool. Results are stored as ClauseUsage rows; ContractScan records the
+content hash and library version each contract was scanned against, so
+unchanged contracts are skipped and a save only rescans that document.
+Library-wide usage counts are cached until usage rows are next written.
+"""
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from contracts.domain.aho_corasick import Automaton, normalize
+from contracts.models import ClauseUsage, Contract, ContractScan
+from contracts.services import caching
+from contracts.services.clauses import get_clause_service
+from contracts.services.scanning import SCAN_BATCH_SIZE, content_hash, is_current, record_scans, scan_contracts
+
+ANALYZER = ContractScan.Analyzer.CLAUSES
+
+CACHE_TIMEOUT = 5 * 60  # seconds
+CACHE_NAMESPACE = 'clause-usage'
+
+# Library text is often stored truncated for display
+_TRAILING_ELLIPSIS = ('...', '…')
+
+_automata: Dict[str, Automaton] = {}
+_worker_automaton: Optional[Automaton] = None
+
+
+def library_patterns() -> List[Tuple[str, str]]:
+    """(clause id, clause text) for every clause in the library"""
+    patterns = []
+    for clause in get_clause_service().search_clauses():
+        text = clause.content.strip()
+        for suffix in _TRAILING_ELLIPSIS:
+            if text.endswith(suffix):
+                text = text[:-len(suffix)]
+        patterns.append((clause.id, text))
+    return sorted(patterns)
+
+
+def rules_version(patterns: List[Tuple[str, str]]) -> str:
+    digest = hashlib.sha1()
+    for key, text in patterns:
+        digest.update(f'{key}\0{normalize(text)}\0'.encode())
+    return digest.hexdigest()
+
+
+def get_automaton(patterns: List[Tuple[str, str]], version: str) -> Automaton:
+    automaton = _automata.get(version)
+    if automaton is None:
+        _automata.clear()
+        automaton = _automata[version] = Automaton(patterns)
+    return automaton
+
+
+def _init_worker(patterns: List[Tuple[str, str]], version: str) -> None:
+    global _worker_automaton
+    _worker_automaton = get_automaton(patterns, version)
+
+
+def _scan_batch(batch: List[Tuple[int, str]], automaton: Optional[Automaton] = None):
+    automaton = automaton or _worker_automaton
+    return [(pk, automaton.summarize(content)) for pk, content, *_ in batch]
+
+
+def _store(results, hashes: Dict[int, str], version: str) -> int:
+    """Replace the usage rows of the scanned contracts; returns rows written"""
+    usages = [
+        ClauseUsage(clause_id=clause_id, contract_id=pk, occurrences=count, first_offset=first)
+        for pk, found in results
+        for clause_id, (count, first) in found.items()
+    ]
+    with transaction.atomic():
+        ClauseUsage.objects.filter(contract_id__in=[pk for pk, _ in results]).delete()
+        ClauseUsage.objects.bulk_create(usages)
+        record_scans(ANALYZER, hashes, version)
+    caching.invalidate(CACHE_NAMESPACE)
+    return len(usages)
+
+
+def scan_contract(contract: Contract, force: bool = False) -> bool:
+    """Rescan one contract if its content or the library changed; True if scanned"""
+    patterns = library_patterns()
+    version = rules_version(patterns)
+    digest = content_hash(contract.content)
+    if not force and is_current(contract.pk, ANALYZER, digest, version):
+        return False
+    results = _scan_batch([(contract.pk, contract.content)], get_automaton(patterns, version))
+    _store(results, {contract.pk: digest}, version)
+    return True
+
+
+def scan_all(workers: int = 0, force: bool = False, batch_size: int = SCAN_BATCH_SIZE) -> Dict[str, int]:
+    """
+    Scan every contract whose content or library version changed.
+
+    With `workers` > 1 batches are matched in a process pool, each worker
+    compiling the automaton once; see scanning.scan_contracts.
+    """
+    patterns = library_patterns()
+    version = rules_version(patterns)
+    stats = scan_contracts(
+        ANALYZER, version, _scan_batch, lambda results, hashes: _store(results, hashes, version),
+        workers=workers, force=force, batch_size=batch_size,
+        initializer=_init_worker, initargs=(patterns, version),
+    )
+    stats['usages'] = stats.pop('written')
+    return stats
+
+
+# Keyed on the library itself, so added or renamed clauses miss the cache
+@caching.cached(CACHE_NAMESPACE, CACHE_TIMEOUT,
+                key=lambda: sorted((clause.id, clause.title) for clause in get_clause_service().search_clauses()))
+def usage_counts() -> List[Dict]:
+    """Per-clause contract and occurrence counts for the whole library"""
+    counts = {
+        row['clause_id']: row
+        for row in ClauseUsage.objects.order_by().values('clause_id').annotate(
+            contracts=Count('contract_id'), occurrences=Sum('occurrences'),
+        )
+    }
+    return [
+        {
+            'clause_id': clause.id,
+            'title': clause.title,
+            'contracts': counts.get(clause.id, {}).get('contracts', 0),
+            'occurrences': counts.get(clause.id, {}).get('occurrences', 0),
+        }
+        for clause in get_clause_service().search_clauses()
+    ]
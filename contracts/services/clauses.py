@@ -2,10 +2,12 @@
 """
 Clause library service for managing reusable contract clauses
 """
+import functools
 from typing import List, Dict, Optional
 from datetime import datetime
 import uuid
 from config.feature_flags import is_test_mode
+from contracts.services.catalogs import SharedCatalog, restore_object
 
 class Clause:
     def __init__(self, id: str, title: str, content: str, category: str = "general",
@@ -21,7 +23,12 @@ class Clause:
 
 class ClauseService:
     def __init__(self):
-        self._clauses = self._get_mock_clauses() if is_test_mode() else {}
+        self._clauses = self._initial_clauses()
+        # Applies clauses created by other worker processes
+        self._catalog = SharedCatalog('clauses', lambda data: restore_object(Clause, data), self._initial_clauses)
+
+    def _initial_clauses(self) -> Dict[str, Clause]:
+        return self._get_mock_clauses() if is_test_mode() else {}
     
     def _get_mock_clauses(self) -> Dict[str, Clause]:
         """Generate mock clause data for testing"""
@@ -47,6 +54,7 @@ class ClauseService:
     def search_clauses(self, query: str = "", category: Optional[str] = None,
                       tags: List[str] = None) -> List[Clause]:
         """Search clauses by content, category, or tags"""
+        self._catalog.sync(self._clauses)
         clauses = list(self._clauses.values())
         
         if query:
@@ -64,6 +72,7 @@ class ClauseService:
     
     def get_clause(self, clause_id: str) -> Optional[Clause]:
         """Get a specific clause by ID"""
+        self._catalog.sync(self._clauses)
         return self._clauses.get(clause_id)
     
     def create_clause(self, title: str, content: str, category: str = "general",
@@ -72,18 +81,29 @@ class ClauseService:
         clause_id = f"cls-{uuid.uuid4().hex[:8]}"
         clause = Clause(clause_id, title, content, category, tags=tags or [])
         self._clauses[clause_id] = clause
+        self._catalog.saved(clause_id, clause)
         return clause
     
     def get_categories(self) -> List[str]:
         """Get all unique clause categories"""
+        self._catalog.sync(self._clauses)
         return list(set(clause.category for clause in self._clauses.values()))
     
     def get_all_tags(self) -> List[str]:
         """Get all unique tags used in clauses"""
+        self._catalog.sync(self._clauses)
         all_tags = set()
         for clause in self._clauses.values():
             all_tags.update(clause.tags)
         return sorted(list(all_tags))
 
-# Global service instance
-clause_service = ClauseService()
+# Global service instance, built on first use rather than at import
+@functools.cache
+def get_clause_service() -> ClauseService:
+    return ClauseService()
+
+def __getattr__(attr):
+    # Keeps `from contracts.services.clauses import clause_service` working
+    if attr == 'clause_service':
+        return get_clause_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
@@ -0,0 +1,136 @@
+"""
+Counterparty resolution and prefix autocomplete
+
+Contract.counterparty stays the free text the user typed; on save it is
+resolved by canonical name to one Counterparty row. Autocomplete is served
+from an in-memory SortedList of canonical name keys, one key per word start,
+so a prefix lookup is a bisect plus a short scan regardless of how many
+counterparties exist. Saves and deletes in this process patch the index
+directly; changes made by other processes are picked up by a cheap stamp
+check at most every REFRESH_INTERVAL seconds.
+"""
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from django.db.models import Count, Max
+from sortedcontainers import SortedList
+
+from contracts.domain.counterparties import canonical_name
+from contracts.models import Counterparty
+
+DEFAULT_LIMIT = 10
+
+# Seconds between checks for counterparties changed by other processes
+REFRESH_INTERVAL = 5.0
+
+# Sorts after any character a canonical name can contain
+_PREFIX_END = '\uffff'
+
+
+def _keys(canonical: str) -> List[str]:
+    """Index keys for a name: the name from each word start, e.g. 'amazon web' -> ['amazon web', 'web']"""
+    words = canonical.split()
+    return [' '.join(words[i:]) for i in range(len(words))]
+
+
+class CounterpartyIndex:
+    """Process-local prefix index over all counterparties"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = SortedList()
+        self._names: Dict[int, Tuple[str, str]] = {}
+        # Latest updated_at seen, and when the table was last checked
+        self._changed = None
+        self._checked_at = None
+
+    def _add(self, pk: int, name: str, canonical: str) -> None:
+        self._remove(pk)
+        self._names[pk] = (name, canonical)
+        for key in _keys(canonical):
+            self._keys.add((key, pk))
+
+    def _remove(self, pk: int) -> None:
+        entry = self._names.pop(pk, None)
+        if entry:
+            for key in _keys(entry[1]):
+                self._keys.discard((key, pk))
+
+    def load(self, rows) -> None:
+        """Replace the index with (pk, name, canonical_name) rows"""
+        names = {pk: (name, canonical) for pk, name, canonical in rows}
+        keys = SortedList((key, pk) for pk, (_, canonical) in names.items() for key in _keys(canonical))
+        with self._lock:
+            self._names, self._keys = names, keys
+            self._checked_at = time.monotonic()
+
+    def rebuild(self) -> int:
+        self._changed = Counterparty.objects.aggregate(changed=Max('updated_at'))['changed']
+        self.load(Counterparty.objects.values_list('pk', 'name', 'canonical_name').iterator())
+        return len(self._names)
+
+    def refresh(self) -> None:
+        """
+        Load on first use, then at most every REFRESH_INTERVAL seconds fetch
+        the rows changed since the last check. A count mismatch means rows
+        were deleted elsewhere and triggers a full rebuild.
+        """
+        if self._checked_at is None:
+            self.rebuild()
+            return
+        if time.monotonic() - self._checked_at < REFRESH_INTERVAL:
+            return
+        stamp = Counterparty.objects.aggregate(count=Count('pk'), changed=Max('updated_at'))
+        if stamp['changed'] != self._changed:
+            changed = Counterparty.objects.values_list('pk', 'name', 'canonical_name')
+            if self._changed is not None:
+                changed = changed.filter(updated_at__gte=self._changed)
+            with self._lock:
+                for row in changed:
+                    self._add(*row)
+            self._changed = stamp['changed']
+        if stamp['count'] != len(self._names):
+            self.rebuild()
+        self._checked_at = time.monotonic()
+
+    def saved(self, counterparty: Counterparty) -> None:
+        if self._checked_at is not None:
+            with self._lock:
+                self._add(counterparty.pk, counterparty.name, counterparty.canonical_name)
+
+    def deleted(self, pk: int) -> None:
+        with self._lock:
+            self._remove(pk)
+
+    def search(self, prefix: str, limit: int = DEFAULT_LIMIT) -> List[Dict]:
+        """Counterparties with a word starting with `prefix`, in canonical name order of the match"""
+        prefix = canonical_name(prefix)
+        if not prefix:
+            return []
+        found: List[int] = []
+        with self._lock:
+            for _, pk in self._keys.irange((prefix,), (prefix + _PREFIX_END,)):
+                if pk not in found:
+                    found.append(pk)
+                    if len(found) >= limit:
+                        break
+            return [{'id': pk, 'name': self._names[pk][0]} for pk in found]
+
+
+counterparty_index = CounterpartyIndex()
+
+
+def resolve(name: str) -> Optional[Counterparty]:
+    """The Counterparty for a free-text name, created on first use; None for blank names"""
+    canonical = canonical_name(name or '')
+    if not canonical:
+        return None
+    counterparty, _ = Counterparty.objects.get_or_create(canonical_name=canonical,
+                                                         defaults={'name': name.strip()})
+    return counterparty
+
+
+def autocomplete(prefix: str, limit: int = DEFAULT_LIMIT) -> List[Dict]:
+    counterparty_index.refresh()
+    return counterparty_index.search(prefix, limit)
@@ -0,0 +1,44 @@
+"""
+Dashboard counters
+
+The counts on the dashboard are shared by every user and cheap to serve
+slightly stale, so they are computed in one pass and cached. Signals
+invalidate them when a counted model is saved or deleted.
+"""
+from typing import Any, Dict
+
+from django.db.models import Count
+
+from contracts.models import (
+    Budget, Contract, DueDiligenceProcess, LegalTask, RiskLog, TrademarkRequest, Workflow,
+)
+from contracts.services import caching
+
+CACHE_TIMEOUT = 60  # seconds
+CACHE_NAMESPACE = 'dashboard'
+
+COUNTED_MODELS = (Budget, Contract, DueDiligenceProcess, LegalTask, RiskLog, TrademarkRequest, Workflow)
+
+
+@caching.cached(CACHE_NAMESPACE, CACHE_TIMEOUT)
+def counters() -> Dict[str, Any]:
+    """Dashboard counts, cached for about CACHE_TIMEOUT seconds"""
+    by_status = dict(Contract.objects.order_by().values_list('status').annotate(count=Count('pk')))
+    return {
+        'total_contracts': sum(by_status.values()),
+        # Pipeline stages in workflow order, skipping empty ones
+        'pipeline_data': [
+            (label, by_status[status]) for status, label in Contract.Status.choices if by_status.get(status)
+        ],
+        'pending_tasks': LegalTask.objects.filter(status__in=['PENDING', 'IN_PROGRESS']).count(),
+        'active_workflows': Workflow.objects.filter(status='ACTIVE').count(),
+        'trademark_requests': TrademarkRequest.objects.count(),
+        'pending_trademarks': TrademarkRequest.objects.filter(status__in=['PENDING', 'FILED', 'IN_REVIEW']).count(),
+        'risk_count': RiskLog.objects.count(),
+        'dd_count': DueDiligenceProcess.objects.count(),
+        'budget_count': Budget.objects.count(),
+    }
+
+
+def invalidate() -> None:
+    caching.invalidate(CACHE_NAMESPACE)
@@ -0,0 +1,149 @@
+"""
+Delta sync for incremental client refresh
+
+A client keeps the opaque token from its last sync and asks only for rows
+created, updated or deleted after it. Changes come from indexed updated_at
+columns and deletions from Tombstone rows. The next token is set a few
+seconds back, so a row written by a transaction that committed just after
+a sync read is still picked up; clients apply rows as idempotent upserts.
+A token older than tombstone retention, or more changes than one response
+carries, makes the client reload in full instead.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Any, Dict, List, Optional
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from contracts.models import Contract, LegalTask, Tombstone, Workflow, WorkflowStep
+from contracts.services.obligations import get_obligation_service
+from contracts.services.repository import contract_to_data
+
+# Re-send window covering transactions that commit after a sync has read
+SYNC_OVERLAP = timedelta(seconds=5)
+TOMBSTONE_RETENTION = timedelta(days=30)
+# Changed rows per kind in one response; beyond this the client reloads
+SYNC_LIMIT = 500
+
+TOMBSTONE_KINDS = {
+    Tombstone.Kind.CONTRACT: 'contracts',
+    Tombstone.Kind.LEGAL_TASK: 'legal_tasks',
+    Tombstone.Kind.WORKFLOW: 'workflows',
+}
+
+
+def encode_token(moment: datetime) -> str:
+    return str(int(moment.timestamp() * 1_000_000))
+
+
+def decode_token(token: str) -> datetime:
+    try:
+        return datetime.fromtimestamp(int(token) / 1_000_000, tz=dt_timezone.utc)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f'Invalid sync token: {token!r}')
+
+
+def _task_dict(task: LegalTask) -> Dict[str, Any]:
+    return {
+        'id': task.pk,
+        'title': task.title,
+        'status': task.status,
+        'priority': task.priority,
+        'rank': task.rank,
+        'assigned_to': task.assigned_to.username if task.assigned_to else None,
+        'due_date': task.due_date.isoformat(),
+        'updated_at': task.updated_at.isoformat(),
+    }
+
+
+def _workflow_dict(workflow: Workflow) -> Dict[str, Any]:
+    return {
+        'id': workflow.pk,
+        'title': workflow.title,
+        'status': workflow.status,
+        'steps_total': workflow.steps_total,
+        'steps_completed': workflow.steps_completed,
+        'updated_at': workflow.updated_at.isoformat(),
+    }
+
+
+def _obligation_dict(obligation) -> Dict[str, Any]:
+    return {
+        'id': obligation.id,
+        'title': obligation.title,
+        'due_date': obligation.due_date,
+        'contract_id': obligation.contract_id,
+        'assigned_to': obligation.assigned_to,
+        'priority': obligation.priority,
+        'status': obligation.status,
+        'updated_at': obligation.updated_at.isoformat(),
+    }
+
+
+def _changed(user, since: datetime) -> Dict[str, List[Dict[str, Any]]]:
+    contracts = Contract.objects.filter(created_by=user, updated_at__gt=since).order_by('updated_at')
+    tasks = (
+        LegalTask.objects.select_related('assigned_to')
+        .filter(updated_at__gt=since).order_by('updated_at')
+    )
+    workflows = (
+        Workflow.objects.filter(updated_at__gt=since).order_by('updated_at')
+        .annotate(steps_total=Count('steps'),
+                  steps_completed=Count('steps', filter=Q(steps__status=WorkflowStep.Status.COMPLETED)))
+    )
+    return {
+        'contracts': [contract_to_data(contract).to_dict() for contract in contracts[:SYNC_LIMIT + 1]],
+        'legal_tasks': [_task_dict(task) for task in tasks[:SYNC_LIMIT + 1]],
+        'workflows': [_workflow_dict(workflow) for workflow in workflows[:SYNC_LIMIT + 1]],
+        'obligations': [_obligation_dict(o) for o in get_obligation_service().changed_since(since)],
+    }
+
+
+def _deleted(user, since: datetime) -> Dict[str, List[str]]:
+    deleted: Dict[str, List[str]] = {key: [] for key in TOMBSTONE_KINDS.values()}
+    tombstones = (
+        Tombstone.objects.filter(kind__in=list(TOMBSTONE_KINDS), deleted_at__gt=since)
+        .filter(Q(owner__isnull=True) | Q(owner=user))
+        .order_by('deleted_at').values_list('kind', 'object_id')
+    )
+    for kind, object_id in tombstones:
+        deleted[TOMBSTONE_KINDS[kind]].append(object_id)
+    return deleted
+
+
+def changes(user, token: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Rows changed and deleted since `token`, with the token for the next call.
+
+    `reset` is true when the client has no usable token or too much changed;
+    it should then reload everything and continue from the returned token.
+    """
+    now = timezone.now()
+    next_token = encode_token(now - SYNC_OVERLAP)
+    reset = {'token': next_token, 'reset': True, 'changed': {}, 'deleted': {}}
+    if not token:
+        return reset
+    since = decode_token(token)
+    if since < now - TOMBSTONE_RETENTION:
+        return reset
+
+    changed = _changed(user, since)
+    if any(len(rows) > SYNC_LIMIT for rows in changed.values()):
+        return reset
+    return {
+        # Never move a client's token backwards
+        'token': max(next_token, token, key=int),
+        'reset': False,
+        'changed': changed,
+        'deleted': _deleted(user, since),
+    }
+
+
+def record_deletion(kind: str, object_id, owner_id: Optional[int] = None) -> None:
+    Tombstone.objects.create(kind=kind, object_id=str(object_id), owner_id=owner_id)
+
+
+def prune_tombstones(older_than: timedelta = TOMBSTONE_RETENTION) -> int:
+    """Delete tombstones no token can still ask for; returns the number deleted"""
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=timezone.now() - older_than).delete()
+    return deleted
@@ -0,0 +1,147 @@
+"""
+Due diligence rollups: task progress, risk heat map and category counts
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from contracts.models import DueDiligenceProcess, DueDiligenceRisk, DueDiligenceTask
+
+CACHE_TIMEOUT = 60 * 60
+CACHE_PREFIX = 'dd-rollup'
+
+# Heat map axes: rows run from most to least likely, columns from least to
+# most impactful, so the top-right cell is the hot corner.
+LIKELIHOOD_ROWS = ['HIGH', 'MEDIUM', 'LOW']
+IMPACT_COLUMNS = ['LOW', 'MEDIUM', 'HIGH']
+
+
+@dataclass
+class ProcessRollup:
+    process_id: int
+    task_total: int = 0
+    task_completed: int = 0
+    risk_total: int = 0
+    risk_levels: Dict[str, int] = field(default_factory=lambda: {'HIGH': 0, 'MEDIUM': 0, 'LOW': 0})
+    categories: Dict[str, int] = field(default_factory=dict)
+    matrix: List[List[int]] = field(default_factory=lambda: [[0] * 3 for _ in range(3)])
+
+    @property
+    def progress_percentage(self) -> int:
+        if not self.task_total:
+            return 0
+        return round(self.task_completed * 100 / self.task_total)
+
+    @property
+    def high_risk_count(self) -> int:
+        return self.risk_levels.get('HIGH', 0)
+
+    @property
+    def overall_risk_level(self) -> str:
+        for level in ('HIGH', 'MEDIUM'):
+            if self.risk_levels.get(level):
+                return level
+        return 'LOW'
+
+    def heat_map(self) -> List[Dict]:
+        """Matrix rows labelled for templates"""
+        return [
+            {'likelihood': likelihood, 'cells': list(zip(IMPACT_COLUMNS, row))}
+            for likelihood, row in zip(LIKELIHOOD_ROWS, self.matrix)
+        ]
+
+    def to_dict(self) -> Dict:
+        return {
+            'process_id': self.process_id,
+            'task_total': self.task_total,
+            'task_completed': self.task_completed,
+            'progress_percentage': self.progress_percentage,
+            'risk_total': self.risk_total,
+            'risk_levels': self.risk_levels,
+            'overall_risk_level': self.overall_risk_level,
+            'categories': self.categories,
+            'matrix': {
+                'likelihood': LIKELIHOOD_ROWS,
+                'impact': IMPACT_COLUMNS,
+                'counts': self.matrix,
+            },
+        }
+
+
+def cache_key(process_id: int) -> str:
+    return f'{CACHE_PREFIX}:{process_id}'
+
+
+def invalidate(process_id: int) -> None:
+    cache.delete(cache_key(process_id))
+
+
+def _compute(process_ids: List[int]) -> Dict[int, ProcessRollup]:
+    """Two grouped aggregations cover any number of processes"""
+    rollups = {pk: ProcessRollup(process_id=pk) for pk in process_ids}
+
+    task_counts = (
+        DueDiligenceTask.objects.filter(process_id__in=process_ids)
+        .order_by()
+        .values('process_id')
+        .annotate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(status=DueDiligenceTask.TaskStatus.COMPLETED)),
+        )
+    )
+    for row in task_counts:
+        rollup = rollups[row['process_id']]
+        rollup.task_total = row['total']
+        rollup.task_completed = row['completed']
+
+    risk_counts = (
+        DueDiligenceRisk.objects.filter(process_id__in=process_ids)
+        .order_by()
+        .values('process_id', 'likelihood', 'impact', 'risk_level', 'category')
+        .annotate(count=Count('id'))
+    )
+    for row in risk_counts:
+        rollup = rollups[row['process_id']]
+        count = row['count']
+        rollup.risk_total += count
+        rollup.risk_levels[row['risk_level']] = rollup.risk_levels.get(row['risk_level'], 0) + count
+        rollup.categories[row['category']] = rollup.categories.get(row['category'], 0) + count
+        if row['likelihood'] in LIKELIHOOD_ROWS and row['impact'] in IMPACT_COLUMNS:
+            rollup.matrix[LIKELIHOOD_ROWS.index(row['likelihood'])][IMPACT_COLUMNS.index(row['impact'])] += count
+    return rollups
+
+
+def get_rollups(process_ids: Iterable[int]) -> Dict[int, ProcessRollup]:
+    """Rollups for many processes: one cache round trip, then one query pair for misses"""
+    process_ids = list(dict.fromkeys(process_ids))
+    if not process_ids:
+        return {}
+
+    cached = cache.get_many([cache_key(pk) for pk in process_ids])
+    rollups = {pk: cached[cache_key(pk)] for pk in process_ids if cache_key(pk) in cached}
+
+    missing = [pk for pk in process_ids if pk not in rollups]
+    if missing:
+        computed = _compute(missing)
+        cache.set_many({cache_key(pk): rollup for pk, rollup in computed.items()}, CACHE_TIMEOUT)
+        rollups.update(computed)
+    return rollups
+
+
+def get_rollup(process_id: int) -> ProcessRollup:
+    return get_rollups([process_id])[process_id]
+
+
+def attach_rollups(processes: Iterable[DueDiligenceProcess]) -> List[DueDiligenceProcess]:
+    """Annotate process instances with their rollup for list templates"""
+    processes = list(processes)
+    rollups = get_rollups(p.pk for p in processes)
+    for process in processes:
+        rollup = rollups[process.pk]
+        process.rollup = rollup
+        process.progress_percentage = rollup.progress_percentage
+        process.high_risk_count = rollup.high_risk_count
+        process.overall_risk_level = rollup.overall_risk_level
+    return processes
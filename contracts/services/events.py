@@ -0,0 +1,216 @@
+"""
+Live change events for server-sent event streams
+
+Model signals publish events once their transaction commits. Each event is
+written to the ChangeEvent log and handed straight to this process's
+subscribers through an in-process broker. Other processes pick it up from
+the log with one polling query per event loop per POLL_INTERVAL, however
+many clients are watching. Subscribers have bounded queues: a client too
+slow to keep up has its backlog replaced by a single `resync` event, and
+idle streams get a heartbeat comment so proxies keep them open.
+
+Holding a stream open needs an ASGI server. Under WSGI every open stream
+would hold a worker, so there `poll()` answers each connection with the
+events since the client's Last-Event-ID and ends; the browser's EventSource
+reconnects after RETRY_MS, which turns the stream into polling.
+
+Every change writes a ChangeEvent row. Streams prune old rows while they
+run, but deployments should also run the prune_events command regularly.
+"""
+import asyncio
+import json
+import threading
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Set
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.utils import timezone
+
+from contracts.models import ChangeEvent
+from contracts.services.jobs import default_worker_id
+
+TOPICS = ('contracts', 'tasks', 'workflows')
+
+QUEUE_SIZE = 100  # events buffered per subscriber before it is told to resync
+POLL_INTERVAL = 2.0  # seconds between reads of other processes' events
+HEARTBEAT_SECONDS = 15
+RETRY_MS = 3000  # client reconnect delay sent with the stream
+REPLAY_LIMIT = 500  # events replayed after a reconnect before asking for a resync
+EVENT_RETENTION = timedelta(hours=1)
+PRUNE_EVERY_POLLS = 300
+
+
+@dataclass
+class Event:
+    id: int
+    topic: str
+    type: str
+    data: Dict[str, Any]
+    owner_id: Optional[int] = None
+
+    @classmethod
+    def from_row(cls, row: ChangeEvent) -> 'Event':
+        return cls(id=row.pk, topic=row.topic, type=row.type, data=row.payload, owner_id=row.owner_id)
+
+    def to_sse(self) -> str:
+        return f'id: {self.id}\nevent: {self.type}\ndata: {json.dumps(self.data)}\n\n'
+
+
+def _resync(last_id: int) -> Event:
+    return Event(id=last_id, topic='', type='resync', data={})
+
+
+@dataclass(eq=False)
+class Subscription:
+    loop: asyncio.AbstractEventLoop
+    user_id: Optional[int]
+    topics: Set[str]
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(QUEUE_SIZE))
+    # Ids up to here were already sent by a reconnect replay
+    replayed_through: int = 0
+
+    def wants(self, event: Event) -> bool:
+        return event.topic in self.topics and event.owner_id in (None, self.user_id)
+
+    def offer(self, event: Event) -> None:
+        """Queue an event; must run on the subscription's loop"""
+        if event.id <= self.replayed_through or not self.wants(event):
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too slow to keep up: drop the backlog and have the client refetch
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(_resync(event.id))
+
+
+class EventBroker:
+    """In-process fan-out to stream subscribers on any number of event loops"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions: Set[Subscription] = set()
+        self._pollers: Dict[asyncio.AbstractEventLoop, asyncio.Task] = {}
+
+    def subscribe(self, user_id: Optional[int], topics: Iterable[str] = TOPICS) -> Subscription:
+        """Register a subscriber on the running loop, starting that loop's poller"""
+        loop = asyncio.get_running_loop()
+        subscription = Subscription(loop, user_id, set(topics))
+        with self._lock:
+            self._subscriptions.add(subscription)
+            if loop not in self._pollers:
+                self._pollers[loop] = loop.create_task(self._poll(loop))
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions.discard(subscription)
+            if not any(s.loop is subscription.loop for s in self._subscriptions):
+                poller = self._pollers.pop(subscription.loop, None)
+                if poller:
+                    poller.cancel()
+
+    def publish(self, event: Event, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Deliver to every subscriber (on `loop` only, if given); safe from any thread"""
+        with self._lock:
+            subscriptions = [s for s in self._subscriptions if loop is None or s.loop is loop]
+        for subscription in subscriptions:
+            if not subscription.wants(event):
+                continue
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+            except RuntimeError:  # Loop already closed
+                self.unsubscribe(subscription)
+
+    async def _poll(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Relay events published by other processes to this loop's subscribers"""
+        last_id = await sync_to_async(latest_id)()
+        polls = 0
+        while True:
+            await asyncio.sleep(POLL_INTERVAL)
+            rows = await sync_to_async(_foreign_events)(last_id)
+            for event in rows:
+                self.publish(event, loop)
+                last_id = event.id
+            polls += 1
+            if polls % PRUNE_EVERY_POLLS == 0:
+                await sync_to_async(prune)()
+
+
+broker = EventBroker()
+
+
+def latest_id() -> int:
+    return ChangeEvent.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+
+
+def _foreign_events(after_id: int) -> List[Event]:
+    rows = ChangeEvent.objects.filter(pk__gt=after_id).exclude(origin=default_worker_id()).order_by('pk')
+    return [Event.from_row(row) for row in rows[:REPLAY_LIMIT]]
+
+
+def replay(after_id: int, user_id: Optional[int], topics: Iterable[str]) -> List[Event]:
+    """Logged events after a client's Last-Event-ID, or one resync event if too many were missed"""
+    oldest = ChangeEvent.objects.order_by('pk').values_list('pk', flat=True).first()
+    rows = list(ChangeEvent.objects.filter(pk__gt=after_id, topic__in=list(topics)).order_by('pk')[:REPLAY_LIMIT + 1])
+    # Missed too much, or events after `after_id` were already pruned
+    if len(rows) > REPLAY_LIMIT or (oldest and after_id < oldest - 1):
+        return [_resync(rows[-1].pk if rows else latest_id())]
+    return [Event.from_row(row) for row in rows if row.owner_id in (None, user_id)]
+
+
+def prune(older_than: timedelta = EVENT_RETENTION) -> int:
+    deleted, _ = ChangeEvent.objects.filter(created_at__lt=timezone.now() - older_than).delete()
+    return deleted
+
+
+def _record(topic: str, event_type: str, data: Dict[str, Any], owner_id: Optional[int]) -> None:
+    row = ChangeEvent.objects.create(topic=topic, type=event_type, payload=data, owner_id=owner_id,
+                                     origin=default_worker_id())
+    broker.publish(Event.from_row(row))
+
+
+def publish(topic: str, event_type: str, data: Dict[str, Any], owner_id: Optional[int] = None) -> None:
+    """Publish an event when the current transaction commits (immediately outside one)"""
+    transaction.on_commit(lambda: _record(topic, event_type, data, owner_id))
+
+
+def poll(user_id: Optional[int], topics: Iterable[str] = TOPICS,
+         last_event_id: Optional[str] = None) -> Iterator[str]:
+    """Server-sent event lines for one short response; the client reconnects to poll again"""
+    yield f'retry: {RETRY_MS}\n\n'
+    position = latest_id()
+    if last_event_id:
+        for event in replay(int(last_event_id), user_id, topics):
+            yield event.to_sse()
+            position = max(position, event.id)
+    # An id-only event dispatches nothing but moves the client's Last-Event-ID
+    # past events it was not sent, so the next poll starts from here
+    yield f'id: {position}\n\n'
+
+
+async def stream(user_id: Optional[int], topics: Iterable[str] = TOPICS, last_event_id: Optional[str] = None,
+                 heartbeat: float = HEARTBEAT_SECONDS) -> AsyncIterator[str]:
+    """Server-sent event lines for one client until it disconnects"""
+    topics = set(topics)
+    # Subscribe before replaying so nothing published in between is lost;
+    # the subscription then skips ids the replay already sent
+    subscription = broker.subscribe(user_id, topics)
+    try:
+        yield f'retry: {RETRY_MS}\n\n'
+        if last_event_id:
+            for event in await sync_to_async(replay)(int(last_event_id), user_id, topics):
+                yield event.to_sse()
+                subscription.replayed_through = max(subscription.replayed_through, event.id)
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ': heartbeat\n\n'
+                continue
+            yield event.to_sse()
+    finally:
+        broker.unsubscribe(subscription)
@@ -0,0 +1,131 @@
+"""
+Bulk import of budget expenses from CSV
+
+Rows are parsed as a stream, validated with BudgetExpenseForm and written
+with bulk_create in chunks. Budgets are resolved from a map loaded once up
+front, so the only queries are that lookup and, per chunk, one INSERT
+plus the budget counter updates.
+"""
+import csv
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+
+from contracts.forms import BudgetExpenseForm
+from contracts.models import Budget, BudgetExpense
+from contracts.services import budgets
+
+REQUIRED_COLUMNS = ('year', 'quarter', 'department', 'description', 'amount', 'category', 'date')
+DEFAULT_CHUNK_SIZE = 1000
+
+# The report keeps the first errors in full and only counts the rest
+MAX_REPORTED_ERRORS = 500
+
+
+class ExpenseImportError(ValueError):
+    """Raised when the file as a whole cannot be imported"""
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    valid: int = 0
+    created: int = 0
+    error_count: int = 0
+    errors: List[Dict] = field(default_factory=list)
+    dry_run: bool = False
+
+    def add_error(self, line: int, errors: Dict[str, List[str]]) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'errors': errors})
+
+    def to_dict(self) -> Dict:
+        return {
+            'rows': self.rows,
+            'valid': self.valid,
+            'created': self.created,
+            'error_count': self.error_count,
+            'errors': self.errors,
+            'errors_truncated': self.error_count > len(self.errors),
+            'dry_run': self.dry_run,
+        }
+
+
+def _budget_key(year, quarter, department) -> Tuple[int, str, str]:
+    quarter = str(quarter).strip().upper()
+    if not quarter.startswith('Q'):
+        quarter = f'Q{quarter}'
+    return int(year), quarter, str(department).strip().lower()
+
+
+def load_budget_map() -> Dict[Tuple[int, str, str], int]:
+    """(year, quarter, lowercased department) -> budget id for every budget"""
+    return {
+        _budget_key(year, quarter, department): pk
+        for pk, year, quarter, department in Budget.objects.values_list('id', 'year', 'quarter', 'department')
+    }
+
+
+def import_expenses(lines: Iterable[str], user=None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    dry_run: bool = False, budget_map: Optional[Dict] = None) -> ImportReport:
+    """
+    Import expenses from an iterable of CSV lines with a header row.
+
+    Valid rows are created even when other rows fail; every rejected row is
+    listed in the report with its line number. With `dry_run` the rows are
+    only validated.
+    """
+    reader = csv.DictReader(lines)
+    columns = {name.strip().lower() for name in reader.fieldnames or ()}
+    missing = [name for name in REQUIRED_COLUMNS if name not in columns]
+    if missing:
+        raise ExpenseImportError(f"Missing columns: {', '.join(missing)}")
+
+    if budget_map is None:
+        budget_map = load_budget_map()
+    report = ImportReport(dry_run=dry_run)
+    pending: List[BudgetExpense] = []
+
+    def flush():
+        report.valid += len(pending)
+        if pending and not dry_run:
+            with transaction.atomic():
+                BudgetExpense.objects.bulk_create(pending, batch_size=chunk_size)
+                budgets.record_created(pending)
+            report.created += len(pending)
+        pending.clear()
+
+    for row in reader:
+        report.rows += 1
+        # Surplus cells on a row are collected under the None key; ignore them
+        row = {key.strip().lower(): (value or '').strip() for key, value in row.items() if key is not None}
+        # The header is line 1
+        line = reader.line_num
+
+        try:
+            budget_id = budget_map.get(_budget_key(row['year'], row['quarter'], row['department']))
+        except ValueError:
+            report.add_error(line, {'year': ['Enter a whole number.']})
+            continue
+        if budget_id is None:
+            report.add_error(line, {'budget': [
+                f"No budget for {row['department']} {row['year']} {row['quarter']}"
+            ]})
+            continue
+
+        form = BudgetExpenseForm(data=row)
+        if not form.is_valid():
+            report.add_error(line, {name: list(messages) for name, messages in form.errors.items()})
+            continue
+
+        expense = form.save(commit=False)
+        expense.budget_id = budget_id
+        expense.created_by = user
+        pending.append(expense)
+        if len(pending) >= chunk_size:
+            flush()
+
+    flush()
+    return report
@@ -0,0 +1,115 @@
+"""
+Facet counts for the repository filter chips
+
+Every chip dimension gets one grouped COUNT query under the current
+ListParams. Counts are disjunctive: a dimension's own selection is left out
+of its query, so the chips the user can still add or swap show what they
+would match rather than zero. Results are cached briefly under a key built
+from the user and the normalized filters, so paging and re-sorting a list
+do not recount it.
+"""
+import hashlib
+import json
+from datetime import timedelta
+from typing import Dict, List
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from contracts.domain.contracts import ListParams
+from contracts.models import Contract
+from contracts.services.repository import apply_filters
+
+CACHE_TIMEOUT = 30  # seconds
+CACHE_PREFIX = 'contract-facets'
+
+# Most frequent counterparties returned as chips
+FACET_LIMIT = 20
+
+# Date chips count contracts updated within the last N days
+DATE_BUCKETS = (7, 30, 90, 365)
+
+
+def cache_key(params: ListParams, user) -> str:
+    """Cache key for the filters in `params`; paging and sort are ignored"""
+    filters = {
+        'user': user.pk,
+        'q': (params.q or '').strip().lower(),
+        'status': sorted(s.value for s in params.status or []),
+        'contract_type': sorted(params.contract_type or []),
+        'counterparty': sorted(params.counterparty or []),
+        'people': sorted(params.people or []),
+        'date_from': params.date_from or '',
+        'date_to': params.date_to or '',
+        'value_min': params.value_min,
+        'value_max': params.value_max,
+        'risk_min': params.risk_min,
+    }
+    digest = hashlib.sha1(json.dumps(filters, sort_keys=True).encode()).hexdigest()
+    return f'{CACHE_PREFIX}:{digest}'
+
+
+def _grouped(queryset, field: str) -> List[Dict]:
+    rows = queryset.order_by().values(field).annotate(count=Count('pk')).order_by('-count', field)
+    return [{'value': row[field], 'count': row['count']} for row in rows]
+
+
+def _labelled(rows: List[Dict], labels: Dict) -> List[Dict]:
+    return [dict(row, label=labels.get(row['value'], row['value'])) for row in rows]
+
+
+def _counterparties(queryset) -> List[Dict]:
+    rows = (
+        queryset.filter(counterparty_entity__isnull=False).order_by()
+        .values('counterparty_entity', 'counterparty_entity__name').annotate(count=Count('pk'))
+        .order_by('-count', 'counterparty_entity__name')[:FACET_LIMIT]
+    )
+    return [
+        {'value': row['counterparty_entity'], 'label': row['counterparty_entity__name'], 'count': row['count']}
+        for row in rows
+    ]
+
+
+def _date_buckets(queryset) -> List[Dict]:
+    now = timezone.now()
+    counts = queryset.order_by().aggregate(**{
+        f'last_{days}': Count('pk', filter=Q(updated_at__gte=now - timedelta(days=days)))
+        for days in DATE_BUCKETS
+    })
+    return [
+        {'value': f'last_{days}', 'label': f'Last {days} days', 'count': counts[f'last_{days}'],
+         'date_from': (now - timedelta(days=days)).date().isoformat()}
+        for days in DATE_BUCKETS
+    ]
+
+
+def compute_facets(params: ListParams, user) -> Dict[str, List[Dict]]:
+    """Uncached facet counts for the contracts `user` can list"""
+    # Users only list their own contracts, so there is no people facet: it
+    # could only ever count the requesting user. The people filter still
+    # narrows the other dimensions.
+    base = Contract.objects.filter(created_by=user)
+    return {
+        'status': _labelled(
+            _grouped(apply_filters(base, params, skip=('status',)), 'status'),
+            dict(Contract.Status.choices),
+        ),
+        'contract_type': _labelled(
+            _grouped(apply_filters(base, params, skip=('contract_type',)).exclude(contract_type=''),
+                     'contract_type'),
+            dict(Contract.ContractType.choices),
+        ),
+        'counterparty': _counterparties(apply_filters(base, params, skip=('counterparty',))),
+        'date': _date_buckets(apply_filters(base, params, skip=('date',))),
+    }
+
+
+def facet_counts(params: ListParams, user) -> Dict[str, List[Dict]]:
+    """Facet counts for every chip dimension, cached for CACHE_TIMEOUT seconds"""
+    key = cache_key(params, user)
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(params, user)
+        cache.set(key, facets, CACHE_TIMEOUT)
+    return facets
@@ -0,0 +1,171 @@
+"""
+Budget burn-rate forecasting
+
+Expenses for every budget are loaded with one values_list query and the
+per-budget figures are computed as NumPy array operations, so the cost is
+one pass over the expense rows however many department-quarters there are.
+"""
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+from django.utils import timezone
+
+from contracts.models import Budget, BudgetExpense
+
+# Projected spend within this fraction of the allocation is flagged early
+AT_RISK_RATIO = 0.9
+
+
+@dataclass
+class BudgetForecast:
+    budget_id: int
+    allocated: float
+    spent: float
+    burn_rate: float
+    projected_spend: float
+    exhaustion_date: Optional[date]
+    status: str
+
+    @property
+    def projected_remaining(self) -> float:
+        return round(self.allocated - self.projected_spend, 2)
+
+    @property
+    def utilization(self) -> float:
+        if not self.allocated:
+            return 0.0
+        return round(self.spent * 100 / self.allocated, 1)
+
+    def to_dict(self) -> Dict:
+        return {
+            'budget_id': self.budget_id,
+            'allocated': self.allocated,
+            'spent': self.spent,
+            'burn_rate': self.burn_rate,
+            'projected_spend': self.projected_spend,
+            'projected_remaining': self.projected_remaining,
+            'utilization': self.utilization,
+            'exhaustion_date': self.exhaustion_date.isoformat() if self.exhaustion_date else None,
+            'status': self.status,
+        }
+
+
+def quarter_bounds(years: np.ndarray, quarters: np.ndarray):
+    """First and last day of each (year, quarter number) pair as datetime64[D]"""
+    months = (years - 1970) * 12 + (quarters - 1) * 3
+    start = months.astype('datetime64[M]')
+    end = (start + 3).astype('datetime64[D]') - 1
+    return start.astype('datetime64[D]'), end
+
+
+def compute_forecasts(allocated: np.ndarray, start: np.ndarray, end: np.ndarray,
+                      expense_budget: np.ndarray, expense_day: np.ndarray,
+                      expense_amount: np.ndarray, as_of: np.datetime64):
+    """
+    Vectorized forecast over n budgets and m expenses.
+
+    `expense_budget` holds each expense's budget position (0..n-1). Returns
+    spent, burn rate per day, projected end-of-quarter spend and the
+    exhaustion day (NaT when the allocation lasts the quarter).
+    """
+    n = len(allocated)
+    spent = np.bincount(expense_budget, weights=expense_amount, minlength=n)
+
+    # Burn rate is spend to date over days elapsed in the quarter so far
+    spent_to_date = np.bincount(
+        expense_budget, weights=np.where(expense_day <= as_of, expense_amount, 0.0), minlength=n
+    )
+    current = np.minimum(np.maximum(as_of, start - 1), end)
+    elapsed = (current - start).astype(np.int64) + 1
+    burn_rate = np.divide(spent_to_date, elapsed, out=np.zeros(n), where=elapsed > 0)
+    projected = spent + burn_rate * (end - current).astype(np.int64)
+
+    # Budgets already over their allocation: the day the running total crossed it
+    order = np.lexsort((expense_day, expense_budget))
+    sorted_budget = expense_budget[order]
+    running = np.cumsum(expense_amount[order])
+    group_start = np.searchsorted(sorted_budget, np.arange(n))
+    offset = np.concatenate(([0.0], running))[group_start]
+    running -= offset[sorted_budget]
+    crossed = running >= allocated[sorted_budget]
+    exhausted = np.full(n, np.datetime64('NaT'), dtype='datetime64[D]')
+    crossed_budgets, first = np.unique(sorted_budget[crossed], return_index=True)
+    exhausted[crossed_budgets] = expense_day[order][crossed][first]
+
+    # Otherwise extrapolate the burn rate from today, within the quarter
+    burning = np.isnat(exhausted) & (burn_rate > 0)
+    days_left = np.divide(allocated - spent, burn_rate, out=np.zeros(n), where=burning)
+    projected_day = current + np.ceil(days_left).astype(np.int64)
+    exhausted = np.where(burning & (projected_day <= end), projected_day, exhausted)
+
+    return spent, burn_rate, projected, exhausted
+
+
+def _status(allocated: float, spent: float, projected: float) -> str:
+    if spent > allocated:
+        return 'OVER_BUDGET'
+    if projected > allocated:
+        return 'PROJECTED_OVER'
+    if projected >= allocated * AT_RISK_RATIO:
+        return 'AT_RISK'
+    return 'ON_TRACK'
+
+
+def forecast_budgets(budget_ids: Optional[Iterable[int]] = None,
+                     as_of: Optional[date] = None) -> Dict[int, BudgetForecast]:
+    """Forecast the given budgets (all budgets by default) as of `as_of`"""
+    budgets = Budget.objects.order_by('id')
+    expenses = BudgetExpense.objects.order_by()
+    if budget_ids is not None:
+        budget_ids = list(budget_ids)
+        budgets = budgets.filter(id__in=budget_ids)
+        expenses = expenses.filter(budget_id__in=budget_ids)
+
+    rows = list(budgets.values_list('id', 'year', 'quarter', 'allocated_amount'))
+    if not rows:
+        return {}
+    ids = np.array([row[0] for row in rows], dtype=np.int64)
+    years = np.array([row[1] for row in rows], dtype=np.int64)
+    quarters = np.array([int(row[2][1]) for row in rows], dtype=np.int64)
+    allocated = np.array([row[3] for row in rows], dtype=np.float64)
+    start, end = quarter_bounds(years, quarters)
+
+    expense_rows = list(expenses.values_list('budget_id', 'date', 'amount'))
+    if expense_rows:
+        budget_col, day_col, amount_col = zip(*expense_rows)
+    else:
+        budget_col, day_col, amount_col = (), (), ()
+    expense_budget = np.searchsorted(ids, np.array(budget_col, dtype=np.int64))
+    expense_day = np.array(day_col, dtype='datetime64[D]')
+    expense_amount = np.array(amount_col, dtype=np.float64)
+
+    today = np.datetime64(as_of or timezone.localdate(), 'D')
+    spent, burn_rate, projected, exhausted = compute_forecasts(
+        allocated, start, end, expense_budget, expense_day, expense_amount, today
+    )
+
+    forecasts = {}
+    for i, budget_id in enumerate(ids.tolist()):
+        spent_i = round(float(spent[i]), 2)
+        projected_i = round(float(projected[i]), 2)
+        forecasts[budget_id] = BudgetForecast(
+            budget_id=budget_id,
+            allocated=float(allocated[i]),
+            spent=spent_i,
+            burn_rate=round(float(burn_rate[i]), 2),
+            projected_spend=projected_i,
+            exhaustion_date=None if np.isnat(exhausted[i]) else exhausted[i].item(),
+            status=_status(float(allocated[i]), spent_i, projected_i),
+        )
+    return forecasts
+
+
+def attach_forecasts(budgets: Iterable[Budget], as_of: Optional[date] = None):
+    """Annotate budget instances with `.forecast` for list templates"""
+    budgets = list(budgets)
+    forecasts = forecast_budgets([b.pk for b in budgets], as_of=as_of)
+    for budget in budgets:
+        budget.forecast = forecasts[budget.pk]
+    return budgets
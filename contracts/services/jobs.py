@@ -0,0 +1,196 @@
+"""
+Database-backed job queue for moving long-running work off the request path
+"""
+import importlib
+import logging
+import os
+import random
+import socket
+import traceback
+from datetime import timedelta
+from typing import Any, Callable, Dict, Optional
+
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from contracts.models import Job
+
+logger = logging.getLogger(__name__)
+
+# Modules imported by workers so their @job handlers get registered
+HANDLER_MODULES = ['contracts.tasks']
+
+BACKOFF_BASE_SECONDS = 5
+BACKOFF_MAX_SECONDS = 60 * 60
+STALE_LOCK_SECONDS = 15 * 60
+
+_registry: Dict[str, Callable] = {}
+
+
+class JobContext:
+    """Handed to job handlers so they can report progress back to the row"""
+
+    def __init__(self, job: Job):
+        self.job = job
+
+    @property
+    def payload(self) -> Dict[str, Any]:
+        return self.job.payload or {}
+
+    def progress(self, percent: int, message: str = "") -> None:
+        """Persist progress without touching the rest of the row"""
+        percent = max(0, min(100, int(percent)))
+        self.job.progress = percent
+        self.job.progress_message = message[:200]
+        Job.objects.filter(pk=self.job.pk).update(
+            progress=percent,
+            progress_message=self.job.progress_message,
+            updated_at=timezone.now(),
+        )
+
+
+def job(name: str):
+    """Register a function as the handler for jobs called `name`"""
+    def decorator(func: Callable[[JobContext], Any]) -> Callable[[JobContext], Any]:
+        _registry[name] = func
+        return func
+    return decorator
+
+
+def get_handler(name: str) -> Optional[Callable]:
+    return _registry.get(name)
+
+
+def autodiscover() -> None:
+    """Import handler modules so the registry is populated"""
+    for module in HANDLER_MODULES:
+        importlib.import_module(module)
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue(name: str, payload: Optional[Dict[str, Any]] = None, priority: int = 0,
+            max_attempts: int = 3, run_after=None, user=None) -> Job:
+    """Queue a job for the worker pool"""
+    return Job.objects.create(
+        name=name,
+        payload=payload or {},
+        priority=priority,
+        max_attempts=max_attempts,
+        run_after=run_after or timezone.now(),
+        created_by=user if user is not None and user.is_authenticated else None,
+    )
+
+
+def _claimable():
+    return Job.objects.filter(
+        status=Job.Status.QUEUED,
+        run_after__lte=timezone.now(),
+    ).order_by('-priority', 'run_after', 'id')
+
+
+def _claim_skip_locked(worker_id: str) -> Optional[Job]:
+    """Row-lock claim for backends with SKIP LOCKED (PostgreSQL)"""
+    with transaction.atomic():
+        job_row = _claimable().select_for_update(skip_locked=True).first()
+        if job_row is None:
+            return None
+        now = timezone.now()
+        job_row.status = Job.Status.RUNNING
+        job_row.locked_by = worker_id
+        job_row.locked_at = now
+        job_row.attempts += 1
+        job_row.save(update_fields=['status', 'locked_by', 'locked_at', 'attempts', 'updated_at'])
+        return job_row
+
+
+def _claim_conditional_update(worker_id: str, candidates: int = 5) -> Optional[Job]:
+    """
+    Optimistic claim for backends without SKIP LOCKED (SQLite).
+
+    SQLite serialises writers, so a conditional UPDATE that only matches while
+    the row is still QUEUED gives the same exactly-once guarantee: whichever
+    worker's UPDATE lands first wins and the others move on to the next row.
+    """
+    for pk in _claimable().values_list('pk', flat=True)[:candidates]:
+        now = timezone.now()
+        claimed = Job.objects.filter(pk=pk, status=Job.Status.QUEUED).update(
+            status=Job.Status.RUNNING,
+            locked_by=worker_id,
+            locked_at=now,
+            attempts=F('attempts') + 1,
+            updated_at=now,
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def claim_next(worker_id: Optional[str] = None) -> Optional[Job]:
+    """Claim the highest-priority runnable job, or None if the queue is idle"""
+    worker_id = worker_id or default_worker_id()
+    if connection.features.has_select_for_update_skip_locked:
+        return _claim_skip_locked(worker_id)
+    return _claim_conditional_update(worker_id)
+
+
+def backoff_delay(attempts: int) -> timedelta:
+    """Exponential backoff, jittered so retries from a burst do not line up"""
+    ceiling = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** max(attempts - 1, 0)))
+    return timedelta(seconds=random.uniform(ceiling / 2, ceiling))
+
+
+def run_job(job_row: Job) -> Job:
+    """Execute a claimed job and record the outcome"""
+    handler = get_handler(job_row.name)
+    if handler is None:
+        autodiscover()
+        handler = get_handler(job_row.name)
+
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for job '{job_row.name}'")
+        result = handler(JobContext(job_row))
+    except Exception:
+        job_row.last_error = traceback.format_exc()[-4000:]
+        job_row.locked_by = ''
+        job_row.locked_at = None
+        if job_row.attempts < job_row.max_attempts and handler is not None:
+            job_row.status = Job.Status.QUEUED
+            job_row.run_after = timezone.now() + backoff_delay(job_row.attempts)
+        else:
+            job_row.status = Job.Status.FAILED
+            job_row.finished_at = timezone.now()
+        logger.warning("Job %s failed (attempt %s/%s)", job_row.pk, job_row.attempts, job_row.max_attempts)
+    else:
+        job_row.status = Job.Status.SUCCEEDED
+        job_row.result = result
+        job_row.progress = 100
+        job_row.locked_by = ''
+        job_row.locked_at = None
+        job_row.finished_at = timezone.now()
+
+    job_row.save()
+    return job_row
+
+
+def requeue_stale(timeout_seconds: int = STALE_LOCK_SECONDS) -> int:
+    """Return jobs held by crashed workers to the queue"""
+    cutoff = timezone.now() - timedelta(seconds=timeout_seconds)
+    return Job.objects.filter(status=Job.Status.RUNNING, locked_at__lt=cutoff).update(
+        status=Job.Status.QUEUED,
+        locked_by='',
+        locked_at=None,
+        run_after=timezone.now(),
+    )
+
+
+def run_once(worker_id: Optional[str] = None) -> Optional[Job]:
+    """Claim and run a single job; returns it, or None when nothing was ready"""
+    job_row = claim_next(worker_id)
+    if job_row is None:
+        return None
+    return run_job(job_row)
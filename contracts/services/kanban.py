@@ -0,0 +1,197 @@
+"""
+Kanban board operations for legal tasks
+"""
+from typing import Any, Dict, List, Optional
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from contracts.domain.ranking import key_between, spread_keys
+from contracts.models import LegalTask
+from contracts.services import dashboard, events
+
+DEFAULT_COLUMN_SIZE = 25
+
+# Keys only grow when cards are repeatedly squeezed into the same gap; past
+# this length the column is re-spread once instead of letting keys get long.
+MAX_RANK_LENGTH = 48
+
+
+class KanbanError(ValueError):
+    """Raised for moves, cursors or columns that do not match the board"""
+
+
+def _column(status: str):
+    return LegalTask.objects.filter(status=status).order_by('rank', 'id')
+
+
+def rebalance_column(status: str) -> None:
+    """Re-spread the rank keys of one column, keeping the current order"""
+    tasks = list(_column(status).only('id', 'rank'))
+    for task, rank in zip(tasks, spread_keys(len(tasks))):
+        task.rank = rank
+    LegalTask.objects.bulk_update(tasks, ['rank'], batch_size=500)
+
+
+def _neighbours_at(status: str, position: int, exclude_pk: int):
+    """Ranks of the cards that will sit above and below `position`"""
+    if position < 0:
+        raise KanbanError("Position must be zero or greater")
+    ranks = _column(status).exclude(pk=exclude_pk).values_list('rank', flat=True)
+    if position == 0:
+        below = ranks.first()
+        return None, below
+    window = list(ranks[position - 1:position + 1])
+    if not window:
+        return ranks.last(), None
+    return window[0], window[1] if len(window) > 1 else None
+
+
+def _rank_for(move: Dict[str, Any], task: LegalTask, status: str, rebalanced: bool = False) -> str:
+    after_id = move.get('after_id')
+    before_id = move.get('before_id')
+
+    if after_id is not None or before_id is not None:
+        above = _rank_of(after_id, status)
+        below = _rank_of(before_id, status)
+    elif move.get('position') is not None:
+        above, below = _neighbours_at(status, int(move['position']), task.pk)
+    else:
+        above, below = _column(status).exclude(pk=task.pk).values_list('rank', flat=True).last(), None
+
+    if above is not None and below is not None and above >= below:
+        if rebalanced:
+            raise KanbanError("after_id must be above before_id")
+        # Concurrent inserts can leave two cards sharing a key
+        rebalance_column(status)
+        return _rank_for(move, task, status, rebalanced=True)
+    return key_between(above, below)
+
+
+def _rank_of(task_id: Optional[int], status: str) -> Optional[str]:
+    if task_id is None:
+        return None
+    row = LegalTask.objects.filter(pk=task_id).values_list('status', 'rank').first()
+    if row is None:
+        raise KanbanError(f"Task {task_id} not found")
+    if row[0] != status:
+        raise KanbanError(f"Task {task_id} is not in column {status}")
+    return row[1]
+
+
+def apply_moves(moves: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Apply a batch of card moves in one transaction.
+
+    Each move is ``{"id": ..., "status": ..., "after_id": ..., "before_id": ...}``
+    where the neighbour ids name the cards directly above and below the drop
+    target; ``{"position": n}`` may be sent instead of neighbours. Moves are
+    applied in order so later moves can reference cards moved earlier.
+    """
+    if not isinstance(moves, list) or not moves:
+        raise KanbanError("No moves given")
+
+    valid_statuses = set(LegalTask.Status.values)
+    results = []
+    with transaction.atomic():
+        for move in moves:
+            try:
+                task = LegalTask.objects.select_for_update().only('id', 'status', 'rank').get(pk=move['id'])
+            except (KeyError, TypeError):
+                raise KanbanError("Each move needs an id")
+            except LegalTask.DoesNotExist:
+                raise KanbanError(f"Task {move['id']} not found")
+
+            status = move.get('status') or task.status
+            if status not in valid_statuses:
+                raise KanbanError(f"Invalid status: {status}")
+
+            rank = _rank_for(move, task, status)
+            LegalTask.objects.filter(pk=task.pk).update(status=status, rank=rank, updated_at=timezone.now())
+            if len(rank) > MAX_RANK_LENGTH:
+                rebalance_column(status)
+                rank = LegalTask.objects.values_list('rank', flat=True).get(pk=task.pk)
+            results.append({'id': task.pk, 'status': status, 'rank': rank})
+            events.publish('tasks', 'task.moved', results[-1])
+    # Queryset updates send no signals, and the pending task count may have moved
+    dashboard.invalidate()
+    return results
+
+
+def encode_cursor(task: LegalTask) -> str:
+    return f"{task.rank}:{task.pk}"
+
+
+def decode_cursor(cursor: str):
+    try:
+        rank, pk = cursor.rsplit(':', 1)
+        return rank, int(pk)
+    except (AttributeError, ValueError):
+        raise KanbanError(f"Invalid cursor: {cursor!r}")
+
+
+def _card_queryset():
+    return LegalTask.objects.select_related('assigned_to')
+
+
+def board_columns(per_column: int = DEFAULT_COLUMN_SIZE) -> List[Dict[str, Any]]:
+    """
+    First `per_column` cards of every status column plus per-column totals.
+
+    Two queries regardless of board size: one grouped count, and one
+    ROW_NUMBER() OVER (PARTITION BY status ORDER BY rank) query that is cut
+    off at `per_column` rows per partition inside the database.
+    """
+    totals = dict(
+        LegalTask.objects.order_by().values_list('status').annotate(total=Count('id'))
+    )
+    cards = (
+        _card_queryset()
+        .annotate(column_row=Window(
+            RowNumber(),
+            partition_by=[F('status')],
+            order_by=[F('rank').asc(), F('id').asc()],
+        ))
+        .filter(column_row__lte=per_column)
+        .order_by('status', 'rank', 'id')
+    )
+
+    by_status: Dict[str, List[LegalTask]] = {}
+    for task in cards:
+        by_status.setdefault(task.status, []).append(task)
+
+    columns = []
+    for status, label in LegalTask.Status.choices:
+        tasks = by_status.get(status, [])
+        total = totals.get(status, 0)
+        columns.append({
+            'status': status,
+            'label': label,
+            'tasks': tasks,
+            'total': total,
+            'next_cursor': encode_cursor(tasks[-1]) if tasks and total > len(tasks) else None,
+        })
+    return columns
+
+
+def column_page(status: str, cursor: Optional[str] = None,
+                limit: int = DEFAULT_COLUMN_SIZE) -> Dict[str, Any]:
+    """Keyset page of one column, continuing after `cursor`"""
+    if status not in LegalTask.Status.values:
+        raise KanbanError(f"Invalid status: {status}")
+
+    queryset = _card_queryset().filter(status=status)
+    if cursor:
+        rank, pk = decode_cursor(cursor)
+        queryset = queryset.filter(Q(rank__gt=rank) | Q(rank=rank, pk__gt=pk))
+    tasks = list(queryset.order_by('rank', 'id')[:limit + 1])
+
+    has_more = len(tasks) > limit
+    tasks = tasks[:limit]
+    return {
+        'status': status,
+        'tasks': tasks,
+        'next_cursor': encode_cursor(tasks[-1]) if has_more else None,
+    }
@@ -0,0 +1,258 @@
+"""
+Near-duplicate contracts and clauses via MinHash/LSH
+
+Every contract and library clause has a TextSignature (MinHash signature
+stored as bytes) and one SignatureBand row per LSH band. Texts sharing a
+band bucket are candidates; only candidates are compared on their full
+signatures, so lookups and the duplicate-cluster report never compare
+every pair. Signatures are recomputed only when the text's hash changes.
+"""
+from dataclasses import dataclass, field
+from functools import reduce
+from operator import or_
+from typing import Dict, Iterable, List, Tuple
+
+from django.db import transaction
+from django.db.models import CharField, Exists, OuterRef, Q
+from django.db.models.functions import Cast
+
+from contracts.domain import minhash
+from contracts.models import Contract, SignatureBand, TextSignature
+from contracts.services.clause_usage import library_patterns
+from contracts.services.clauses import get_clause_service
+from contracts.services.scanning import content_hash
+
+DEFAULT_THRESHOLD = 0.8
+BUILD_BATCH_SIZE = 500
+
+Kind = TextSignature.Kind
+
+
+@dataclass
+class NearDuplicate:
+    kind: str
+    object_id: str
+    title: str
+    similarity: float
+
+    def to_dict(self) -> Dict:
+        return {
+            'kind': self.kind,
+            'id': self.object_id,
+            'title': self.title,
+            'similarity': self.similarity,
+        }
+
+
+@dataclass
+class DuplicateCluster:
+    kind: str
+    members: List[Tuple[str, str]] = field(default_factory=list)
+    # Weakest verified link that joined the cluster
+    similarity: float = 1.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'kind': self.kind,
+            'size': len(self.members),
+            'similarity': self.similarity,
+            'members': [{'id': object_id, 'title': title} for object_id, title in self.members],
+        }
+
+
+def _natural(object_id: str) -> Tuple[int, str]:
+    return len(object_id), object_id
+
+
+def _titles(kind: str, object_ids: Iterable[str]) -> Dict[str, str]:
+    object_ids = list(object_ids)
+    if kind == Kind.CLAUSE:
+        clauses = (get_clause_service().get_clause(object_id) for object_id in object_ids)
+        return {clause.id: clause.title for clause in clauses if clause}
+    return {
+        str(pk): title
+        for pk, title in Contract.objects.filter(pk__in=object_ids).values_list('pk', 'title')
+    }
+
+
+def store_signatures(kind: str, texts: Iterable[Tuple[str, str]], force: bool = False) -> int:
+    """Upsert signatures of (object id, text) pairs whose text changed; returns the number written"""
+    texts = {str(object_id): text for object_id, text in texts}
+    if not texts:
+        return 0
+    hashes = {object_id: content_hash(text) for object_id, text in texts.items()}
+    if not force:
+        unchanged = TextSignature.objects.filter(kind=kind, object_id__in=list(texts)).values_list(
+            'object_id', 'content_hash',
+        )
+        for object_id, digest in unchanged:
+            if hashes[object_id] == digest:
+                del texts[object_id]
+    if not texts:
+        return 0
+
+    signatures = {object_id: minhash.signature(text) for object_id, text in texts.items()}
+    with transaction.atomic():
+        TextSignature.objects.bulk_create(
+            [
+                TextSignature(kind=kind, object_id=object_id, content_hash=hashes[object_id],
+                              signature=minhash.to_bytes(sig))
+                for object_id, sig in signatures.items()
+            ],
+            update_conflicts=True, unique_fields=['kind', 'object_id'],
+            update_fields=['content_hash', 'signature', 'updated_at'],
+        )
+        ids = dict(TextSignature.objects.filter(kind=kind, object_id__in=list(signatures)).values_list(
+            'object_id', 'pk',
+        ))
+        SignatureBand.objects.filter(signature_id__in=ids.values()).delete()
+        SignatureBand.objects.bulk_create([
+            SignatureBand(signature_id=ids[object_id], band=band, bucket=bucket)
+            for object_id, sig in signatures.items() if not minhash.is_empty(sig)
+            for band, bucket in enumerate(minhash.band_keys(sig))
+        ])
+    return len(signatures)
+
+
+def update_contract(contract: Contract) -> bool:
+    """Refresh one contract's signature if its content changed; True if written"""
+    return bool(store_signatures(Kind.CONTRACT, [(contract.pk, contract.content)]))
+
+
+def remove_contract(contract_id: int) -> None:
+    TextSignature.objects.filter(kind=Kind.CONTRACT, object_id=str(contract_id)).delete()
+
+
+def sync_clauses(force: bool = False) -> int:
+    """Bring clause signatures in line with the in-memory library"""
+    patterns = library_patterns()
+    written = store_signatures(Kind.CLAUSE, patterns, force=force)
+    TextSignature.objects.filter(kind=Kind.CLAUSE).exclude(
+        object_id__in=[clause_id for clause_id, _ in patterns],
+    ).delete()
+    return written
+
+
+def build_all(force: bool = False, batch_size: int = BUILD_BATCH_SIZE) -> Dict[str, int]:
+    """Sign every contract and clause whose text changed since it was last signed"""
+    stats = {'contracts': 0, 'clauses': sync_clauses(force=force)}
+    batch = []
+    contracts = Contract.objects.order_by('pk').values_list('pk', 'content')
+    for row in contracts.iterator(chunk_size=batch_size):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            stats['contracts'] += store_signatures(Kind.CONTRACT, batch, force=force)
+            batch = []
+    stats['contracts'] += store_signatures(Kind.CONTRACT, batch, force=force)
+    # Contracts deleted without signals (e.g. queryset deletes)
+    TextSignature.objects.filter(kind=Kind.CONTRACT).exclude(
+        object_id__in=Contract.objects.annotate(key=Cast('pk', CharField())).values('key'),
+    ).delete()
+    return stats
+
+
+def find_near_duplicates(kind: str, object_id, threshold: float = DEFAULT_THRESHOLD) -> List[NearDuplicate]:
+    """Texts of the same kind estimated at least `threshold` similar to the given one, best first"""
+    if kind == Kind.CLAUSE:
+        sync_clauses()
+    target = TextSignature.objects.filter(kind=kind, object_id=str(object_id)).first()
+    if target is None:
+        raise ValueError(f'No signature for {kind} {object_id}')
+    keys = list(target.bands.values_list('band', 'bucket'))
+    if not keys:
+        return []
+
+    same_bucket = reduce(or_, (Q(band=band, bucket=bucket) for band, bucket in keys))
+    candidate_ids = (
+        SignatureBand.objects.filter(same_bucket, signature__kind=kind)
+        .exclude(signature_id=target.pk)
+        .order_by()
+        .values_list('signature_id', flat=True)
+        .distinct()
+    )
+    reference = minhash.from_bytes(target.signature)
+    scored = []
+    for other_id, sig in TextSignature.objects.filter(pk__in=candidate_ids).values_list('object_id', 'signature'):
+        value = minhash.estimate_similarity(reference, minhash.from_bytes(sig))
+        if value >= threshold:
+            scored.append((other_id, value))
+
+    titles = _titles(kind, (other_id for other_id, _ in scored))
+    matches = [
+        NearDuplicate(kind=kind, object_id=other_id, title=titles.get(other_id, ''), similarity=value)
+        for other_id, value in scored
+    ]
+    matches.sort(key=lambda match: (-match.similarity, _natural(match.object_id)))
+    return matches
+
+
+def _find(parent: Dict[int, int], node: int) -> int:
+    while parent[node] != node:
+        parent[node] = parent[parent[node]]
+        node = parent[node]
+    return node
+
+
+def duplicate_clusters(kind: str, threshold: float = DEFAULT_THRESHOLD) -> List[DuplicateCluster]:
+    """
+    Groups of texts of one kind linked by pairwise similarity >= `threshold`.
+
+    Only band rows whose bucket holds another signature are read, and only
+    pairs sharing a bucket are verified, so the cost follows the number of
+    collisions rather than the square of the number of texts.
+    """
+    if kind == Kind.CLAUSE:
+        sync_clauses()
+    shared = SignatureBand.objects.filter(
+        band=OuterRef('band'), bucket=OuterRef('bucket'), signature__kind=kind,
+    ).exclude(signature_id=OuterRef('signature_id'))
+    rows = (
+        SignatureBand.objects.filter(Exists(shared), signature__kind=kind)
+        .order_by('band', 'bucket', 'signature_id')
+        .values_list('band', 'bucket', 'signature_id')
+    )
+    buckets: Dict[Tuple[int, int], List[int]] = {}
+    for band, bucket, signature_id in rows:
+        buckets.setdefault((band, bucket), []).append(signature_id)
+    if not buckets:
+        return []
+
+    members = {sid for ids in buckets.values() for sid in ids}
+    signatures = {
+        pk: (object_id, minhash.from_bytes(sig))
+        for pk, object_id, sig in TextSignature.objects.filter(pk__in=members).values_list(
+            'pk', 'object_id', 'signature',
+        )
+    }
+    parent = {pk: pk for pk in signatures}
+    weakest: Dict[int, float] = {}
+    checked = set()
+    for ids in buckets.values():
+        for i, left in enumerate(ids):
+            for right in ids[i + 1:]:
+                if (left, right) in checked:
+                    continue
+                checked.add((left, right))
+                value = minhash.estimate_similarity(signatures[left][1], signatures[right][1])
+                if value < threshold:
+                    continue
+                a, b = _find(parent, left), _find(parent, right)
+                link = min(value, weakest.get(a, 1.0), weakest.get(b, 1.0))
+                if a != b:
+                    parent[b] = a
+                weakest[a] = link
+
+    groups: Dict[int, List[str]] = {}
+    for pk, (object_id, _) in signatures.items():
+        groups.setdefault(_find(parent, pk), []).append(object_id)
+    titles = _titles(kind, (object_id for ids in groups.values() if len(ids) > 1 for object_id in ids))
+    clusters = [
+        DuplicateCluster(
+            kind=kind,
+            members=[(object_id, titles.get(object_id, '')) for object_id in sorted(ids, key=_natural)],
+            similarity=weakest.get(root, 1.0),
+        )
+        for root, ids in groups.items() if len(ids) > 1
+    ]
+    clusters.sort(key=lambda cluster: (-len(cluster.members), _natural(cluster.members[0][0])))
+    return clusters
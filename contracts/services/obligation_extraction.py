@@ -0,0 +1,103 @@
+"""
+Obligation candidates extracted from contract text
+
+The precompiled rules in contracts.domain.obligation_rules propose
+ObligationCandidate rows for review; accepting one creates the obligation in
+the obligation service. Extraction runs over the corpus in a process pool
+and, like clause usage, only revisits contracts whose content hash or rule
+set changed. Reviewed candidates survive re-extraction and are not proposed
+again.
+"""
+import hashlib
+from typing import Dict, List, Tuple
+
+from django.db import transaction
+
+from contracts.domain import obligation_rules
+from contracts.models import Contract, ContractScan, ObligationCandidate
+from contracts.services.obligations import get_obligation_service
+from contracts.services.scanning import SCAN_BATCH_SIZE, content_hash, is_current, record_scans, scan_contracts
+
+ANALYZER = ContractScan.Analyzer.OBLIGATIONS
+
+
+def rules_version() -> str:
+    return hashlib.sha1(obligation_rules.rules_fingerprint().encode()).hexdigest()
+
+
+def _extract_batch(batch: List[Tuple]) -> List[Tuple[int, List[obligation_rules.Candidate]]]:
+    # Relative deadlines count from when the contract was recorded
+    return [(pk, obligation_rules.extract(content, created_at.date())) for pk, content, created_at in batch]
+
+
+def _store(results, hashes: Dict[int, str], version: str) -> int:
+    """Replace the proposed candidates of the extracted contracts; returns candidates written"""
+    contract_ids = [pk for pk, _ in results]
+    with transaction.atomic():
+        ObligationCandidate.objects.filter(
+            contract_id__in=contract_ids, status=ObligationCandidate.Status.PROPOSED,
+        ).delete()
+        reviewed = set(
+            ObligationCandidate.objects.filter(contract_id__in=contract_ids)
+            .values_list('contract_id', 'title', 'due_date')
+        )
+        candidates = [
+            ObligationCandidate(contract_id=pk, rule=found.rule, title=found.title, due_date=found.due_date,
+                                excerpt=found.excerpt, offset=found.offset)
+            for pk, candidates in results
+            for found in candidates
+            if (pk, found.title, found.due_date) not in reviewed
+        ]
+        ObligationCandidate.objects.bulk_create(candidates)
+        record_scans(ANALYZER, hashes, version)
+    return len(candidates)
+
+
+def extract_contract(contract: Contract, force: bool = False) -> bool:
+    """Re-extract one contract if its content or the rules changed; True if extracted"""
+    version = rules_version()
+    digest = content_hash(contract.content)
+    if not force and is_current(contract.pk, ANALYZER, digest, version):
+        return False
+    _store(_extract_batch([(contract.pk, contract.content, contract.created_at)]), {contract.pk: digest}, version)
+    return True
+
+
+def extract_all(workers: int = 0, force: bool = False, batch_size: int = SCAN_BATCH_SIZE) -> Dict[str, int]:
+    """Extract candidates from every contract whose content or the rules changed"""
+    version = rules_version()
+    stats = scan_contracts(
+        ANALYZER, version, _extract_batch, lambda results, hashes: _store(results, hashes, version),
+        workers=workers, force=force, batch_size=batch_size, fields=('created_at',),
+    )
+    stats['candidates'] = stats.pop('written')
+    return stats
+
+
+def accept(candidate: ObligationCandidate, user, assigned_to: str = '', priority: str = 'medium') -> str:
+    """Turn a proposed candidate into an obligation; returns the obligation id"""
+    if candidate.status != ObligationCandidate.Status.PROPOSED:
+        raise ValueError(f'Candidate is already {candidate.get_status_display().lower()}')
+    if candidate.due_date is None:
+        raise ValueError('Candidate has no due date')
+    obligation = get_obligation_service().create_obligation(
+        title=candidate.title,
+        description=candidate.excerpt,
+        due_date=candidate.due_date.isoformat(),
+        contract_id=str(candidate.contract_id),
+        assigned_to=assigned_to or user.username,
+        priority=priority,
+    )
+    candidate.status = ObligationCandidate.Status.ACCEPTED
+    candidate.obligation_id = obligation.id
+    candidate.reviewed_by = user
+    candidate.save(update_fields=['status', 'obligation_id', 'reviewed_by'])
+    return obligation.id
+
+
+def reject(candidate: ObligationCandidate, user) -> None:
+    if candidate.status != ObligationCandidate.Status.PROPOSED:
+        raise ValueError(f'Candidate is already {candidate.get_status_display().lower()}')
+    candidate.status = ObligationCandidate.Status.REJECTED
+    candidate.reviewed_by = user
+    candidate.save(update_fields=['status', 'reviewed_by'])
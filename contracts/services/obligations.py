@@ -2,10 +2,14 @@
 """
 Obligations service for tracking contract obligations and key dates
 """
+import functools
 from typing import List, Dict, Optional
 from datetime import datetime, date, timedelta
 import uuid
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from config.feature_flags import is_test_mode
+from contracts.services.catalogs import SharedCatalog, restore_object
 
 class Obligation:
     def __init__(self, id: str, title: str, description: str, due_date: str,
@@ -21,10 +25,22 @@ class Obligation:
         self.status = status  # pending, in_progress, completed, overdue
         self.reminder_days = reminder_days
         self.created_at = datetime.now().isoformat()
+        # Aware datetime of the last change, read by delta sync
+        self.updated_at = timezone.now()
+
+def _restore_obligation(data: Dict) -> Obligation:
+    obligation = restore_object(Obligation, data)
+    obligation.updated_at = parse_datetime(obligation.updated_at)
+    return obligation
 
 class ObligationService:
     def __init__(self):
-        self._obligations = self._get_mock_obligations() if is_test_mode() else {}
+        self._obligations = self._initial_obligations()
+        # Applies obligation changes made by other worker processes
+        self._catalog = SharedCatalog('obligations', _restore_obligation, self._initial_obligations)
+
+    def _initial_obligations(self) -> Dict[str, Obligation]:
+        return self._get_mock_obligations() if is_test_mode() else {}
     
     def _get_mock_obligations(self) -> Dict[str, Obligation]:
         """Generate mock obligation data for testing"""
@@ -57,6 +73,7 @@ class ObligationService:
                         assigned_to: Optional[str] = None,
                         status: Optional[str] = None) -> List[Obligation]:
         """List obligations with optional filtering"""
+        self._catalog.sync(self._obligations)
         obligations = list(self._obligations.values())
         
         if contract_id:
@@ -70,14 +87,13 @@ class ObligationService:
         
         # Update overdue status
         today = date.today().isoformat()
-        for obligation in obligations:
-            if obligation.due_date < today and obligation.status == "pending":
-                obligation.status = "overdue"
+        self._mark_overdue([o for o in obligations if o.due_date < today and o.status == "pending"])
         
         return sorted(obligations, key=lambda o: o.due_date)
     
     def get_upcoming_obligations(self, days_ahead: int = 30) -> List[Obligation]:
         """Get obligations due within specified days"""
+        self._catalog.sync(self._obligations)
         cutoff_date = (date.today() + timedelta(days=days_ahead)).isoformat()
         today = date.today().isoformat()
         
@@ -88,14 +104,20 @@ class ObligationService:
     
     def get_overdue_obligations(self) -> List[Obligation]:
         """Get all overdue obligations"""
+        self._catalog.sync(self._obligations)
         today = date.today().isoformat()
         obligations = [o for o in self._obligations.values() 
                       if o.due_date < today and o.status in ["pending", "in_progress"]]
+        self._mark_overdue(obligations)
         
+        return sorted(obligations, key=lambda o: o.due_date)
+    
+    def _mark_overdue(self, obligations: List[Obligation]) -> None:
+        """Record obligations as overdue through the catalog, so other workers see it too"""
         for obligation in obligations:
             obligation.status = "overdue"
-        
-        return sorted(obligations, key=lambda o: o.due_date)
+            obligation.updated_at = timezone.now()
+            self._catalog.saved(obligation.id, obligation)
     
     def create_obligation(self, title: str, description: str, due_date: str,
                          contract_id: str, assigned_to: str = "", 
@@ -105,10 +127,12 @@ class ObligationService:
         obligation = Obligation(obligation_id, title, description, due_date,
                               contract_id, assigned_to, priority)
         self._obligations[obligation_id] = obligation
+        self._catalog.saved(obligation_id, obligation)
         return obligation
     
     def update_obligation(self, obligation_id: str, **kwargs) -> Optional[Obligation]:
         """Update an existing obligation"""
+        self._catalog.sync(self._obligations)
         obligation = self._obligations.get(obligation_id)
         if not obligation:
             return None
@@ -116,12 +140,27 @@ class ObligationService:
         for key, value in kwargs.items():
             if hasattr(obligation, key):
                 setattr(obligation, key, value)
+        obligation.updated_at = timezone.now()
+        self._catalog.saved(obligation_id, obligation)
         
         return obligation
     
+    def changed_since(self, since: datetime) -> List[Obligation]:
+        """Obligations created or updated after `since`"""
+        self._catalog.sync(self._obligations)
+        return [o for o in self._obligations.values() if o.updated_at > since]
+    
     def get_dashboard_timeline(self, days_ahead: int = 60) -> List[Obligation]:
         """Get obligations for dashboard timeline view"""
         return self.get_upcoming_obligations(days_ahead)
 
-# Global service instance
-obligation_service = ObligationService()
+# Global service instance, built on first use rather than at import
+@functools.cache
+def get_obligation_service() -> ObligationService:
+    return ObligationService()
+
+def __getattr__(attr):
+    # Keeps `from contracts.services.obligations import obligation_service` working
+    if attr == 'obligation_service':
+        return get_obligation_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
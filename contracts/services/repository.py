@@ -3,13 +3,100 @@
 Repository service implementation for contracts
 """
 import time
-from typing import List, Dict, Any
+from dataclasses import asdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List
 from django.contrib.auth.models import User
 from django.db.models import Q
+from django.utils import timezone
 from contracts.models import Contract
 from contracts.domain.contracts import (
     RepositoryService, ContractData, ContractStatus, ListParams, ListResult
 )
+from contracts.services import caching, dashboard, events
+
+# Filter dimensions of ListParams; facet counts skip one at a time
+FILTER_DIMENSIONS = ('q', 'status', 'contract_type', 'counterparty', 'people', 'date', 'value', 'risk_min')
+
+# Every sort leads with an indexed column; ties break on pk for stable pages
+SORT_FIELDS = {
+    'title': ('title', 'pk'),
+    'status': ('status', 'pk'),
+    'updated_desc': ('-updated_at', '-pk'),
+    'updated_asc': ('updated_at', 'pk'),
+    'risk_desc': ('-risk_score', '-pk'),
+    'risk_asc': ('risk_score', 'pk'),
+    'value_desc': ('-value', '-pk'),
+    'value_asc': ('value', 'pk'),
+    'counterparty': ('counterparty', 'pk'),
+    'counterparty_desc': ('-counterparty', '-pk'),
+}
+DEFAULT_SORT = 'updated_desc'
+
+# List pages are dropped when one of the owner's contracts is saved, deleted
+# or bulk updated; the timeout bounds staleness from other queryset writes
+# such as risk score refreshes
+LIST_CACHE_TIMEOUT = 30  # seconds
+
+
+def _day_start(day: str) -> datetime:
+    return timezone.make_aware(datetime.combine(date.fromisoformat(day), datetime.min.time()))
+
+
+def apply_filters(queryset, params: ListParams, skip: Iterable[str] = ()):
+    """Narrow a Contract queryset by the filters in `params`, except the dimensions in `skip`"""
+    if params.q and 'q' not in skip:
+        queryset = queryset.filter(
+            Q(title__icontains=params.q) | 
+            Q(counterparty__icontains=params.q)
+        )
+    
+    if params.status and 'status' not in skip:
+        status_values = [s.value for s in params.status]
+        queryset = queryset.filter(status__in=status_values)
+    
+    if params.contract_type and 'contract_type' not in skip:
+        queryset = queryset.filter(contract_type__in=params.contract_type)
+    
+    if params.counterparty and 'counterparty' not in skip:
+        queryset = queryset.filter(counterparty_entity_id__in=params.counterparty)
+    
+    if params.people and 'people' not in skip:
+        queryset = queryset.filter(created_by__username__in=params.people)
+    
+    # Compare the raw column with day boundaries so the updated_at index applies
+    if 'date' not in skip:
+        if params.date_from:
+            queryset = queryset.filter(updated_at__gte=_day_start(params.date_from))
+        if params.date_to:
+            queryset = queryset.filter(updated_at__lt=_day_start(params.date_to) + timedelta(days=1))
+    
+    if 'value' not in skip:
+        if params.value_min is not None:
+            queryset = queryset.filter(value__gte=params.value_min)
+        if params.value_max is not None:
+            queryset = queryset.filter(value__lte=params.value_max)
+    
+    if params.risk_min is not None and 'risk_min' not in skip:
+        queryset = queryset.filter(risk_score__gte=params.risk_min)
+    
+    return queryset
+
+
+def contract_to_data(contract: Contract) -> ContractData:
+    """Convert Django model to domain object"""
+    return ContractData(
+        id=str(contract.id),
+        title=contract.title,
+        counterparty=contract.counterparty,
+        status=ContractStatus(contract.status),
+        hint=f"Created {contract.created_at.strftime('%b %d, %Y')}",
+        updated_at=contract.updated_at.isoformat(),
+        contract_type=contract.contract_type,
+        value=float(contract.value) if contract.value else None,
+        risk_score=contract.risk_score
+    )
+
 
 class DjangoRepositoryService:
     """Django ORM implementation of RepositoryService"""
@@ -19,47 +106,13 @@ class DjangoRepositoryService:
     
     def _contract_to_data(self, contract: Contract) -> ContractData:
         """Convert Django model to domain object"""
-        return ContractData(
-            id=str(contract.id),
-            title=contract.title,
-            counterparty=contract.counterparty,
-            status=ContractStatus(contract.status),
-            hint=f"Created {contract.created_at.strftime('%b %d, %Y')}",
-            updated_at=contract.updated_at.isoformat(),
-            contract_type=contract.contract_type,
-            value=float(contract.value) if contract.value else None
-        )
+        return contract_to_data(contract)
     
     def list(self, params: ListParams) -> ListResult:
         """List contracts with filtering and pagination"""
-        queryset = Contract.objects.filter(created_by=self.user)
-        
-        # Apply filters
-        if params.q:
-            queryset = queryset.filter(
-                Q(title__icontains=params.q) | 
-                Q(counterparty__icontains=params.q)
-            )
-        
-        if params.status:
-            status_values = [s.value for s in params.status]
-            queryset = queryset.filter(status__in=status_values)
-        
-        if params.contract_type:
-            queryset = queryset.filter(contract_type__in=params.contract_type)
+        queryset = apply_filters(Contract.objects.filter(created_by=self.user), params)
         
-        # Apply sorting
-        sort_field = '-updated_at'  # default
-        if params.sort:
-            sort_map = {
-                'title': 'title',
-                'status': 'status',
-                'updated_desc': '-updated_at',
-                'updated_asc': 'updated_at'
-            }
-            sort_field = sort_map.get(params.sort, sort_field)
-        
-        queryset = queryset.order_by(sort_field)
+        queryset = queryset.order_by(*SORT_FIELDS.get(params.sort or DEFAULT_SORT, SORT_FIELDS[DEFAULT_SORT]))
         
         # Pagination
         total = queryset.count()
@@ -92,10 +145,21 @@ class DjangoRepositoryService:
     
     def bulk_update(self, ids: List[str], patch: Dict[str, Any]) -> None:
         """Bulk update multiple contracts"""
-        Contract.objects.filter(
+        contracts = Contract.objects.filter(
             id__in=ids, 
             created_by=self.user
-        ).update(**patch)
+        )
+        # update() skips auto_now; rendered rows are cached by updated_at
+        contracts.update(**{'updated_at': timezone.now(), **patch})
+        # Queryset updates send no signals (imported here: saved_views imports this module)
+        from contracts.services import saved_views
+        saved_views.contracts_changed(self.user.pk)
+        invalidate_list_pages(self.user.pk)
+        dashboard.invalidate()
+        for pk, title, status, updated_at in contracts.values_list('pk', 'title', 'status', 'updated_at'):
+            events.publish('contracts', 'contract.updated', {
+                'id': pk, 'title': title, 'status': status, 'updated_at': updated_at.isoformat(),
+            }, owner_id=self.user.pk)
     
     def create(self, payload: Dict[str, Any]) -> ContractData:
         """Create a new contract"""
@@ -171,6 +235,28 @@ class MockRepositoryService:
             status=ContractStatus.DRAFT
         )
 
+def _list_namespace(user_id) -> str:
+    return f'contract-list:{user_id}'
+
+
+def invalidate_list_pages(user_id) -> None:
+    if user_id:
+        caching.invalidate(_list_namespace(user_id))
+
+
+@caching.cached(lambda user, params: _list_namespace(user.pk), LIST_CACHE_TIMEOUT,
+                key=lambda user, params: asdict(params))
+def list_page(user, params: ListParams) -> Dict[str, Any]:
+    """One page of a user's contracts, JSON-ready and cached"""
+    result = get_repository_service(user).list(params)
+    return {
+        'rows': [row.to_dict() for row in result.rows],
+        'total': result.total,
+        'page': result.page,
+        'page_size': result.page_size
+    }
+
+
 def get_repository_service(user=None, use_mock=False) -> RepositoryService:
     """Factory function to get repository service"""
     if use_mock:
@@ -0,0 +1,162 @@
+"""
+Contract risk scoring
+
+A contract's score (0-100) combines its status, value, how much vetted
+library language it uses, which standard clauses it lacks and the levels
+of the risks linked to it. Features for a batch of contracts are loaded
+with a few grouped queries into NumPy arrays and scored in one vectorized
+step; the result is stored in the indexed Contract.risk_score column so
+lists can sort and filter on it.
+"""
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from django.db.models import Case, Count, IntegerField, Q, Sum, Value, When
+
+from contracts.models import ClauseUsage, Contract, DueDiligenceRisk, RiskLog
+from contracts.services.clauses import get_clause_service
+
+SCORE_BATCH_SIZE = 1000
+
+# Library clause categories every contract is expected to contain
+STANDARD_CLAUSE_CATEGORIES = ('liability', 'confidentiality', 'termination')
+
+STATUS_RISK = {
+    Contract.Status.DRAFT: 0.3,
+    Contract.Status.UNDER_REVIEW: 0.4,
+    Contract.Status.APPROVED: 0.6,
+    Contract.Status.EXECUTED: 1.0,
+    Contract.Status.EXPIRED: 0.1,
+}
+RISK_LEVEL_POINTS = {'LOW': 1, 'MEDIUM': 2, 'HIGH': 3}
+CLOSED_RISK_STATUSES = ('CLOSED', 'RESOLVED')
+
+# Contract value reaching 10**VALUE_DIGITS counts as maximal exposure
+VALUE_DIGITS = 7
+# Linked risk points at which the risk feature reaches ~63%
+RISK_POINT_SCALE = 4.0
+
+WEIGHTS = {
+    'status': 0.15,
+    'value': 0.2,
+    'missing_clauses': 0.25,
+    'linked_risks': 0.3,
+    'unvetted_language': 0.1,
+}
+
+
+def standard_clause_ids() -> List[str]:
+    return sorted(
+        clause.id for clause in get_clause_service().search_clauses()
+        if clause.category in STANDARD_CLAUSE_CATEGORIES
+    )
+
+
+def compute_scores(status: np.ndarray, value: np.ndarray, library_clauses: np.ndarray,
+                   missing_standard: np.ndarray, risk_points: np.ndarray, standard_total: int) -> np.ndarray:
+    """Vectorized 0-100 scores for n contracts; all inputs are length-n arrays"""
+    value_factor = np.clip(np.log10(1 + np.maximum(value, 0)) / VALUE_DIGITS, 0, 1)
+    missing_factor = missing_standard / standard_total if standard_total else np.zeros_like(value)
+    risk_factor = 1 - np.exp(-risk_points / RISK_POINT_SCALE)
+    unvetted_factor = 1 / (1 + library_clauses)
+    score = (
+        WEIGHTS['status'] * status
+        + WEIGHTS['value'] * value_factor
+        + WEIGHTS['missing_clauses'] * missing_factor
+        + WEIGHTS['linked_risks'] * risk_factor
+        + WEIGHTS['unvetted_language'] * unvetted_factor
+    )
+    return np.round(np.clip(score, 0, 1) * 100, 1)
+
+
+def _points(level_field: str):
+    return Sum(Case(
+        *(When(**{level_field: level}, then=Value(points)) for level, points in RISK_LEVEL_POINTS.items()),
+        default=Value(0), output_field=IntegerField(),
+    ))
+
+
+def _fill(ids: np.ndarray, rows: Iterable[Tuple[int, float]]) -> np.ndarray:
+    """Array aligned with sorted `ids` from (contract id, number) rows"""
+    out = np.zeros(len(ids))
+    rows = list(rows)
+    if rows:
+        keys, numbers = zip(*rows)
+        out[np.searchsorted(ids, keys)] = np.asarray(numbers, dtype=float)
+    return out
+
+
+def _score_rows(rows: List[Tuple], standard_ids: List[str]) -> Tuple[Dict[int, float], int]:
+    """Score (pk, status, value, risk_score) rows sorted by pk; returns scores and the number changed"""
+    ids = np.array([row[0] for row in rows])
+    id_list = ids.tolist()
+    usage = list(
+        ClauseUsage.objects.filter(contract_id__in=id_list).order_by().values('contract_id').annotate(
+            library=Count('clause_id'), standard=Count('clause_id', filter=Q(clause_id__in=standard_ids)),
+        ).values_list('contract_id', 'library', 'standard')
+    )
+    library = _fill(ids, ((pk, n) for pk, n, _ in usage))
+    standard_used = _fill(ids, ((pk, n) for pk, _, n in usage))
+    risk_points = (
+        _fill(ids, RiskLog.objects.filter(linked_contract_id__in=id_list).order_by()
+              .values('linked_contract_id').annotate(points=_points('risk_level'))
+              .values_list('linked_contract_id', 'points'))
+        + _fill(ids, DueDiligenceRisk.objects.filter(contract_id__in=id_list)
+                .exclude(status__in=CLOSED_RISK_STATUSES).order_by()
+                .values('contract_id').annotate(points=_points('risk_level'))
+                .values_list('contract_id', 'points'))
+    )
+    scores = compute_scores(
+        status=np.array([STATUS_RISK.get(row[1], 0.5) for row in rows]),
+        value=np.array([float(row[2] or 0) for row in rows]),
+        library_clauses=library,
+        missing_standard=len(standard_ids) - standard_used,
+        risk_points=risk_points,
+        standard_total=len(standard_ids),
+    )
+    changed = [
+        Contract(pk=row[0], risk_score=float(score))
+        for row, score in zip(rows, scores) if abs(row[3] - score) >= 0.05
+    ]
+    Contract.objects.bulk_update(changed, ['risk_score'])
+    return {row[0]: float(score) for row, score in zip(rows, scores)}, len(changed)
+
+
+def score_contracts(contract_ids: Iterable[int]) -> Dict[int, float]:
+    """Recompute and store the scores of some contracts; returns pk -> score"""
+    rows = list(
+        Contract.objects.filter(pk__in=[pk for pk in contract_ids if pk])
+        .order_by('pk').values_list('pk', 'status', 'value', 'risk_score')
+    )
+    if not rows:
+        return {}
+    return _score_rows(rows, standard_clause_ids())[0]
+
+
+def score_contract(contract: Contract) -> float:
+    """Rescore one saved contract from its in-memory fields"""
+    row = (contract.pk, contract.status, contract.value, contract.risk_score)
+    contract.risk_score = _score_rows([row], standard_clause_ids())[0][contract.pk]
+    return contract.risk_score
+
+
+def score_all(batch_size: int = SCORE_BATCH_SIZE) -> Dict[str, int]:
+    """Recompute every contract's score in batches; returns scored and changed counts"""
+    standard_ids = standard_clause_ids()
+    stats = {'scored': 0, 'changed': 0}
+    batch = []
+
+    def flush():
+        scores, changed = _score_rows(batch, standard_ids)
+        stats['scored'] += len(scores)
+        stats['changed'] += changed
+
+    rows = Contract.objects.order_by('pk').values_list('pk', 'status', 'value', 'risk_score')
+    for row in rows.iterator(chunk_size=batch_size):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            flush()
+            batch = []
+    if batch:
+        flush()
+    return stats
@@ -0,0 +1,127 @@
+"""
+Server-side saved repository views
+
+A SavedView stores serialized ListParams. Its result count and first page
+are cached under a per-owner generation read from the database on each
+lookup (the owner's contract count and latest updated_at), so a change made
+through any worker invalidates all of that owner's cached results at once
+without deleting keys. With a shared cache backend the same change also
+schedules a debounced background job that recomputes the owner's starred
+views, so opening a starred view is normally a cache hit; a process-local
+cache would only warm the job runner's own memory, so no job is scheduled.
+"""
+from dataclasses import asdict, fields
+from datetime import timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from contracts.domain.contracts import ContractStatus, ListParams
+from contracts.models import Contract, SavedView
+from contracts.services import jobs
+from contracts.services.repository import DjangoRepositoryService
+
+# Seconds; entries go stale with the owner's generation, so this only bounds
+# writes that leave updated_at alone (such as bulk risk rescoring)
+CACHE_TIMEOUT = 60 * 15
+CACHE_PREFIX = 'saved-view'
+
+REFRESH_JOB = 'contracts.refresh_saved_views'
+# Contract changes within this many seconds share one refresh job
+REFRESH_DELAY = 10
+
+# Paging is not part of a view; results are always the first page
+_PAGING = ('page', 'page_size')
+_PARAM_FIELDS = {field.name for field in fields(ListParams)} - set(_PAGING)
+
+
+def params_to_dict(params: ListParams) -> Dict[str, Any]:
+    """JSON-ready ListParams without paging or empty filters"""
+    data = asdict(params)
+    if params.status:
+        data['status'] = [status.value for status in params.status]
+    return {key: value for key, value in data.items() if key in _PARAM_FIELDS and value not in (None, [], '')}
+
+
+def params_from_dict(data: Dict[str, Any], page_size: int = 25) -> ListParams:
+    """ListParams for the first page of a stored view; unknown keys are rejected"""
+    unknown = set(data) - _PARAM_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown view parameters: {', '.join(sorted(unknown))}")
+    values = dict(data)
+    if values.get('status'):
+        values['status'] = [ContractStatus(status) for status in values['status']]
+    return ListParams(page=1, page_size=page_size, **values)
+
+
+def _generation(user_id: int) -> str:
+    # Creates and edits move the latest updated_at, deletes the count. One
+    # query on the (created_by, updated_at) index, seen alike by every worker
+    row = Contract.objects.filter(created_by_id=user_id).aggregate(count=Count('pk'), latest=Max('updated_at'))
+    latest = row['latest'].timestamp() if row['latest'] else 0
+    return f"{row['count']}:{latest}"
+
+
+def _shared_cache() -> bool:
+    """Whether every process sees the same default cache"""
+    return not isinstance(caches['default'], (DummyCache, LocMemCache))
+
+
+def _result_key(view: SavedView, generation: str) -> str:
+    # updated_at changes whenever the view's own params are edited
+    return f'{CACHE_PREFIX}:{view.pk}:{view.updated_at.timestamp()}:{generation}'
+
+
+def compute(view: SavedView) -> Dict[str, Any]:
+    result = DjangoRepositoryService(view.user).list(params_from_dict(view.params))
+    return {
+        'count': result.total,
+        'rows': [row.to_dict() for row in result.rows],
+        'computed_at': timezone.now().isoformat(),
+    }
+
+
+def refresh(view: SavedView) -> Dict[str, Any]:
+    """Recompute a view's cached count and first page"""
+    # Read first, so a change made while computing leaves the result stale
+    generation = _generation(view.user_id)
+    result = compute(view)
+    cache.set(_result_key(view, generation), result, CACHE_TIMEOUT)
+    return result
+
+
+def results(view: SavedView) -> Tuple[Dict[str, Any], bool]:
+    """A view's count and first page, and whether they came from the cache"""
+    cached = cache.get(_result_key(view, _generation(view.user_id)))
+    if cached is not None:
+        return cached, True
+    return refresh(view), False
+
+
+def cached_count(view: SavedView) -> Optional[int]:
+    cached = cache.get(_result_key(view, _generation(view.user_id)))
+    return cached['count'] if cached else None
+
+
+def refresh_starred(user_id: int) -> int:
+    """Recompute every starred view of one user; returns the number refreshed"""
+    views = SavedView.objects.select_related('user').filter(user_id=user_id, starred=True)
+    for view in views:
+        refresh(view)
+    return len(views)
+
+
+def contracts_changed(user_id: Optional[int]) -> None:
+    """Schedule a refresh of an owner's starred views after their contracts changed"""
+    # The change itself already moved the owner's generation
+    if not user_id or not _shared_cache():
+        return
+    if cache.add(f'{CACHE_PREFIX}:pending:{user_id}', True, REFRESH_DELAY):
+        transaction.on_commit(lambda: jobs.enqueue(
+            REFRESH_JOB, {'user_id': user_id}, run_after=timezone.now() + timedelta(seconds=REFRESH_DELAY),
+        ))
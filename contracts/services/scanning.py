@@ -0,0 +1,104 @@
+"""
+Incremental, parallel analysis of contract content
+
+Analyzers (clause usage, obligation extraction, ...) share one driver: the
+corpus is streamed in batches, contracts whose content hash and rules
+version match their ContractScan row are skipped, and the remaining
+batches are processed in a process pool while the next ones are read.
+"""
+import hashlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from contracts.models import Contract, ContractScan
+
+SCAN_BATCH_SIZE = 200
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha1((content or '').encode()).hexdigest()
+
+
+def is_current(contract_id: int, analyzer: str, digest: str, version: str) -> bool:
+    return ContractScan.objects.filter(
+        contract_id=contract_id, analyzer=analyzer, content_hash=digest, rules_version=version,
+    ).exists()
+
+
+def record_scans(analyzer: str, hashes: Dict[int, str], version: str) -> None:
+    """Upsert the ContractScan rows of freshly analyzed contracts"""
+    ContractScan.objects.bulk_create(
+        [
+            ContractScan(contract_id=pk, analyzer=analyzer, content_hash=digest, rules_version=version)
+            for pk, digest in hashes.items()
+        ],
+        update_conflicts=True, unique_fields=['contract', 'analyzer'],
+        update_fields=['content_hash', 'rules_version', 'scanned_at'],
+    )
+
+
+def scan_contracts(analyzer: str, version: str,
+                   process_batch: Callable[[List[Tuple]], List],
+                   store: Callable[[List, Dict[int, str]], int],
+                   workers: int = 0, force: bool = False, batch_size: int = SCAN_BATCH_SIZE,
+                   fields: Sequence[str] = (),
+                   initializer: Optional[Callable] = None, initargs: Iterable = ()) -> Dict[str, int]:
+    """
+    Run `process_batch` over every contract whose content or rules changed.
+
+    Batches are lists of (pk, content, *fields) tuples. `process_batch` must
+    be a module-level function so it can run in worker processes; with
+    `workers` <= 1 it runs here, after `initializer` if one is given.
+    `store(results, hashes)` is called in this process for each finished
+    batch and returns the number of rows it wrote.
+    """
+    previous = {
+        pk: (digest, rules)
+        for pk, digest, rules in ContractScan.objects.filter(analyzer=analyzer)
+        .values_list('contract_id', 'content_hash', 'rules_version')
+    }
+    stats = {'scanned': 0, 'skipped': 0, 'written': 0}
+
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=tuple(initargs))
+    elif initializer:
+        initializer(*initargs)
+    in_flight = deque()
+
+    def collect(future, hashes):
+        results = future.result() if executor else future
+        stats['written'] += store(results, hashes)
+        stats['scanned'] += len(results)
+
+    def submit(batch, hashes):
+        if executor is None:
+            collect(process_batch(batch), hashes)
+            return
+        in_flight.append((executor.submit(process_batch, batch), hashes))
+        if len(in_flight) >= workers * 2:
+            collect(*in_flight.popleft())
+
+    try:
+        batch, hashes = [], {}
+        rows = Contract.objects.order_by('pk').values_list('pk', 'content', *fields)
+        for row in rows.iterator(chunk_size=batch_size):
+            pk, content = row[0], row[1]
+            digest = content_hash(content)
+            if not force and previous.get(pk) == (digest, version):
+                stats['skipped'] += 1
+                continue
+            batch.append(tuple(row))
+            hashes[pk] = digest
+            if len(batch) >= batch_size:
+                submit(batch, hashes)
+                batch, hashes = [], {}
+        if batch:
+            submit(batch, hashes)
+        while in_flight:
+            collect(*in_flight.popleft())
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+    return stats
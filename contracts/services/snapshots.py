@@ -0,0 +1,116 @@
+"""
+Daily status snapshots for trend reporting
+
+Once a day each tracked model is reduced by a single grouped query to one
+StatusSnapshot row per (status, owner) with a row count and an optional
+summed amount. Trend reports read only these rows, so a year of history for
+a model is a few hundred rows whatever the size of the live tables.
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from contracts.models import (
+    Contract, DueDiligenceProcess, DueDiligenceTask, LegalTask, ObligationCandidate, RiskLog, StatusSnapshot,
+    TrademarkRequest, Workflow,
+)
+
+DEFAULT_TREND_DAYS = 90
+
+
+@dataclass(frozen=True)
+class SnapshotSource:
+    key: str
+    model: type
+    status_field: str
+    owner_field: Optional[str] = None
+    sum_field: Optional[str] = None
+
+
+SOURCES = {
+    source.key: source for source in [
+        SnapshotSource('contracts', Contract, 'status', owner_field='created_by', sum_field='value'),
+        SnapshotSource('legal_tasks', LegalTask, 'status', owner_field='assigned_to'),
+        SnapshotSource('workflows', Workflow, 'status', owner_field='created_by'),
+        SnapshotSource('trademarks', TrademarkRequest, 'status'),
+        SnapshotSource('dd_processes', DueDiligenceProcess, 'status', owner_field='lead_attorney',
+                       sum_field='deal_value'),
+        SnapshotSource('dd_tasks', DueDiligenceTask, 'status', owner_field='assigned_to'),
+        SnapshotSource('risks', RiskLog, 'risk_level'),
+        SnapshotSource('obligation_candidates', ObligationCandidate, 'status', owner_field='reviewed_by'),
+    ]
+}
+
+
+def _facts(source: SnapshotSource, day: date) -> List[StatusSnapshot]:
+    group = [source.status_field] + ([source.owner_field] if source.owner_field else [])
+    aggregates = {'count': Count('pk')}
+    if source.sum_field:
+        aggregates['total'] = Sum(source.sum_field)
+    rows = source.model.objects.order_by().values(*group).annotate(**aggregates)
+    return [
+        StatusSnapshot(
+            date=day, source=source.key, status=row[source.status_field],
+            owner_id=row[source.owner_field] if source.owner_field else None,
+            count=row['count'], total=row.get('total'),
+        )
+        for row in rows
+    ]
+
+
+def take_snapshot(day: Optional[date] = None) -> Dict[str, int]:
+    """Write (or rewrite) the fact rows for `day`; returns rows written per source"""
+    day = day or timezone.localdate()
+    written = {}
+    with transaction.atomic():
+        StatusSnapshot.objects.filter(date=day).delete()
+        for source in SOURCES.values():
+            facts = _facts(source, day)
+            StatusSnapshot.objects.bulk_create(facts)
+            written[source.key] = len(facts)
+    return written
+
+
+def trend(source_key: str, days: int = DEFAULT_TREND_DAYS, end: Optional[date] = None,
+          owner_id: Optional[int] = None, metric: str = 'count') -> Dict:
+    """
+    Per-status series for one source over the last `days` snapshot days.
+
+    Returns the snapshot dates and, for each status, one value per date
+    (0 where the status had no rows), summed over owners unless `owner_id`
+    narrows it to one owner.
+    """
+    if source_key not in SOURCES:
+        raise ValueError(f'Unknown source: {source_key}')
+    if metric not in ('count', 'total'):
+        raise ValueError(f'Unknown metric: {metric}')
+    end = end or timezone.localdate()
+    facts = StatusSnapshot.objects.filter(source=source_key, date__gt=end - timedelta(days=days), date__lte=end)
+    if owner_id:
+        facts = facts.filter(owner_id=owner_id)
+    rows = facts.order_by('date').values('date', 'status').annotate(value=Sum(metric))
+
+    dates: List[date] = []
+    values: Dict[str, Dict[date, float]] = {}
+    for row in rows:
+        if not dates or dates[-1] != row['date']:
+            dates.append(row['date'])
+        values.setdefault(row['status'], {})[row['date']] = row['value'] or 0
+    return {
+        'source': source_key,
+        'metric': metric,
+        'dates': [day.isoformat() for day in dates],
+        'series': {
+            status: [_number(by_date.get(day, 0)) for day in dates]
+            for status, by_date in sorted(values.items())
+        },
+    }
+
+
+def _number(value):
+    return float(value) if isinstance(value, Decimal) else value
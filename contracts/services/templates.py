@@ -2,10 +2,12 @@
 """
 Template service for managing contract templates
 """
+import functools
 from typing import List, Dict, Optional
 from datetime import datetime
 import uuid
 from config.feature_flags import is_test_mode
+from contracts.services.catalogs import SharedCatalog, restore_object
 
 class Template:
     def __init__(self, id: str, title: str, content: str, category: str = "general", 
@@ -20,7 +22,13 @@ class Template:
 
 class TemplateService:
     def __init__(self):
-        self._templates = self._get_mock_templates() if is_test_mode() else {}
+        self._templates = self._initial_templates()
+        # Applies template changes made by other worker processes
+        self._catalog = SharedCatalog('templates', lambda data: restore_object(Template, data),
+                                      self._initial_templates)
+
+    def _initial_templates(self) -> Dict[str, Template]:
+        return self._get_mock_templates() if is_test_mode() else {}
     
     def _get_mock_templates(self) -> Dict[str, Template]:
         """Generate mock template data for testing"""
@@ -43,6 +51,7 @@ class TemplateService:
     def list_templates(self, category: Optional[str] = None, 
                       tags: List[str] = None) -> List[Template]:
         """List all templates with optional filtering"""
+        self._catalog.sync(self._templates)
         templates = list(self._templates.values())
         
         if category:
@@ -55,6 +64,7 @@ class TemplateService:
     
     def get_template(self, template_id: str) -> Optional[Template]:
         """Get a specific template by ID"""
+        self._catalog.sync(self._templates)
         return self._templates.get(template_id)
     
     def create_template(self, title: str, content: str, category: str = "general",
@@ -64,10 +74,12 @@ class TemplateService:
         template = Template(template_id, title, content, category, 
                           "current_user", tags=tags or [])
         self._templates[template_id] = template
+        self._catalog.saved(template_id, template)
         return template
     
     def update_template(self, template_id: str, **kwargs) -> Optional[Template]:
         """Update an existing template"""
+        self._catalog.sync(self._templates)
         template = self._templates.get(template_id)
         if not template:
             return None
@@ -75,15 +87,26 @@ class TemplateService:
         for key, value in kwargs.items():
             if hasattr(template, key):
                 setattr(template, key, value)
+        self._catalog.saved(template_id, template)
         
         return template
     
     def delete_template(self, template_id: str) -> bool:
         """Delete a template"""
+        self._catalog.sync(self._templates)
         if template_id in self._templates:
             del self._templates[template_id]
+            self._catalog.deleted(template_id)
             return True
         return False
 
-# Global service instance
-template_service = TemplateService()
+# Global service instance, built on first use rather than at import
+@functools.cache
+def get_template_service() -> TemplateService:
+    return TemplateService()
+
+def __getattr__(attr):
+    # Keeps `from contracts.services.templates import template_service` working
+    if attr == 'template_service':
+        return get_template_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
@@ -0,0 +1,122 @@
+"""
+Trademark similarity index and conflict search
+
+Each mark's trigrams and phonetic keys are stored as TrademarkIndexEntry
+rows. A search looks up the query's terms on the (kind, term) index, counts
+shared terms per mark in the database and only scores the best candidates.
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import Count
+
+from contracts.domain import similarity
+from contracts.models import TrademarkIndexEntry, TrademarkRequest
+
+DEFAULT_LIMIT = 5
+DEFAULT_MIN_SCORE = 0.3
+
+# Marks sharing the most trigrams with the query that are scored exactly
+CANDIDATE_LIMIT = 200
+
+# Scores at or above this are flagged as likely conflicts when filing
+CONFLICT_SCORE = 0.6
+
+
+@dataclass
+class SimilarMark:
+    trademark_id: int
+    mark_text: str
+    status: str
+    score: float
+
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.trademark_id,
+            'mark_text': self.mark_text,
+            'status': self.status,
+            'score': self.score,
+        }
+
+
+def _entries(trademark_id: int, mark_text: str) -> List[TrademarkIndexEntry]:
+    entries = [
+        TrademarkIndexEntry(trademark_id=trademark_id, kind=TrademarkIndexEntry.Kind.TRIGRAM, term=gram)
+        for gram in similarity.trigrams(mark_text)
+    ]
+    entries += [
+        TrademarkIndexEntry(trademark_id=trademark_id, kind=TrademarkIndexEntry.Kind.PHONETIC, term=key)
+        for key in similarity.phonetic_keys(mark_text)
+    ]
+    return entries
+
+
+def index_trademark(trademark: TrademarkRequest) -> None:
+    """Replace one mark's index entries"""
+    with transaction.atomic():
+        TrademarkIndexEntry.objects.filter(trademark_id=trademark.pk).delete()
+        TrademarkIndexEntry.objects.bulk_create(_entries(trademark.pk, trademark.mark_text))
+
+
+def rebuild_index(batch_size: int = 1000) -> int:
+    """Re-index every trademark request; returns the number of marks indexed"""
+    indexed = 0
+    with transaction.atomic():
+        TrademarkIndexEntry.objects.all().delete()
+        pending: List[TrademarkIndexEntry] = []
+        marks = TrademarkRequest.objects.order_by('pk').values_list('pk', 'mark_text')
+        for pk, mark_text in marks.iterator(chunk_size=batch_size):
+            pending.extend(_entries(pk, mark_text))
+            indexed += 1
+            if len(pending) >= batch_size:
+                TrademarkIndexEntry.objects.bulk_create(pending, batch_size=batch_size)
+                pending = []
+        TrademarkIndexEntry.objects.bulk_create(pending, batch_size=batch_size)
+    return indexed
+
+
+def find_similar(mark_text: str, limit: int = DEFAULT_LIMIT, min_score: float = DEFAULT_MIN_SCORE,
+                 exclude_ids: Iterable[int] = ()) -> List[SimilarMark]:
+    """Top `limit` marks resembling `mark_text`, best first"""
+    grams = similarity.trigrams(mark_text)
+    keys = similarity.phonetic_keys(mark_text)
+    if not grams:
+        return []
+    exclude_ids = list(exclude_ids)
+
+    trigram_hits = (
+        TrademarkIndexEntry.objects
+        .filter(kind=TrademarkIndexEntry.Kind.TRIGRAM, term__in=grams)
+        .exclude(trademark_id__in=exclude_ids)
+        .values('trademark_id')
+        .annotate(shared=Count('id'))
+        .order_by('-shared', 'trademark_id')
+        .values_list('trademark_id', flat=True)[:CANDIDATE_LIMIT]
+    )
+    phonetic_hits = (
+        TrademarkIndexEntry.objects
+        .filter(kind=TrademarkIndexEntry.Kind.PHONETIC, term__in=keys)
+        .exclude(trademark_id__in=exclude_ids)
+        .order_by()
+        .values_list('trademark_id', flat=True)
+        .distinct()[:CANDIDATE_LIMIT]
+    )
+    candidate_ids = set(trigram_hits) | set(phonetic_hits)
+    if not candidate_ids:
+        return []
+
+    matches = []
+    candidates = TrademarkRequest.objects.filter(pk__in=candidate_ids).values_list('pk', 'mark_text', 'status')
+    for pk, text, status in candidates:
+        value = similarity.score(grams, keys, similarity.trigrams(text), similarity.phonetic_keys(text))
+        if value >= min_score:
+            matches.append(SimilarMark(trademark_id=pk, mark_text=text, status=status, score=value))
+    matches.sort(key=lambda match: (-match.score, match.trademark_id))
+    return matches[:limit]
+
+
+def find_conflicts(mark_text: str, exclude_id: Optional[int] = None) -> List[SimilarMark]:
+    """Existing marks close enough to warn about before filing `mark_text`"""
+    exclude = [exclude_id] if exclude_id else []
+    return find_similar(mark_text, min_score=CONFLICT_SCORE, exclude_ids=exclude)
@@ -0,0 +1,128 @@
+"""
+Worker warm-up
+
+A fresh worker pays on its first requests for building the URL resolver,
+compiling templates, importing the modules views load lazily, opening a
+database connection and filling empty caches. `run()` does that work up
+front and reports how long each step took. It is run from the gunicorn
+post_fork hook in config/gunicorn.py, or by the warm_up management command
+(which, with a shared cache backend, primes the caches for every worker).
+"""
+import importlib
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.db import connection
+from django.template import engines
+from django.urls import URLPattern, URLResolver, get_resolver
+
+from contracts.domain.contracts import ListParams
+from contracts.services import clause_usage, dashboard, repository
+
+# Imported on first use by views and signal handlers; see startup_profile
+DEFERRED_MODULES = (
+    'numpy',
+    'contracts.services.forecasting',
+    'contracts.services.near_duplicates',
+    'contracts.services.obligation_extraction',
+    'contracts.services.risk_scoring',
+)
+
+# Most recently active users whose first repository page is cached
+WARM_USERS = 20
+
+
+@dataclass
+class StepTiming:
+    name: str
+    seconds: float
+    detail: str = ''
+
+
+def preload_modules() -> str:
+    """Import the lazily loaded modules; safe before forking, as it touches no database"""
+    for module in DEFERRED_MODULES:
+        importlib.import_module(module)
+    return f'{len(DEFERRED_MODULES)} modules'
+
+
+def _walk(patterns) -> int:
+    count = 0
+    for entry in patterns:
+        entry.pattern.regex  # Compiled on first access
+        if isinstance(entry, URLResolver):
+            count += _walk(entry.url_patterns)
+        elif isinstance(entry, URLPattern):
+            count += 1
+    return count
+
+
+def resolve_urls() -> str:
+    resolver = get_resolver()
+    count = _walk(resolver.url_patterns)
+    # Builds the reverse() lookup tables, including every namespace
+    resolver.reverse_dict, resolver.namespace_dict, resolver.app_dict
+    return f'{count} patterns'
+
+
+def compile_templates() -> str:
+    engine = engines['django']
+    names = sorted(
+        str(path.relative_to(directory))
+        for directory in map(Path, engine.engine.dirs)
+        for path in directory.rglob('*.html')
+    )
+    failed = []
+    for name in names:
+        try:
+            engine.get_template(name)
+        except Exception:
+            failed.append(name)
+    detail = f'{len(names) - len(failed)} templates'
+    return f"{detail}, failed: {', '.join(failed)}" if failed else detail
+
+
+def load_models() -> str:
+    models = apps.get_models()
+    for model in models:
+        model._meta.get_fields()  # Resolves relations and caches field maps
+    connection.ensure_connection()
+    return f'{len(models)} models'
+
+
+def prime_caches() -> str:
+    dashboard.counters()
+    clause_usage.usage_counts()
+    users = list(User.objects.filter(last_login__isnull=False).order_by('-last_login')[:WARM_USERS])
+    for user in users:
+        repository.list_page(user, ListParams())
+    return f'dashboard, clause usage and {len(users)} repository first pages'
+
+
+STEPS = (
+    ('modules', preload_modules),
+    ('urls', resolve_urls),
+    ('templates', compile_templates),
+    ('models', load_models),
+    ('caches', prime_caches),
+)
+
+
+def run(steps=STEPS) -> List[StepTiming]:
+    """Run each warm-up step in order; returns how long each took"""
+    timings = []
+    for name, step in steps:
+        started = time.perf_counter()
+        detail = step()
+        timings.append(StepTiming(name, time.perf_counter() - started, detail))
+    return timings
+
+
+def format_timings(timings: List[StepTiming]) -> List[str]:
+    lines = [f'{t.name:<10} {t.seconds * 1000:>8.1f} ms  {t.detail}' for t in timings]
+    lines.append(f"{'total':<10} {sum(t.seconds for t in timings) * 1000:>8.1f} ms")
+    return lines
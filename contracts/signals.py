@@ -0,0 +1,188 @@
+"""
+Model signal handlers that keep derived data in sync with writes
+"""
+from django.core.signals import request_started
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from contracts.models import (
+    BudgetExpense, Contract, Counterparty, DueDiligenceRisk, DueDiligenceTask, LegalTask, RiskLog, Tombstone,
+    TrademarkRequest, Workflow, WorkflowStep,
+)
+from contracts.services import (
+    budgets, catalogs, clause_usage, counterparties, dashboard, delta_sync, due_diligence, events, repository,
+    saved_views, trademarks,
+)
+
+# near_duplicates and risk_scoring pull in NumPy, so they are imported on the
+# first contract write rather than by every process that loads the app
+
+
+@receiver([post_save, post_delete], sender=DueDiligenceTask)
+@receiver([post_save, post_delete], sender=DueDiligenceRisk)
+def invalidate_dd_rollup(sender, instance, **kwargs):
+    due_diligence.invalidate(instance.process_id)
+
+
+def _remember_counted(sender, instance):
+    if None in (getattr(instance, '_counted', None) or (None,)):
+        # Not loaded with both fields, so read what the counters include
+        instance._counted = sender.objects.filter(pk=instance.pk).values_list('budget_id', 'amount').first()
+
+
+@receiver(pre_save, sender=BudgetExpense)
+def remember_counted_expense(sender, instance, **kwargs):
+    if instance._state.adding:
+        instance._counted = None
+    else:
+        _remember_counted(sender, instance)
+
+
+@receiver(pre_delete, sender=BudgetExpense)
+def remember_deleted_expense(sender, instance, **kwargs):
+    # The row is gone by post_delete, and the instance may have been edited since it was counted
+    _remember_counted(sender, instance)
+
+
+@receiver(post_save, sender=BudgetExpense)
+def count_saved_expense(sender, instance, **kwargs):
+    budgets.record_change(instance._counted, (instance.budget_id, instance.amount))
+    instance._counted = (instance.budget_id, instance.amount)
+
+
+@receiver(post_delete, sender=BudgetExpense)
+def count_deleted_expense(sender, instance, **kwargs):
+    budgets.record_change(instance._counted, None)
+
+
+@receiver(post_save, sender=TrademarkRequest)
+def index_trademark(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or 'mark_text' in update_fields:
+        trademarks.index_trademark(instance)
+
+
+@receiver(post_save, sender=Counterparty)
+def index_counterparty(sender, instance, **kwargs):
+    counterparties.counterparty_index.saved(instance)
+
+
+@receiver(post_delete, sender=Counterparty)
+def unindex_counterparty(sender, instance, **kwargs):
+    counterparties.counterparty_index.deleted(instance.pk)
+
+
+@receiver(post_save, sender=Contract)
+def link_counterparty(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or 'counterparty' in update_fields:
+        entity = counterparties.resolve(instance.counterparty)
+        entity_id = entity.pk if entity else None
+        if entity_id != instance.counterparty_entity_id:
+            sender.objects.filter(pk=instance.pk).update(counterparty_entity_id=entity_id)
+            instance.counterparty_entity = entity
+
+
+@receiver(post_save, sender=Contract)
+def scan_contract_clauses(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or 'content' in update_fields:
+        clause_usage.scan_contract(instance)
+
+
+@receiver(post_save, sender=Contract)
+def sign_contract(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or 'content' in update_fields:
+        from contracts.services import near_duplicates
+        near_duplicates.update_contract(instance)
+
+
+@receiver(post_delete, sender=Contract)
+def unsign_contract(sender, instance, **kwargs):
+    from contracts.services import near_duplicates
+    near_duplicates.remove_contract(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Contract)
+def invalidate_saved_views(sender, instance, **kwargs):
+    saved_views.contracts_changed(instance.created_by_id)
+    repository.invalidate_list_pages(instance.created_by_id)
+
+
+# Registered after the clause scan so the score sees the fresh usage rows
+@receiver(post_save, sender=Contract)
+def score_contract(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or {'status', 'value', 'content'} & set(update_fields):
+        from contracts.services import risk_scoring
+        risk_scoring.score_contract(instance)
+
+
+RISK_CONTRACT_FIELDS = {RiskLog: 'linked_contract_id', DueDiligenceRisk: 'contract_id'}
+
+
+@receiver(pre_save, sender=RiskLog)
+@receiver(pre_save, sender=DueDiligenceRisk)
+def remember_risk_contract(sender, instance, **kwargs):
+    field = RISK_CONTRACT_FIELDS[sender]
+    instance._scored_contract_id = None
+    if not instance._state.adding:
+        instance._scored_contract_id = sender.objects.filter(pk=instance.pk).values_list(field, flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=RiskLog)
+@receiver([post_save, post_delete], sender=DueDiligenceRisk)
+def rescore_risk_contracts(sender, instance, **kwargs):
+    contract_ids = {getattr(instance, RISK_CONTRACT_FIELDS[sender]), getattr(instance, '_scored_contract_id', None)}
+    from contracts.services import risk_scoring
+    risk_scoring.score_contracts(contract_ids)
+
+
+TOMBSTONE_KINDS = {Contract: Tombstone.Kind.CONTRACT, LegalTask: Tombstone.Kind.LEGAL_TASK,
+                   Workflow: Tombstone.Kind.WORKFLOW}
+
+
+@receiver(post_delete, sender=Contract)
+@receiver(post_delete, sender=LegalTask)
+@receiver(post_delete, sender=Workflow)
+def record_tombstone(sender, instance, **kwargs):
+    owner_id = instance.created_by_id if sender is Contract else None
+    delta_sync.record_deletion(TOMBSTONE_KINDS[sender], instance.pk, owner_id)
+
+
+@receiver([post_save, post_delete], sender=WorkflowStep)
+def touch_workflow(sender, instance, **kwargs):
+    Workflow.objects.filter(pk=instance.workflow_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Contract)
+def publish_contract_change(sender, instance, **kwargs):
+    events.publish('contracts', 'contract.updated', {
+        'id': instance.pk, 'title': instance.title, 'status': instance.status,
+        'updated_at': instance.updated_at.isoformat(),
+    }, owner_id=instance.created_by_id)
+
+
+@receiver(post_delete, sender=Contract)
+def publish_contract_deletion(sender, instance, **kwargs):
+    events.publish('contracts', 'contract.deleted', {'id': instance.pk}, owner_id=instance.created_by_id)
+
+
+@receiver(post_save, sender=LegalTask)
+def publish_task_change(sender, instance, **kwargs):
+    events.publish('tasks', 'task.updated', {'id': instance.pk, 'status': instance.status, 'rank': instance.rank})
+
+
+@receiver(post_save, sender=WorkflowStep)
+def publish_step_change(sender, instance, **kwargs):
+    completed = instance.status == WorkflowStep.Status.COMPLETED
+    events.publish('workflows', 'step.completed' if completed else 'step.updated', {
+        'id': instance.pk, 'workflow_id': instance.workflow_id, 'status': instance.status,
+    })
+
+
+@receiver([post_save, post_delete])
+def invalidate_dashboard(sender, **kwargs):
+    if sender in dashboard.COUNTED_MODELS:
+        dashboard.invalidate()
+
+
+# Service catalogs check for other workers' writes once per request
+request_started.connect(catalogs.expire_all, dispatch_uid='expire_service_catalogs')
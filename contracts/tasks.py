@@ -0,0 +1,44 @@
+"""
+Job handlers run by the `run_workers` management command
+"""
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from contracts.services import saved_views
+from contracts.services.jobs import job
+from contracts.services.repository import get_repository_service
+
+User = get_user_model()
+
+BULK_UPDATE_CHUNK_SIZE = 500
+
+
+@job('contracts.bulk_update')
+def bulk_update_contracts(ctx):
+    """Apply a patch to many contracts in chunks, reporting progress"""
+    ids = ctx.payload.get('ids', [])
+    patch = ctx.payload.get('patch', {})
+    user = User.objects.filter(pk=ctx.payload.get('user_id')).first()
+    service = get_repository_service(user)
+
+    total = len(ids)
+    for start in range(0, total, BULK_UPDATE_CHUNK_SIZE):
+        chunk = ids[start:start + BULK_UPDATE_CHUNK_SIZE]
+        service.bulk_update(chunk, patch)
+        done = start + len(chunk)
+        ctx.progress(done * 100 // total, f'Updated {done} of {total} contracts')
+    return {'updated': total}
+
+
+@job('contracts.seed_data')
+def seed_data(ctx):
+    """Run the seed_data management command in the background"""
+    ctx.progress(0, 'Seeding database')
+    call_command('seed_data')
+    return {'seeded': True}
+
+
+@job(saved_views.REFRESH_JOB)
+def refresh_saved_views(ctx):
+    """Recompute the cached results of a user's starred saved views"""
+    return {'refreshed': saved_views.refresh_starred(ctx.payload.get('user_id'))}
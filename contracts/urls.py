@@ -9,7 +9,7 @@ from .views import (
     WorkflowDashboardView, WorkflowTemplateListView, WorkflowCreateView, WorkflowTemplateCreateView,
     WorkflowDetailView, WorkflowStepUpdateView, WorkflowStepCompleteView,
     RepositoryView, WorkflowCreateView as WorkflowCreateFormView,
-    DueDiligenceListView, DueDiligenceCreateView, DueDiligenceDetailView, DueDiligenceUpdateView, AddDueDiligenceItemView, AddDueDiligenceRiskView,
+    DueDiligenceProcessListView, DueDiligenceCreateView, DueDiligenceProcessDetailView, DueDiligenceUpdateView, AddDueDiligenceItemView, AddDueDiligenceRiskView,
     BudgetListView, BudgetCreateView, BudgetDetailView, BudgetUpdateView, AddExpenseView,
     workflow_create, workflow_template_create, workflow_template_list, toggle_dd_item
 )
@@ -20,13 +20,37 @@ app_name = 'contracts'
 urlpatterns = [
     # API endpoints
     path('api/contracts/', api_views.contracts_api, name='contracts_api'),
+    path('api/contracts/facets/', api_views.contract_facets_api, name='contract_facets_api'),
     path('api/contracts/bulk-update/', api_views.bulk_update_contracts, name='bulk_update_contracts'),
     path('api/contracts/<str:contract_id>/', api_views.contract_detail_api, name='contract_detail_api'),
+    path('api/counterparties/autocomplete/', api_views.counterparty_autocomplete_api,
+         name='counterparty_autocomplete_api'),
+    path('api/saved-views/', api_views.saved_views_api, name='saved_views_api'),
+    path('api/saved-views/<int:pk>/', api_views.saved_view_api, name='saved_view_api'),
+    path('api/saved-views/<int:pk>/results/', api_views.saved_view_results_api, name='saved_view_results_api'),
+    path('api/sync/', api_views.delta_sync_api, name='delta_sync_api'),
+    path('api/events/stream/', api_views.event_stream_api, name='event_stream_api'),
+    path('api/jobs/<int:job_id>/', api_views.job_status_api, name='job_status_api'),
+    path('api/legal-tasks/moves/', api_views.legal_task_moves_api, name='legal_task_moves_api'),
+    path('api/legal-tasks/columns/<str:status>/', api_views.legal_task_column_api, name='legal_task_column_api'),
+    path('api/due-diligence/rollups/', api_views.due_diligence_rollups_api, name='due_diligence_rollups_api'),
+    path('api/due-diligence/<int:pk>/tasks/bulk/', api_views.dd_tasks_bulk_api, name='dd_tasks_bulk_api'),
+    path('api/compliance/<int:pk>/items/bulk/', api_views.checklist_items_bulk_api, name='checklist_items_bulk_api'),
+    path('api/budgets/forecast/', api_views.budget_forecast_api, name='budget_forecast_api'),
+    path('api/budgets/expenses/import/', api_views.budget_expense_import_api, name='budget_expense_import_api'),
+    path('api/trademarks/similar/', api_views.trademark_similar_api, name='trademark_similar_api'),
+    path('api/clauses/usage/', api_views.clause_usage_api, name='clause_usage_api'),
+    path('api/near-duplicates/', api_views.near_duplicates_api, name='near_duplicates_api'),
+    path('api/near-duplicates/clusters/', api_views.duplicate_clusters_api, name='duplicate_clusters_api'),
+    path('api/obligations/candidates/', api_views.obligation_candidates_api, name='obligation_candidates_api'),
+    path('api/obligations/candidates/<int:pk>/review/', api_views.obligation_candidate_review_api,
+         name='obligation_candidate_review_api'),
+    path('api/trends/<str:source>/', api_views.trend_api, name='trend_api'),
 
     # Due Diligence URLs
-    path('due-diligence/', DueDiligenceListView.as_view(), name='due_diligence_list'),
+    path('due-diligence/', DueDiligenceProcessListView.as_view(), name='due_diligence_list'),
     path('due-diligence/new/', DueDiligenceCreateView.as_view(), name='due_diligence_create'),
-    path('due-diligence/<int:pk>/', DueDiligenceDetailView.as_view(), name='due_diligence_detail'),
+    path('due-diligence/<int:pk>/', DueDiligenceProcessDetailView.as_view(), name='due_diligence_detail'),
     path('due-diligence/<int:pk>/edit/', DueDiligenceUpdateView.as_view(), name='due_diligence_update'),
     path('due-diligence/<int:pk>/add-item/', AddDueDiligenceItemView.as_view(), name='add_dd_item'),
     path('due-diligence/<int:pk>/add-risk/', AddDueDiligenceRiskView.as_view(), name='add_dd_risk'),
@@ -34,8 +58,10 @@ urlpatterns = [
 
     # Legal Task URLs
     path('legal-tasks/', LegalTaskKanbanView.as_view(), name='legal_task_kanban'),
+    path('legal-tasks/', LegalTaskKanbanView.as_view(), name='legal_task_board'),
     path('legal-tasks/new/', LegalTaskCreateView.as_view(), name='legal_task_create'),
     path('legal-tasks/<int:pk>/edit/', LegalTaskUpdateView.as_view(), name='legal_task_update'),
+    path('legal-tasks/<int:pk>/update-status/', api_views.legal_task_update_status, name='legal_task_update_status'),
 
     # Trademark Request URLs
     path('trademarks/', TrademarkRequestListView.as_view(), name='trademark_request_list'),
@@ -74,6 +100,7 @@ urlpatterns = [
 
     # Contracts
     path('', ContractListView.as_view(), name='contract_list'),
+    path('repository/', RepositoryView.as_view(), name='repository'),
     path('<int:pk>/', ContractDetailView.as_view(), name='contract_detail'),
     path('new/', ContractCreateView.as_view(), name='contract_create'),
     path('<int:pk>/edit/', ContractUpdateView.as_view(), name='contract_update'),
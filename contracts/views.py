@@ -13,7 +13,7 @@ from django.contrib import messages
 
 from django.contrib.auth.forms import UserCreationForm
 from .forms import (
-    ChecklistItemForm, WorkflowForm, WorkflowTemplateForm,
+    ContractForm, ChecklistItemForm, WorkflowForm, WorkflowTemplateForm,
     BudgetForm, TrademarkRequestForm, LegalTaskForm, RiskLogForm, ComplianceChecklistForm,
     DueDiligenceProcessForm, DueDiligenceTaskForm, DueDiligenceRiskForm, BudgetExpenseForm
 )
@@ -22,6 +22,8 @@ from .models import (
     Workflow, WorkflowTemplate, WorkflowTemplateStep, WorkflowStep,
     DueDiligenceProcess, DueDiligenceTask, DueDiligenceRisk, Budget, BudgetExpense
 )
+from .services import checklists, due_diligence, kanban, trademarks
+from .services import dashboard as dashboard_service
 
 # --- Index View ---
 def index(request):
@@ -33,6 +35,19 @@ class ContractListView(LoginRequiredMixin, ListView):
     template_name = 'contracts/contract_list.html'
     context_object_name = 'contracts'
     paginate_by = 25
+    sort_options = {'risk': ['-risk_score', '-pk'], 'updated': ['-updated_at'], 'title': ['title']}
+
+    def get_queryset(self):
+        queryset = super().get_queryset().order_by(
+            *self.sort_options.get(self.request.GET.get('sort'), self.sort_options['updated'])
+        )
+        min_risk = self.request.GET.get('min_risk')
+        if min_risk:
+            try:
+                queryset = queryset.filter(risk_score__gte=float(min_risk))
+            except ValueError:
+                pass
+        return queryset
 
 class WorkflowDetailView(LoginRequiredMixin, DetailView):
     model = Workflow
@@ -64,10 +79,9 @@ class ComplianceChecklistUpdateView(LoginRequiredMixin, UpdateView):
 
 class ToggleChecklistItemView(LoginRequiredMixin, View):
     def post(self, request, pk):
-        item = get_object_or_404(ChecklistItem, pk=pk)
-        item.is_completed = not item.is_completed
-        item.save()
-        return redirect('contracts:compliance_checklist_detail', pk=item.checklist.pk)
+        item = get_object_or_404(ChecklistItem.objects.only('checklist_id'), pk=pk)
+        checklists.update_checklist_items(item.checklist_id, [pk], 'toggle')
+        return redirect('contracts:compliance_checklist_detail', pk=item.checklist_id)
 
 class AddChecklistItemView(LoginRequiredMixin, CreateView):
     model = ChecklistItem
@@ -93,13 +107,17 @@ class ContractDetailView(LoginRequiredMixin, DetailView):
 
 class ContractCreateView(LoginRequiredMixin, CreateView):
     model = Contract
-    fields = ['title', 'content', 'status']
+    form_class = ContractForm
     template_name = 'contracts/contract_form.html'
     success_url = reverse_lazy('contracts:contract_list')
 
+    def form_valid(self, form):
+        form.instance.created_by = self.request.user
+        return super().form_valid(form)
+
 class ContractUpdateView(LoginRequiredMixin, UpdateView):
     model = Contract
-    fields = ['title', 'content', 'status']
+    form_class = ContractForm
     template_name = 'contracts/contract_form.html'
     success_url = reverse_lazy('contracts:contract_list')
 
@@ -145,22 +163,37 @@ class TrademarkRequestDetailView(LoginRequiredMixin, DetailView):
     template_name = 'contracts/trademark_request_detail.html'
     context_object_name = 'trademark_request'
 
-class TrademarkRequestCreateView(LoginRequiredMixin, CreateView):
+class TrademarkConflictMixin:
+    """Stop a save when the mark resembles existing ones until the user confirms"""
+
+    def form_valid(self, form):
+        # Edits that keep the mark (status, notes) were already checked when it was set
+        if form.instance.pk is not None and 'mark_text' not in form.changed_data:
+            return super().form_valid(form)
+        conflicts = trademarks.find_conflicts(form.cleaned_data['mark_text'], exclude_id=form.instance.pk)
+        if conflicts and not self.request.POST.get('confirm_similar'):
+            form.add_error('mark_text', 'This mark resembles existing trademarks. Review them and confirm to continue.')
+            return self.render_to_response(self.get_context_data(form=form, similar_marks=conflicts))
+        return super().form_valid(form)
+
+class TrademarkRequestCreateView(LoginRequiredMixin, TrademarkConflictMixin, CreateView):
     model = TrademarkRequest
     form_class = TrademarkRequestForm
     template_name = 'contracts/trademark_request_form.html'
     success_url = reverse_lazy('contracts:trademark_request_list')
 
-class TrademarkRequestUpdateView(LoginRequiredMixin, UpdateView):
+class TrademarkRequestUpdateView(LoginRequiredMixin, TrademarkConflictMixin, UpdateView):
     model = TrademarkRequest
     form_class = TrademarkRequestForm
     template_name = 'contracts/trademark_request_form.html'
     success_url = reverse_lazy('contracts:trademark_request_list')
 
-class LegalTaskKanbanView(LoginRequiredMixin, ListView):
-    model = LegalTask
-    template_name = 'contracts/legal_task_board.html'
-    context_object_name = 'legal_tasks'
+class LegalTaskKanbanView(LoginRequiredMixin, View):
+    def get(self, request):
+        return render(request, 'contracts/legal_task_board.html', {
+            'board_columns': kanban.board_columns(),
+            'today': timezone.localdate(),
+        })
 
 class LegalTaskCreateView(LoginRequiredMixin, CreateView):
     model = LegalTask
@@ -201,6 +234,14 @@ class ComplianceChecklistDetailView(LoginRequiredMixin, DetailView):
     template_name = 'contracts/compliance_checklist_detail.html'
     context_object_name = 'compliance_checklist'
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['checklist'] = self.object
+        context['items'] = self.object.items.all()
+        context['counts'] = checklists.checklist_counts(self.object.pk)
+        context['item_form'] = ChecklistItemForm()
+        return context
+
 class ComplianceChecklistCreateView(LoginRequiredMixin, CreateView):
     model = ComplianceChecklist
     form_class = ComplianceChecklistForm
@@ -243,13 +284,9 @@ def workflow_template_list(request):
     return render(request, 'contracts/workflow_template_list.html', {'workflow_templates': templates})
 
 def toggle_dd_item(request, pk):
-    task = get_object_or_404(DueDiligenceTask, pk=pk)
-    if task.status == 'COMPLETED':
-        task.status = 'PENDING'
-    else:
-        task.status = 'COMPLETED'
-    task.save()
-    return redirect('contracts:due_diligence_detail', pk=task.process.pk)
+    task = get_object_or_404(DueDiligenceTask.objects.only('process_id'), pk=pk)
+    checklists.update_dd_tasks(task.process_id, [pk], 'toggle')
+    return redirect('contracts:due_diligence_detail', pk=task.process_id)
 
 def profile(request):
     return render(request, 'profile.html')
@@ -453,13 +490,9 @@ def workflow_template_list(request):
     return redirect('contracts:workflow_template_list')
 
 def toggle_dd_item(request, pk):
-    task = get_object_or_404(DueDiligenceTask, pk=pk)
-    if task.status == 'COMPLETED':
-        task.status = 'PENDING'
-    else:
-        task.status = 'COMPLETED'
-    task.save()
-    return redirect('contracts:due_diligence_detail', pk=task.process.pk)
+    task = get_object_or_404(DueDiligenceTask.objects.only('process_id'), pk=pk)
+    checklists.update_dd_tasks(task.process_id, [pk], 'toggle')
+    return redirect('contracts:due_diligence_detail', pk=task.process_id)
 
 # Corrected DueDiligenceDetailView and DueDiligenceUpdateView definitions to avoid duplication
 class DueDiligenceDetailView(LoginRequiredMixin, DetailView):
@@ -520,6 +553,7 @@ class DueDiligenceProcessListView(LoginRequiredMixin, ListView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['status_choices'] = DueDiligenceProcess.ProcessStatus.choices
+        context['processes'] = due_diligence.attach_rollups(context['processes'])
         return context
 
 
@@ -530,11 +564,13 @@ class DueDiligenceProcessDetailView(LoginRequiredMixin, DetailView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['tasks'] = self.object.dd_tasks.all()
-        context['risks'] = self.object.dd_risks.all()
-        context['high_risks'] = self.object.dd_risks.filter(risk_level='HIGH')
-        context['medium_risks'] = self.object.dd_risks.filter(risk_level='MEDIUM')
-        context['low_risks'] = self.object.dd_risks.filter(risk_level='LOW')
+        risks = list(self.object.dd_risks.select_related('owner'))
+        context['tasks'] = self.object.dd_tasks.select_related('assigned_to')
+        context['risks'] = risks
+        context['high_risks'] = [r for r in risks if r.risk_level == 'HIGH']
+        context['medium_risks'] = [r for r in risks if r.risk_level == 'MEDIUM']
+        context['low_risks'] = [r for r in risks if r.risk_level == 'LOW']
+        context['rollup'] = due_diligence.get_rollup(self.object.pk)
         return context
 
 
@@ -560,10 +596,26 @@ class BudgetListView(LoginRequiredMixin, ListView):
     template_name = 'contracts/budget_list.html'
     context_object_name = 'budgets'
     paginate_by = 25
+    ordering = ['-year', '-quarter', 'department']
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        year = self.request.GET.get('year')
+        quarter = self.request.GET.get('quarter')
+        department = self.request.GET.get('department')
+        if year and year.isdigit():
+            queryset = queryset.filter(year=int(year))
+        if quarter:
+            queryset = queryset.filter(quarter=quarter)
+        if department:
+            queryset = queryset.filter(department__icontains=department)
+        return queryset
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['current_year'] = timezone.now().year
+        from .services import forecasting  # NumPy; only budget pages need it
+        context['budgets'] = forecasting.attach_forecasts(context['budgets'])
         return context
 
 
@@ -619,62 +671,22 @@ def add_budget_expense(request, budget_id):
 
 # --- Dashboard View ---
 def dashboard(request):
-    # Contract data
-    try:
-        total_contracts = Contract.objects.count()
-        recent_contracts = Contract.objects.all()[:10]
-
-        # Pipeline data - count contracts by status
-        pipeline_data = []
-        for status, display in Contract.ContractStatus.choices:
-            count = Contract.objects.filter(status=status).count()
-            if count > 0:
-                pipeline_data.append((display, count))
-    except:
-        total_contracts = 0
-        recent_contracts = []
-        pipeline_data = []
-
-    # Legal Tasks data
-    try:
-        pending_tasks = LegalTask.objects.filter(status__in=['PENDING', 'IN_PROGRESS']).count()
-    except:
-        pending_tasks = 0
-
-    # Workflow data
     try:
-        active_workflows = Workflow.objects.filter(status='ACTIVE').count()
+        counters = dashboard_service.counters()
     except:
-        active_workflows = 0
+        counters = {}
 
-    # Trademark data
     try:
-        trademark_requests = TrademarkRequest.objects.all().count()
-        pending_trademarks = TrademarkRequest.objects.filter(status__in=['PENDING', 'FILED', 'IN_REVIEW']).count()
+        recent_contracts = Contract.objects.all()[:10]
     except:
-        trademark_requests = 0
-        pending_trademarks = 0
+        recent_contracts = []
 
     # Risk data
     try:
-        risk_count = RiskLog.objects.count()
         top_risks = RiskLog.objects.filter(risk_level='HIGH')[:5]
     except:
-        risk_count = 0
         top_risks = []
 
-    # Due Diligence data
-    try:
-        dd_count = DueDiligenceProcess.objects.count()
-    except:
-        dd_count = 0
-
-    # Budget data
-    try:
-        budget_count = Budget.objects.count()
-    except:
-        budget_count = 0
-
     # Compliance data
     try:
         upcoming_checklists = ComplianceChecklist.objects.all()[:5]
@@ -682,17 +694,17 @@ def dashboard(request):
         upcoming_checklists = []
 
     context = {
-        'total_contracts': total_contracts,
+        'total_contracts': counters.get('total_contracts', 0),
         'recent_contracts': recent_contracts,
-        'pipeline_data': pipeline_data,
-        'pending_tasks': pending_tasks,
-        'active_workflows': active_workflows,
-        'trademark_requests': trademark_requests,
-        'pending_trademarks': pending_trademarks,
-        'risk_count': risk_count,
+        'pipeline_data': counters.get('pipeline_data', []),
+        'pending_tasks': counters.get('pending_tasks', 0),
+        'active_workflows': counters.get('active_workflows', 0),
+        'trademark_requests': counters.get('trademark_requests', 0),
+        'pending_trademarks': counters.get('pending_trademarks', 0),
+        'risk_count': counters.get('risk_count', 0),
         'top_risks': top_risks,
-        'dd_count': dd_count,
-        'budget_count': budget_count,
+        'dd_count': counters.get('dd_count', 0),
+        'budget_count': counters.get('budget_count', 0),
         'upcoming_checklists': upcoming_checklists,
     }
     return render(request, 'dashboard.html', context)
\ No newline at end of file
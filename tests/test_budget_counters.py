@@ -0,0 +1,124 @@
+"""
+Tests for the denormalized budget spend counters
+"""
+import io
+from datetime import date
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from contracts.models import Budget, BudgetExpense
+from contracts.services import budgets, expense_import
+
+
+class BudgetCounterTests(TestCase):
+    def setUp(self):
+        self.budget = Budget.objects.create(year=2024, quarter='Q1', department='Legal',
+                                            allocated_amount=Decimal('1000'))
+        self.other = Budget.objects.create(year=2024, quarter='Q2', department='Legal',
+                                           allocated_amount=Decimal('1000'))
+
+    def add(self, amount, budget=None):
+        return BudgetExpense.objects.create(budget=budget or self.budget, description='Fees',
+                                            amount=Decimal(amount), category='LEGAL_FEES', date=date(2024, 1, 5))
+
+    def counters(self, budget=None):
+        budget = Budget.objects.get(pk=(budget or self.budget).pk)
+        return budget.spent_total, budget.expense_count
+
+    def test_create_update_delete_keep_counters(self):
+        expense = self.add('100.25')
+        self.add('50')
+        self.assertEqual(self.counters(), (Decimal('150.25'), 2))
+
+        expense = BudgetExpense.objects.get(pk=expense.pk)
+        expense.amount = Decimal('200')
+        expense.save()
+        self.assertEqual(self.counters(), (Decimal('250'), 2))
+
+        expense.budget = self.other
+        expense.save()
+        self.assertEqual(self.counters(), (Decimal('50'), 1))
+        self.assertEqual(self.counters(self.other), (Decimal('200'), 1))
+
+        expense.delete()
+        self.assertEqual(self.counters(self.other), (Decimal('0'), 0))
+
+    def test_float_and_string_amounts(self):
+        for amount in (12.5, '12.50'):
+            BudgetExpense.objects.create(budget=self.budget, description='Fees', amount=amount,
+                                         category='LEGAL_FEES', date=date(2024, 1, 5))
+        self.assertEqual(self.counters(), (Decimal('25'), 2))
+
+        expense = BudgetExpense.objects.first()
+        expense.amount = 0.1
+        expense.save()
+        self.assertEqual(self.counters(), (Decimal('12.6'), 2))
+        expense.delete()
+        self.assertEqual(self.counters(), (Decimal('12.5'), 1))
+
+    def test_delete_subtracts_what_was_counted(self):
+        expense = self.add('100')
+        self.add('50')
+        expense.amount = Decimal('999')
+        expense.budget = self.other
+        expense.delete()
+        self.assertEqual(self.counters(), (Decimal('50'), 1))
+        self.assertEqual(self.counters(self.other), (Decimal('0'), 0))
+
+        # Loaded without the counted fields, then edited
+        expense = BudgetExpense.objects.only('id').get()
+        expense.amount = Decimal('1')
+        expense.delete()
+        self.assertEqual(self.counters(), (Decimal('0'), 0))
+
+    def test_queryset_delete_is_counted(self):
+        self.add('10')
+        self.add('20')
+        BudgetExpense.objects.filter(budget=self.budget).delete()
+        self.assertEqual(self.counters(), (Decimal('0'), 0))
+
+    def test_over_budget_reads_the_column(self):
+        self.add('1200')
+        budget = Budget.objects.get(pk=self.budget.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(budget.is_over_budget)
+            self.assertEqual(budget.utilization_percentage, Decimal('120.0'))
+
+    def test_threshold_alerts_fire_once_when_crossed(self):
+        crossed = []
+
+        def listener(sender, **kwargs):
+            crossed.append(kwargs['threshold'])
+
+        budgets.budget_threshold_crossed.connect(listener)
+        self.addCleanup(budgets.budget_threshold_crossed.disconnect, listener)
+        self.add('500')
+        self.add('400')
+        self.add('50')
+        self.add('100')
+        self.assertEqual(crossed, [80, 100])
+
+    def test_bulk_import_updates_counters(self):
+        expense_import.import_expenses([
+            'year,quarter,department,description,amount,category,date\n',
+            '2024,Q1,Legal,Retainer,300,LEGAL_FEES,2024-02-01\n',
+            '2024,Q1,Legal,Filing,20,LEGAL_FEES,2024-02-02\n',
+        ])
+        self.assertEqual(self.counters(), (Decimal('320'), 2))
+
+    def test_reconcile_repairs_drift(self):
+        self.add('75')
+        Budget.objects.filter(pk=self.other.pk).update(spent_total=Decimal('9'), expense_count=3)
+        BudgetExpense.objects.update(amount=Decimal('80'))
+
+        out = io.StringIO()
+        call_command('reconcile_budgets', '--dry-run', stdout=out)
+        self.assertIn('2 budgets have drifted', out.getvalue())
+        self.assertEqual(self.counters(), (Decimal('75'), 1))
+
+        call_command('reconcile_budgets', stdout=io.StringIO())
+        self.assertEqual(self.counters(), (Decimal('80'), 1))
+        self.assertEqual(self.counters(self.other), (Decimal('0'), 0))
+        self.assertEqual(budgets.reconcile(), [])
@@ -0,0 +1,112 @@
+"""
+Tests for the read-through cache helpers and the read paths that use them
+"""
+import json
+import time
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from contracts.models import Contract, LegalTask
+from contracts.services import caching, clause_usage, dashboard, kanban
+
+
+class CachingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return self.calls
+
+    def test_hit_and_invalidate(self):
+        self.assertEqual(caching.get_or_compute('ns', ['a'], self.compute, 60), 1)
+        self.assertEqual(caching.get_or_compute('ns', ['a'], self.compute, 60), 1)
+        self.assertEqual(caching.get_or_compute('ns', ['b'], self.compute, 60), 2)
+        caching.invalidate('ns')
+        self.assertEqual(caching.get_or_compute('ns', ['a'], self.compute, 60), 3)
+
+    def test_stale_value_is_refreshed_by_one_caller(self):
+        key = caching.make_key('ns', ['a'])
+        cache.set(key, ('old', time.time() - 1), 60)
+        cache.add(f'{key}:lock', True)  # Another caller is refreshing
+        self.assertEqual(caching.get_or_compute('ns', ['a'], self.compute, 60), 'old')
+        self.assertEqual(self.calls, 0)
+
+        cache.delete(f'{key}:lock')
+        self.assertEqual(caching.get_or_compute('ns', ['a'], self.compute, 60), 1)
+        self.assertEqual(caching.get_or_compute('ns', ['a'], self.compute, 60), 1)
+
+    def test_miss_waits_for_the_lock_holder(self):
+        key = caching.make_key('ns', ['a'])
+        cache.add(f'{key}:lock', True)
+        with mock.patch.object(caching, 'LOCK_WAIT', 0.2), \
+                mock.patch.object(caching.time, 'sleep', lambda _: cache.set(key, ('theirs', time.time() + 60))):
+            self.assertEqual(caching.get_or_compute('ns', ['a'], self.compute, 60), 'theirs')
+        self.assertEqual(self.calls, 0)
+
+        cache.delete(key)
+        with mock.patch.object(caching, 'LOCK_WAIT', 0.01):
+            self.assertEqual(caching.get_or_compute('ns', ['a'], self.compute, 60), 1)
+
+    def test_jittered_timeouts(self):
+        timeouts = {caching.jittered(100) for _ in range(200)}
+        self.assertTrue(all(90 <= t <= 110 for t in timeouts))
+        self.assertGreater(len(timeouts), 1)
+
+    def test_decorator(self):
+        @caching.cached(lambda user_id, flag: f'user:{user_id}', 60)
+        def lookup(user_id, flag):
+            return self.compute()
+
+        self.assertEqual((lookup(1, True), lookup(1, True), lookup(2, True)), (1, 1, 2))
+        caching.invalidate('user:1')
+        self.assertEqual((lookup(1, True), lookup(2, True)), (3, 2))
+
+
+class CachedReadPathTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+        Contract.objects.create(title='MSA', content='-', status=Contract.Status.DRAFT, created_by=self.user)
+
+    def test_dashboard_counters(self):
+        counts = dashboard.counters()
+        self.assertEqual((counts['total_contracts'], counts['pipeline_data']), (1, [('Draft', 1)]))
+        with self.assertNumQueries(0):
+            dashboard.counters()
+        LegalTask.objects.create(title='Task', description='-', due_date='2024-01-01')
+        self.assertEqual(dashboard.counters()['pending_tasks'], 1)
+
+    def test_dashboard_counters_follow_queryset_updates(self):
+        task = LegalTask.objects.create(title='Task', description='-', due_date='2024-01-01')
+        self.assertEqual(dashboard.counters()['pending_tasks'], 1)
+        kanban.apply_moves([{'id': task.pk, 'status': 'COMPLETED'}])
+        self.assertEqual(dashboard.counters()['pending_tasks'], 0)
+
+        self.client.post(reverse('contracts:bulk_update_contracts'), json.dumps({
+            'ids': list(Contract.objects.values_list('pk', flat=True)), 'patch': {'status': 'EXECUTED'},
+        }), content_type='application/json')
+        self.assertEqual(dashboard.counters()['pipeline_data'], [('Executed', 1)])
+
+    def test_contract_list_pages(self):
+        url = reverse('contracts:contracts_api')
+        self.assertEqual(self.client.get(url).json()['data']['total'], 1)
+        with self.assertNumQueries(2):  # Session and user only
+            self.client.get(url)
+        Contract.objects.create(title='NDA', content='-', created_by=self.user)
+        self.assertEqual(self.client.get(url).json()['data']['total'], 2)
+
+    def test_clause_usage_counts(self):
+        before = {row['clause_id']: row['contracts'] for row in clause_usage.usage_counts()}
+        with self.assertNumQueries(0):
+            clause_usage.usage_counts()
+        Contract.objects.create(title='Liability', content='IN NO EVENT SHALL THE COMPANY BE LIABLE',
+                                created_by=self.user)
+        after = {row['clause_id']: row['contracts'] for row in clause_usage.usage_counts()}
+        self.assertEqual(after['cls-1'], before['cls-1'] + 1)
@@ -0,0 +1,104 @@
+"""
+Tests for keeping the in-memory service catalogs coherent across processes
+"""
+from django.test import TestCase
+
+from contracts.models import CatalogRecord, CatalogVersion
+from contracts.services import catalogs
+from contracts.services.clauses import ClauseService
+from contracts.services.obligations import ObligationService
+from contracts.services.templates import TemplateService
+
+
+class SharedCatalogTests(TestCase):
+    def test_writes_reach_other_workers(self):
+        # Each instance stands in for the singleton of one worker process
+        mine, theirs = TemplateService(), TemplateService()
+        theirs.list_templates()
+        template = mine.create_template('Lease', 'This lease...', 'real-estate')
+        mine.update_template(template.id, title='Office lease')
+        self.assertIsNone(theirs.get_template(template.id))  # Not re-checked within a request
+
+        catalogs.expire_all()
+        self.assertEqual(theirs.get_template(template.id).title, 'Office lease')
+
+        mine.delete_template(template.id)
+        catalogs.expire_all()
+        self.assertIsNone(theirs.get_template(template.id))
+
+    def test_only_changed_records_are_fetched(self):
+        mine, theirs = ClauseService(), ClauseService()
+        mine.create_clause('Audit', 'Either party may audit...')
+        theirs.search_clauses()
+        mine.create_clause('Notices', 'All notices shall be...')
+
+        catalogs.expire_all()
+        with self.assertNumQueries(2):
+            titles = {clause.title for clause in theirs.search_clauses()}
+        self.assertTrue({'Audit', 'Notices'} <= titles)
+        catalogs.expire_all()
+        with self.assertNumQueries(1):
+            theirs.search_clauses()
+        with self.assertNumQueries(0):
+            theirs.search_clauses()
+
+    def test_obligations_round_trip(self):
+        mine, theirs = ObligationService(), ObligationService()
+        obligation = mine.create_obligation('Pay', '-', '2030-01-01', 'contract-1')
+        catalogs.expire_all()
+        copy = theirs.changed_since(obligation.updated_at.replace(year=2000))
+        self.assertIn(obligation.id, [o.id for o in copy])
+        self.assertEqual(next(o for o in copy if o.id == obligation.id).updated_at.year,
+                         obligation.updated_at.year)
+
+    def test_overdue_marking_reaches_other_workers(self):
+        mine, theirs = ObligationService(), ObligationService()
+        obligation = mine.create_obligation('Pay', '-', '2000-01-01', 'contract-1')
+        catalogs.expire_all()
+        self.assertEqual(theirs.changed_since(obligation.updated_at.replace(year=1999))[0].status, 'pending')
+        self.assertEqual([o.id for o in mine.get_overdue_obligations()], [obligation.id])
+
+        catalogs.expire_all()
+        self.assertEqual(theirs.list_obligations(status='overdue')[0].id, obligation.id)
+        # A later sync of the record no longer brings back the pending status
+        mine.update_obligation(obligation.id, title='Pay fees')
+        catalogs.expire_all()
+        self.assertEqual(mine.list_obligations()[0].status, 'overdue')
+
+    def test_reset_table_reloads_from_scratch(self):
+        service = TemplateService()
+        template = service.create_template('Lease', '-')
+        catalogs.expire_all()
+        service.list_templates()
+        CatalogRecord.objects.all().delete()
+        CatalogVersion.objects.all().delete()
+
+        catalogs.expire_all()
+        service.create_template('Other', '-')
+        catalogs.expire_all()
+        self.assertNotIn(template.id, [t.id for t in service.list_templates()])
+
+    def test_records_stay_whole_while_syncing(self):
+        service = TemplateService()
+        template = service.create_template('Lease', '-')
+        catalogs.expire_all()
+        service.list_templates()
+        CatalogRecord.objects.all().delete()
+        CatalogVersion.objects.all().delete()
+        service.create_template('Other', '-')
+
+        seen = []
+        catalog, seed = service._catalog, service._catalog._seed
+
+        def watching_seed():
+            # Another thread reading now must find the old catalog and be sent through sync()
+            seen.append((template.id in service._templates, catalog._stale))
+            return seed()
+
+        catalog._seed = watching_seed
+        catalogs.expire_all()
+        titles = [t.title for t in service.list_templates()]
+        self.assertEqual(seen, [(True, True)])
+        self.assertIn('Other', titles)
+        self.assertNotIn(template.id, [t.id for t in service.list_templates()])
+        self.assertFalse(catalog._stale)
@@ -0,0 +1,120 @@
+"""
+Tests for bulk checklist item and due diligence task completion
+"""
+import json
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from contracts.models import ChecklistItem, ComplianceChecklist, DueDiligenceProcess, DueDiligenceTask
+from contracts.services import checklists, due_diligence
+
+
+class ChecklistBulkTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+        self.checklist = ComplianceChecklist.objects.create(
+            title='GDPR review', description='', regulation_type='GDPR'
+        )
+        self.items = [
+            ChecklistItem.objects.create(checklist=self.checklist, title=f'Item {i}', order=i,
+                                         is_completed=(i == 0))
+            for i in range(4)
+        ]
+
+    def completed(self):
+        return set(self.checklist.items.filter(is_completed=True).values_list('title', flat=True))
+
+    def test_toggle_flips_each_row_in_one_update(self):
+        ids = [self.items[0].pk, self.items[1].pk]
+        with CaptureQueriesContext(connection) as queries:
+            result = checklists.update_checklist_items(self.checklist.pk, ids, 'toggle')
+        updates = [q for q in queries.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(result, {'updated': 2, 'total': 4, 'completed': 1})
+        self.assertEqual(self.completed(), {'Item 1'})
+
+    def test_explicit_items_are_idempotent(self):
+        items = [{'id': self.items[0].pk, 'is_completed': True}, {'id': self.items[2].pk, 'is_completed': True}]
+        checklists.update_checklist_items(self.checklist.pk, items=items)
+        checklists.update_checklist_items(self.checklist.pk, items=items)
+        self.assertEqual(self.completed(), {'Item 0', 'Item 2'})
+
+    def test_items_of_other_checklists_are_ignored(self):
+        other = ComplianceChecklist.objects.create(title='Other', description='', regulation_type='SOX')
+        stray = ChecklistItem.objects.create(checklist=other, title='Stray')
+        result = checklists.update_checklist_items(self.checklist.pk, [stray.pk], 'complete')
+        self.assertEqual(result['updated'], 0)
+        stray.refresh_from_db()
+        self.assertFalse(stray.is_completed)
+
+    def test_bulk_api(self):
+        response = self.client.post(
+            f'/contracts/api/compliance/{self.checklist.pk}/items/bulk/',
+            data=json.dumps({'ids': [item.pk for item in self.items], 'action': 'complete'}),
+            content_type='application/json'
+        )
+        self.assertTrue(response.json()['success'])
+        self.assertEqual(response.json()['data']['completed'], 4)
+
+    def test_bulk_api_rejects_unknown_action(self):
+        response = self.client.post(
+            f'/contracts/api/compliance/{self.checklist.pk}/items/bulk/',
+            data=json.dumps({'ids': [self.items[1].pk], 'action': 'delete'}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_toggle_view_and_detail_page(self):
+        response = self.client.post(f'/contracts/compliance/{self.items[3].pk}/toggle-item/')
+        self.assertRedirects(response, f'/contracts/compliance/{self.checklist.pk}/')
+        self.assertEqual(self.completed(), {'Item 0', 'Item 3'})
+
+        response = self.client.get(f'/contracts/compliance/{self.checklist.pk}/')
+        self.assertContains(response, 'data-bulk-url')
+        self.assertContains(response, '2/4')
+
+
+class DueDiligenceTaskBulkTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+        self.process = DueDiligenceProcess.objects.create(
+            title='Deal', transaction_type='MERGER', target_company='Target',
+            start_date=date.today(), target_completion_date=date.today()
+        )
+        self.tasks = [
+            DueDiligenceTask.objects.create(process=self.process, title=f'Task {i}', category='LEGAL',
+                                            status=status, due_date=date.today())
+            for i, status in enumerate(['COMPLETED', 'PENDING', 'BLOCKED'])
+        ]
+
+    def test_toggle_sets_status_and_completion_date_together(self):
+        ids = [task.pk for task in self.tasks]
+        result = checklists.update_dd_tasks(self.process.pk, ids, 'toggle')
+        self.assertEqual(result, {'updated': 3, 'total': 3, 'completed': 2})
+
+        rows = dict(DueDiligenceTask.objects.values_list('title', 'status'))
+        self.assertEqual(rows, {'Task 0': 'PENDING', 'Task 1': 'COMPLETED', 'Task 2': 'COMPLETED'})
+        self.assertFalse(DueDiligenceTask.objects.filter(status='PENDING', completion_date__isnull=False).exists())
+        self.assertFalse(DueDiligenceTask.objects.filter(status='COMPLETED', completion_date__isnull=True).exists())
+
+    def test_complete_leaves_finished_tasks_alone(self):
+        result = checklists.update_dd_tasks(self.process.pk, [task.pk for task in self.tasks], 'complete')
+        self.assertEqual(result['updated'], 2)
+
+    def test_bulk_update_refreshes_cached_rollup(self):
+        self.assertEqual(due_diligence.get_rollup(self.process.pk).task_completed, 1)
+        response = self.client.post(
+            f'/contracts/api/due-diligence/{self.process.pk}/tasks/bulk/',
+            data=json.dumps({'items': [{'id': self.tasks[1].pk, 'is_completed': True}]}),
+            content_type='application/json'
+        )
+        self.assertTrue(response.json()['success'])
+        self.assertEqual(due_diligence.get_rollup(self.process.pk).task_completed, 2)
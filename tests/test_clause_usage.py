@@ -0,0 +1,84 @@
+"""
+Tests for the clause usage index
+"""
+import io
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from contracts.domain.aho_corasick import Automaton
+from contracts.models import ClauseUsage, Contract, ContractScan
+from contracts.services import clause_usage
+
+LIABILITY = 'In no event shall the Company be liable for indirect damages.'
+FORCE_MAJEURE = 'Neither party shall be liable for any delay caused by events beyond its control.'
+
+
+class AutomatonTests(SimpleTestCase):
+    def test_overlapping_patterns_are_all_found(self):
+        automaton = Automaton([('he', 'he'), ('she', 'she'), ('hers', 'hers'), ('his', 'his')])
+        # Offsets are into the normalized text, where the comma is gone
+        self.assertEqual(automaton.summarize('she said hers, he said his'),
+                         {'she': (1, 0), 'hers': (1, 9), 'he': (1, 14), 'his': (1, 22)})
+
+    def test_matches_are_whole_words_after_normalization(self):
+        automaton = Automaton([('nda', 'Non-Disclosure   Agreement')])
+        self.assertEqual(automaton.summarize('This NON DISCLOSURE agreement, and a non-disclosure agreements'),
+                         {'nda': (1, 5)})
+
+
+class ClauseUsageTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+        self.both = Contract.objects.create(title='MSA', content=f'1. {LIABILITY}\n2. {FORCE_MAJEURE}\n{LIABILITY}')
+        self.none = Contract.objects.create(title='Letter', content='Thanks for your business.')
+
+    def usages(self, contract):
+        return dict(contract.clause_usages.values_list('clause_id', 'occurrences'))
+
+    def test_contracts_are_indexed_on_save(self):
+        self.assertEqual(self.usages(self.both), {'cls-1': 2, 'cls-2': 1})
+        self.assertEqual(self.usages(self.none), {})
+
+        self.none.content = FORCE_MAJEURE
+        self.none.save()
+        self.assertEqual(self.usages(self.none), {'cls-2': 1})
+
+    def test_unchanged_contract_is_not_rescanned(self):
+        self.assertFalse(clause_usage.scan_contract(self.both))
+        self.both.title = 'Master Services Agreement'
+        # The UPDATE, the stored content hash lookups of the clause scan and
+        # the near-duplicate signature, and three risk scoring feature queries
+        with self.assertNumQueries(6):
+            self.both.save()
+        with self.assertNumQueries(1):
+            self.both.save(update_fields=['title'])
+
+    def test_full_scan_skips_unchanged_contracts(self):
+        Contract.objects.filter(pk=self.none.pk).update(content=LIABILITY)
+        stats = clause_usage.scan_all()
+        self.assertEqual((stats['scanned'], stats['skipped']), (1, 1))
+        self.assertEqual(self.usages(self.none), {'cls-1': 1})
+
+    def test_full_scan_with_process_pool(self):
+        ClauseUsage.objects.all().delete()
+        ContractScan.objects.all().delete()
+        stats = clause_usage.scan_all(workers=2, batch_size=1)
+        self.assertEqual(stats, {'scanned': 2, 'skipped': 0, 'usages': 2})
+        self.assertEqual(self.usages(self.both), {'cls-1': 2, 'cls-2': 1})
+
+    def test_usage_api(self):
+        data = self.client.get('/contracts/api/clauses/usage/').json()['data']
+        counts = {row['clause_id']: row['contracts'] for row in data['clauses']}
+        self.assertEqual(counts['cls-1'], 1)
+        self.assertEqual(counts['cls-3'], 0)
+
+        data = self.client.get('/contracts/api/clauses/usage/?clause_id=cls-1').json()['data']
+        self.assertEqual(data['contracts'][0]['title'], 'MSA')
+
+    def test_scan_command(self):
+        out = io.StringIO()
+        call_command('scan_clause_usage', '--workers', '1', '--force', stdout=out)
+        self.assertIn('Scanned 2 contracts', out.getvalue())
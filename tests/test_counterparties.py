@@ -0,0 +1,102 @@
+"""
+Tests for counterparty resolution and autocomplete
+"""
+import importlib
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from contracts.domain.counterparties import canonical_name
+from contracts.models import Contract, Counterparty
+from contracts.services import counterparties
+from contracts.services.counterparties import CounterpartyIndex
+
+
+class CanonicalNameTests(TestCase):
+    def test_legal_suffixes_and_punctuation(self):
+        self.assertEqual(canonical_name('Apple Inc.'), 'apple')
+        self.assertEqual(canonical_name('APPLE, INC'), 'apple')
+        self.assertEqual(canonical_name('Spotify Technology S.A.'), 'spotify technology')
+        self.assertEqual(canonical_name('Brand Holdings LLC'), 'brand holdings')
+        # A suffix on its own is still a name
+        self.assertEqual(canonical_name('Inc'), 'inc')
+        self.assertEqual(canonical_name('  '), '')
+
+
+class CounterpartyTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+        counterparties.counterparty_index.rebuild()
+
+    def test_contracts_resolve_to_one_counterparty(self):
+        first = Contract.objects.create(title='A', content='-', counterparty='Apple Inc.')
+        second = Contract.objects.create(title='B', content='-', counterparty='APPLE, INC')
+        Contract.objects.create(title='C', content='-')
+        self.assertEqual(Counterparty.objects.count(), 1)
+        apple = Counterparty.objects.get()
+        self.assertEqual((apple.name, apple.canonical_name), ('Apple Inc.', 'apple'))
+        self.assertEqual(first.counterparty_entity, apple)
+        second.refresh_from_db()
+        self.assertEqual(second.counterparty_entity_id, apple.pk)
+
+        second.counterparty = 'Beta Ltd'
+        second.save(update_fields=['counterparty'])
+        second.refresh_from_db()
+        self.assertEqual(second.counterparty_entity.name, 'Beta Ltd')
+
+    def test_backfill_deduplicates_raw_names(self):
+        migration = importlib.import_module('contracts.migrations.0012_counterparty')
+        for name in ('Apple Inc.', 'Apple Inc.', 'apple inc', 'Beta Ltd'):
+            Contract.objects.create(title=name, content='-', counterparty=name)
+        Contract.objects.update(counterparty_entity=None)
+        Counterparty.objects.all().delete()
+
+        migration.backfill_counterparties(apps, None)
+        self.assertEqual(
+            sorted(Counterparty.objects.values_list('name', 'canonical_name')),
+            [('Apple Inc.', 'apple'), ('Beta Ltd', 'beta')],
+        )
+        self.assertEqual(Contract.objects.filter(counterparty_entity__canonical_name='apple').count(), 3)
+
+    def test_autocomplete_matches_word_prefixes(self):
+        for name in ('Amazon Web Services', 'Amazing Co', 'Adobe Systems', 'Web3 Labs'):
+            Counterparty.objects.create(name=name)
+        names = [row['name'] for row in counterparties.autocomplete('ama')]
+        self.assertEqual(names, ['Amazing Co', 'Amazon Web Services'])
+        names = [row['name'] for row in counterparties.autocomplete('web')]
+        self.assertEqual(names, ['Amazon Web Services', 'Web3 Labs'])
+        self.assertEqual(counterparties.autocomplete('ado', limit=1)[0]['name'], 'Adobe Systems')
+        self.assertEqual(counterparties.autocomplete(''), [])
+
+        Counterparty.objects.get(name='Adobe Systems').delete()
+        self.assertEqual(counterparties.autocomplete('ado'), [])
+
+    def test_refresh_picks_up_changes_from_other_processes(self):
+        index = CounterpartyIndex()
+        index.rebuild()
+        # Rows written by another process do not reach this index's signals
+        Counterparty.objects.bulk_create([Counterparty(name='Zeta', canonical_name='zeta')])
+        index._checked_at -= counterparties.REFRESH_INTERVAL
+        index.refresh()
+        self.assertEqual([row['name'] for row in index.search('ze')], ['Zeta'])
+
+        Counterparty.objects.filter(name='Zeta').delete()
+        index._checked_at -= counterparties.REFRESH_INTERVAL
+        index.refresh()
+        self.assertEqual(index.search('ze'), [])
+
+    def test_search_does_not_query(self):
+        index = CounterpartyIndex()
+        index.load((pk, f'Party {pk}', f'party {pk}') for pk in range(10000))
+        with self.assertNumQueries(0):
+            rows = index.search('party 99', limit=5)
+        self.assertEqual([row['id'] for row in rows], [99, 990, 9900, 9901, 9902])
+
+    def test_api(self):
+        Counterparty.objects.create(name='Apple Inc.')
+        response = self.client.get(reverse('contracts:counterparty_autocomplete_api'), {'q': 'app'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data'][0]['name'], 'Apple Inc.')
@@ -0,0 +1,94 @@
+"""
+Tests for the delta sync endpoint
+"""
+import io
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from contracts.models import Contract, LegalTask, Tombstone, Workflow, WorkflowStep
+from contracts.services import delta_sync
+from contracts.services.obligations import obligation_service
+
+
+class DeltaSyncTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+        self.contract = Contract.objects.create(title='Old', content='-', created_by=self.user)
+        self.task = LegalTask.objects.create(title='Task', description='-', due_date=date(2024, 1, 1))
+        self.workflow = Workflow.objects.create(title='Flow', created_by=self.user)
+        self.step = WorkflowStep.objects.create(workflow=self.workflow, title='Step', description='-', order=1)
+        # A token from just before the test, ignoring the re-send overlap
+        self.token = delta_sync.encode_token(timezone.now())
+
+    def _ids(self, result, kind):
+        return [row['id'] for row in result['changed'][kind]]
+
+    def test_no_token_asks_for_a_reload(self):
+        result = delta_sync.changes(self.user)
+        self.assertTrue(result['reset'])
+        self.assertEqual(result['changed'], {})
+
+    def test_only_changes_after_the_token(self):
+        result = delta_sync.changes(self.user, self.token)
+        self.assertFalse(result['reset'])
+        self.assertEqual(result['changed']['contracts'], [])
+        self.assertEqual(result['changed']['legal_tasks'], [])
+
+        self.contract.title = 'New'
+        self.contract.save()
+        LegalTask.objects.filter(pk=self.task.pk).update(status='COMPLETED', updated_at=timezone.now())
+        self.step.status = WorkflowStep.Status.COMPLETED
+        self.step.save()
+        obligation = obligation_service.create_obligation('Pay', '-', '2030-01-01', str(self.contract.pk))
+
+        result = delta_sync.changes(self.user, self.token)
+        self.assertEqual(self._ids(result, 'contracts'), [str(self.contract.pk)])
+        self.assertEqual(result['changed']['legal_tasks'][0]['status'], 'COMPLETED')
+        self.assertEqual(result['changed']['workflows'][0]['steps_completed'], 1)
+        self.assertIn(obligation.id, self._ids(result, 'obligations'))
+
+    def test_deletions_come_from_tombstones(self):
+        other = User.objects.create_user(username='other', password='testpass123')
+        theirs = Contract.objects.create(title='Theirs', content='-', created_by=other)
+        contract_id, task_id = self.contract.pk, self.task.pk
+        self.contract.delete()
+        self.task.delete()
+        theirs.delete()
+
+        result = delta_sync.changes(self.user, self.token)
+        self.assertEqual(result['deleted']['contracts'], [str(contract_id)])
+        self.assertEqual(result['deleted']['legal_tasks'], [str(task_id)])
+
+    def test_stale_token_or_too_many_changes_reset(self):
+        stale = delta_sync.encode_token(timezone.now() - delta_sync.TOMBSTONE_RETENTION - timedelta(days=1))
+        self.assertTrue(delta_sync.changes(self.user, stale)['reset'])
+
+        LegalTask.objects.bulk_create([
+            LegalTask(title=f'T{i}', description='-', due_date=date(2024, 1, 1))
+            for i in range(delta_sync.SYNC_LIMIT + 1)
+        ])
+        self.assertTrue(delta_sync.changes(self.user, self.token)['reset'])
+
+    def test_token_never_moves_backwards(self):
+        token = delta_sync.changes(self.user, self.token)['token']
+        self.assertGreaterEqual(int(token), int(self.token))
+
+    def test_prune_command(self):
+        Tombstone.objects.create(kind=Tombstone.Kind.CONTRACT, object_id='1',
+                                 deleted_at=timezone.now() - timedelta(days=60))
+        Tombstone.objects.create(kind=Tombstone.Kind.CONTRACT, object_id='2')
+        call_command('prune_tombstones', stdout=io.StringIO())
+        self.assertEqual(list(Tombstone.objects.values_list('object_id', flat=True)), ['2'])
+
+    def test_api(self):
+        response = self.client.get(reverse('contracts:delta_sync_api'), {'since': self.token})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()['data']['reset'])
+        response = self.client.get(reverse('contracts:delta_sync_api'), {'since': 'yesterday'})
+        self.assertEqual(response.status_code, 400)
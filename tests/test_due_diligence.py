@@ -0,0 +1,78 @@
+"""
+Tests for due diligence progress and risk rollups
+"""
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+
+from contracts.models import DueDiligenceProcess, DueDiligenceRisk, DueDiligenceTask
+from contracts.services import due_diligence
+
+
+class DueDiligenceRollupTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+        self.processes = [
+            DueDiligenceProcess.objects.create(
+                title=f'Deal {i}', transaction_type='MERGER', target_company=f'Target {i}',
+                start_date=date.today(), target_completion_date=date.today()
+            )
+            for i in range(3)
+        ]
+        deal = self.processes[0]
+        for status in ('COMPLETED', 'COMPLETED', 'PENDING', 'BLOCKED'):
+            DueDiligenceTask.objects.create(process=deal, title='Task', category='LEGAL',
+                                            status=status, due_date=date.today())
+        for likelihood, impact, level, category in [
+            ('HIGH', 'HIGH', 'HIGH', 'LEGAL'),
+            ('HIGH', 'HIGH', 'HIGH', 'FINANCIAL'),
+            ('LOW', 'MEDIUM', 'LOW', 'LEGAL'),
+        ]:
+            DueDiligenceRisk.objects.create(process=deal, title='Risk', category=category, description='',
+                                            risk_level=level, likelihood=likelihood, impact=impact)
+
+    def test_rollup_contents(self):
+        rollup = due_diligence.get_rollup(self.processes[0].pk)
+
+        self.assertEqual(rollup.progress_percentage, 50)
+        self.assertEqual(rollup.high_risk_count, 2)
+        self.assertEqual(rollup.overall_risk_level, 'HIGH')
+        self.assertEqual(rollup.categories, {'LEGAL': 2, 'FINANCIAL': 1})
+        self.assertEqual(rollup.matrix[0][2], 2)  # high likelihood, high impact
+        self.assertEqual(rollup.matrix[2][1], 1)  # low likelihood, medium impact
+
+    def test_many_processes_use_two_queries_then_cache(self):
+        ids = [p.pk for p in self.processes]
+        with self.assertNumQueries(2):
+            rollups = due_diligence.get_rollups(ids)
+        self.assertEqual(rollups[ids[1]].progress_percentage, 0)
+        with self.assertNumQueries(0):
+            due_diligence.get_rollups(ids)
+
+    def test_task_changes_invalidate_cache(self):
+        deal = self.processes[0]
+        due_diligence.get_rollup(deal.pk)
+        DueDiligenceTask.objects.filter(process=deal, status='PENDING').first().delete()
+        DueDiligenceTask.objects.create(process=deal, title='Done', category='LEGAL',
+                                        status='COMPLETED', due_date=date.today())
+        self.assertEqual(due_diligence.get_rollup(deal.pk).progress_percentage, 75)
+
+    def test_list_and_detail_pages_show_rollups(self):
+        response = self.client.get('/contracts/due-diligence/')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Progress: 50%')
+
+        response = self.client.get(f'/contracts/due-diligence/{self.processes[0].pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'risk-heat-map')
+
+    def test_rollups_api(self):
+        ids = '&'.join(f'id={p.pk}' for p in self.processes)
+        response = self.client.get(f'/contracts/api/due-diligence/rollups/?{ids}')
+        rollups = response.json()['data']['rollups']
+        self.assertEqual(len(rollups), 3)
+        self.assertEqual(rollups[0]['matrix']['counts'][0][2], 2)
@@ -0,0 +1,151 @@
+"""
+Tests for the live change event stream
+"""
+import asyncio
+import io
+from datetime import timedelta
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from contracts.models import ChangeEvent, Contract, LegalTask, Workflow, WorkflowStep
+from contracts.services import events, kanban
+from contracts.services.repository import DjangoRepositoryService
+
+
+class EventBrokerTests(TestCase):
+    async def _subscribe(self, user_id=1, topics=events.TOPICS):
+        subscription = events.broker.subscribe(user_id, topics)
+        self.addCleanup(events.broker.unsubscribe, subscription)
+        return subscription
+
+    async def test_publish_reaches_matching_subscribers(self):
+        mine = await self._subscribe(user_id=1)
+        tasks_only = await self._subscribe(user_id=2, topics=['tasks'])
+        events.broker.publish(events.Event(1, 'contracts', 'contract.updated', {'id': 5}, owner_id=1))
+        events.broker.publish(events.Event(2, 'tasks', 'task.moved', {'id': 7}))
+        await asyncio.sleep(0)
+
+        self.assertEqual([mine.queue.get_nowait().id for _ in range(mine.queue.qsize())], [1, 2])
+        self.assertEqual(tasks_only.queue.get_nowait().type, 'task.moved')
+        self.assertTrue(tasks_only.queue.empty())
+
+    async def test_slow_subscriber_gets_a_resync(self):
+        subscription = await self._subscribe()
+        for event_id in range(1, events.QUEUE_SIZE + 2):
+            subscription.offer(events.Event(event_id, 'tasks', 'task.moved', {}))
+        self.assertEqual(subscription.queue.qsize(), 1)
+        resync = subscription.queue.get_nowait()
+        self.assertEqual((resync.type, resync.id), ('resync', events.QUEUE_SIZE + 1))
+
+    async def test_poller_relays_other_processes_events(self):
+        with mock.patch.object(events, 'POLL_INTERVAL', 0.01):
+            subscription = await self._subscribe()
+            await asyncio.sleep(0.05)  # Let the poller read its starting point
+            await sync_to_async(ChangeEvent.objects.create)(topic='tasks', type='task.moved', payload={'id': 3},
+                                                           origin='other-host:1')
+            await sync_to_async(ChangeEvent.objects.create)(topic='tasks', type='task.moved', payload={'id': 4},
+                                                           origin=events.default_worker_id())
+            event = await asyncio.wait_for(subscription.queue.get(), 1)
+        self.assertEqual(event.data, {'id': 3})
+        self.assertTrue(subscription.queue.empty())
+
+    async def test_stream_heartbeat_and_replay(self):
+        other = await User.objects.acreate_user(username='other', password='testpass123')
+        first = await sync_to_async(ChangeEvent.objects.create)(topic='tasks', type='task.moved', payload={'id': 1})
+        await sync_to_async(ChangeEvent.objects.create)(topic='tasks', type='task.moved', payload={'id': 2})
+        await sync_to_async(ChangeEvent.objects.create)(topic='contracts', type='contract.updated', payload={},
+                                                       owner=other)
+
+        stream = events.stream(None, last_event_id=str(first.pk), heartbeat=0.01)
+        try:
+            self.assertEqual(await anext(stream), f'retry: {events.RETRY_MS}\n\n')
+            self.assertIn('data: {"id": 2}', await anext(stream))
+            self.assertEqual(await anext(stream), ': heartbeat\n\n')
+        finally:
+            await stream.aclose()
+
+
+class EventPublishingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+
+    def test_model_changes_are_logged_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            contract = Contract.objects.create(title='MSA', content='-', created_by=self.user)
+            self.assertFalse(ChangeEvent.objects.exists())
+        with self.captureOnCommitCallbacks(execute=True):
+            task = LegalTask.objects.create(title='Task', description='-', due_date='2024-01-01')
+            kanban.apply_moves([{'id': task.pk, 'status': 'COMPLETED'}])
+            workflow = Workflow.objects.create(title='Flow', created_by=self.user)
+            WorkflowStep.objects.create(workflow=workflow, title='Sign', description='-', order=1,
+                                        status=WorkflowStep.Status.COMPLETED)
+
+        logged = list(ChangeEvent.objects.order_by('pk').values_list('type', 'owner_id'))
+        self.assertEqual(logged, [('contract.updated', self.user.pk), ('task.updated', None),
+                                  ('task.moved', None), ('step.completed', None)])
+        self.assertEqual(ChangeEvent.objects.first().payload['id'], contract.pk)
+
+    def test_bulk_updates_are_published(self):
+        contract = Contract.objects.create(title='MSA', content='-', created_by=self.user)
+        ChangeEvent.objects.all().delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            DjangoRepositoryService(self.user).bulk_update([contract.pk], {'status': 'EXECUTED'})
+        event = ChangeEvent.objects.get()
+        self.assertEqual((event.type, event.owner_id), ('contract.updated', self.user.pk))
+        self.assertEqual((event.payload['id'], event.payload['status']), (contract.pk, 'EXECUTED'))
+
+    def test_replay_asks_for_a_resync_when_events_were_pruned(self):
+        first, second = [ChangeEvent.objects.create(topic='tasks', type='task.moved', payload={}) for _ in range(2)]
+        pruned_id = first.pk
+        first.delete()
+        self.assertEqual([event.type for event in events.replay(pruned_id - 1, None, events.TOPICS)], ['resync'])
+        self.assertEqual([event.id for event in events.replay(pruned_id, None, events.TOPICS)], [second.pk])
+
+    def test_prune_command(self):
+        old, recent = [ChangeEvent.objects.create(topic='tasks', type='task.moved', payload={}) for _ in range(2)]
+        ChangeEvent.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(hours=2))
+        call_command('prune_events', stdout=io.StringIO())
+        self.assertEqual(list(ChangeEvent.objects.values_list('pk', flat=True)), [recent.pk])
+
+
+class EventStreamApiTests(TestCase):
+    async def test_stream(self):
+        user = await User.objects.acreate_user(username='testuser', password='testpass123')
+        await self.async_client.aforce_login(user)
+        response = await self.async_client.get(reverse('contracts:event_stream_api'), {'topics': 'tasks'})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunks = aiter(response.streaming_content)
+        try:
+            self.assertEqual(await anext(chunks), f'retry: {events.RETRY_MS}\n\n'.encode())
+        finally:
+            await response.streaming_content.aclose()
+
+        response = await self.async_client.get(reverse('contracts:event_stream_api'), {'topics': 'nope'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_wsgi_requests_poll(self):
+        user = User.objects.create_user(username='testuser', password='testpass123')
+        other = User.objects.create_user(username='other', password='testpass123')
+        self.client.force_login(user)
+        url = reverse('contracts:event_stream_api')
+        first = ChangeEvent.objects.create(topic='tasks', type='task.moved', payload={'id': 1})
+
+        # A first connection only learns where to resume from
+        response = self.client.get(url, {'topics': 'tasks'})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = b''.join(response.streaming_content).decode()
+        self.assertEqual(body, f'retry: {events.RETRY_MS}\n\nid: {first.pk}\n\n')
+
+        second = ChangeEvent.objects.create(topic='tasks', type='task.moved', payload={'id': 2})
+        hidden = ChangeEvent.objects.create(topic='tasks', type='task.moved', payload={'id': 3}, owner=other)
+        response = self.client.get(url, {'topics': 'tasks'}, headers={'Last-Event-ID': str(first.pk)})
+        body = b''.join(response.streaming_content).decode()
+        self.assertIn(f'id: {second.pk}\nevent: task.moved\ndata: {{"id": 2}}', body)
+        self.assertNotIn('"id": 3', body)
+        self.assertTrue(body.endswith(f'id: {hidden.pk}\n\n'))
@@ -0,0 +1,71 @@
+"""
+Tests for repository facet counts
+"""
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from contracts.domain.contracts import ContractStatus, ListParams
+from contracts.models import Contract, Counterparty
+from contracts.services import facets
+
+
+class FacetCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+        other = User.objects.create_user(username='other', password='testpass123')
+        for title, status, contract_type, counterparty in [
+            ('Acme NDA', Contract.Status.DRAFT, Contract.ContractType.NDA, 'Acme Corp'),
+            ('Acme MSA', Contract.Status.EXECUTED, Contract.ContractType.MSA, 'Acme Corp'),
+            ('Beta NDA', Contract.Status.DRAFT, Contract.ContractType.NDA, 'Beta Inc'),
+            ('Gamma SOW', Contract.Status.APPROVED, Contract.ContractType.SOW, ''),
+        ]:
+            Contract.objects.create(title=title, content='-', status=status, contract_type=contract_type,
+                                    counterparty=counterparty, created_by=self.user)
+        Contract.objects.create(title='Not mine', content='-', contract_type=Contract.ContractType.NDA,
+                                counterparty='Acme Corp', created_by=other)
+
+    @staticmethod
+    def _counts(rows):
+        return {row['value']: row['count'] for row in rows}
+
+    def test_counts_every_dimension(self):
+        result = facets.facet_counts(ListParams(), self.user)
+        self.assertEqual(self._counts(result['status']), {'DRAFT': 2, 'EXECUTED': 1, 'APPROVED': 1})
+        self.assertEqual(self._counts(result['contract_type']), {'NDA': 2, 'MSA': 1, 'SOW': 1})
+        acme = Counterparty.objects.get(canonical_name='acme')
+        self.assertEqual(result['counterparty'][0], {'value': acme.pk, 'label': 'Acme Corp', 'count': 2})
+        self.assertEqual(self._counts(result['date'])['last_7'], 4)
+        status_labels = {row['value']: row['label'] for row in result['status']}
+        self.assertEqual(status_labels['EXECUTED'], 'Executed')
+
+    def test_dimension_ignores_its_own_selection(self):
+        params = ListParams(status=[ContractStatus.DRAFT], contract_type=['NDA'])
+        result = facets.facet_counts(params, self.user)
+        # Status counts apply the type filter only, type counts the status filter only
+        self.assertEqual(self._counts(result['status']), {'DRAFT': 2})
+        self.assertEqual(self._counts(result['contract_type']), {'NDA': 2})
+        self.assertEqual({row['label']: row['count'] for row in result['counterparty']},
+                         {'Acme Corp': 1, 'Beta Inc': 1})
+
+    def test_cached_by_normalized_filters(self):
+        facets.facet_counts(ListParams(contract_type=['NDA', 'MSA'], page=1), self.user)
+        with self.assertNumQueries(0):
+            facets.facet_counts(ListParams(contract_type=['MSA', 'NDA'], page=3, sort='title'), self.user)
+        self.assertNotEqual(
+            facets.cache_key(ListParams(), self.user),
+            facets.cache_key(ListParams(q='acme'), self.user),
+        )
+
+    def test_api(self):
+        response = self.client.get(reverse('contracts:contract_facets_api'), {'q': 'acme'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual(self._counts(data['status']), {'DRAFT': 1, 'EXECUTED': 1})
+        self.assertEqual(set(data), {'status', 'contract_type', 'counterparty', 'date'})
+
+        response = self.client.get(reverse('contracts:contract_facets_api'), {'status': 'BOGUS'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,69 @@
+"""
+Tests for budget burn-rate forecasting
+"""
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from contracts.models import Budget, BudgetExpense
+from contracts.services import forecasting
+
+
+class BudgetForecastTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+        self.legal = Budget.objects.create(year=2024, quarter='Q1', department='Legal',
+                                           allocated_amount=Decimal('800'))
+        self.finance = Budget.objects.create(year=2024, quarter='Q1', department='Finance',
+                                             allocated_amount=Decimal('100'))
+        self.idle = Budget.objects.create(year=2024, quarter='Q2', department='Legal',
+                                          allocated_amount=Decimal('500'))
+        for budget, day, amount in [
+            (self.legal, date(2024, 1, 10), '300'),
+            (self.legal, date(2024, 2, 1), '300'),
+            (self.finance, date(2024, 1, 5), '60'),
+            (self.finance, date(2024, 1, 20), '50'),
+        ]:
+            BudgetExpense.objects.create(budget=budget, description='Fees', amount=Decimal(amount),
+                                         category='LEGAL_FEES', date=day)
+
+    def test_forecasts_use_two_queries(self):
+        with self.assertNumQueries(2):
+            forecasts = forecasting.forecast_budgets(as_of=date(2024, 2, 29))
+        self.assertEqual(len(forecasts), 3)
+
+    def test_burn_rate_and_projection(self):
+        forecast = forecasting.forecast_budgets(as_of=date(2024, 2, 29))[self.legal.pk]
+        # 600 spent over the 60 days of Jan and Feb, 31 days left in March
+        self.assertEqual(forecast.spent, 600)
+        self.assertEqual(forecast.burn_rate, 10)
+        self.assertEqual(forecast.projected_spend, 910)
+        self.assertEqual(forecast.status, 'PROJECTED_OVER')
+        # The remaining 200 lasts 20 more days at 10 a day
+        self.assertEqual(forecast.exhaustion_date, date(2024, 3, 20))
+
+    def test_overspent_budget_reports_crossing_date(self):
+        forecast = forecasting.forecast_budgets(as_of=date(2024, 2, 29))[self.finance.pk]
+        self.assertEqual(forecast.status, 'OVER_BUDGET')
+        self.assertEqual(forecast.exhaustion_date, date(2024, 1, 20))
+
+    def test_budget_without_expenses(self):
+        forecast = forecasting.forecast_budgets(as_of=date(2024, 2, 29))[self.idle.pk]
+        self.assertEqual((forecast.spent, forecast.burn_rate), (0, 0))
+        self.assertIsNone(forecast.exhaustion_date)
+        self.assertEqual(forecast.status, 'ON_TRACK')
+
+    def test_forecast_api(self):
+        response = self.client.get(f'/contracts/api/budgets/forecast/?id={self.finance.pk}&as_of=2024-02-29')
+        data = response.json()['data']
+        self.assertEqual(data['forecasts'][0]['exhaustion_date'], '2024-01-20')
+        self.assertEqual(data['status_counts'], {'OVER_BUDGET': 1})
+
+    def test_budget_list_shows_forecasts(self):
+        response = self.client.get('/contracts/budgets/?department=fin')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Over Budget')
+        self.assertNotContains(response, f'/contracts/budgets/{self.legal.pk}/')
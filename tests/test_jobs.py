@@ -0,0 +1,119 @@
+"""
+Tests for the database-backed job queue
+"""
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from contracts.models import Job
+from contracts.services import jobs
+
+
+@jobs.job('tests.echo')
+def echo_job(ctx):
+    ctx.progress(50, 'halfway')
+    return {'echo': ctx.payload.get('value')}
+
+
+@jobs.job('tests.explode')
+def explode_job(ctx):
+    raise RuntimeError('boom')
+
+
+class JobQueueTests(TestCase):
+    def test_claims_highest_priority_first(self):
+        low = jobs.enqueue('tests.echo', {'value': 'low'}, priority=0)
+        high = jobs.enqueue('tests.echo', {'value': 'high'}, priority=10)
+
+        claimed = jobs.claim_next('worker-1')
+        self.assertEqual(claimed.pk, high.pk)
+        self.assertEqual(claimed.status, Job.Status.RUNNING)
+        self.assertEqual(claimed.locked_by, 'worker-1')
+        self.assertEqual(claimed.attempts, 1)
+
+        self.assertEqual(jobs.claim_next('worker-2').pk, low.pk)
+        self.assertIsNone(jobs.claim_next('worker-3'))
+
+    def test_future_jobs_are_not_claimed(self):
+        jobs.enqueue('tests.echo', run_after=timezone.now() + timedelta(minutes=5))
+        self.assertIsNone(jobs.claim_next('worker-1'))
+
+    def test_successful_job_records_result(self):
+        jobs.enqueue('tests.echo', {'value': 42})
+        job = jobs.run_once('worker-1')
+
+        self.assertEqual(job.status, Job.Status.SUCCEEDED)
+        self.assertEqual(job.result, {'echo': 42})
+        self.assertEqual(job.progress, 100)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_failed_job_retries_with_backoff_then_fails(self):
+        job = jobs.enqueue('tests.explode', max_attempts=2)
+
+        job = jobs.run_once('worker-1')
+        self.assertEqual(job.status, Job.Status.QUEUED)
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertIn('boom', job.last_error)
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        job = jobs.run_once('worker-1')
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_unknown_job_fails_without_retry(self):
+        jobs.enqueue('tests.missing')
+        job = jobs.run_once('worker-1')
+        self.assertEqual(job.status, Job.Status.FAILED)
+
+    def test_stale_running_jobs_are_requeued(self):
+        job = jobs.enqueue('tests.echo')
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.Status.RUNNING,
+            locked_at=timezone.now() - timedelta(hours=1),
+        )
+        self.assertEqual(jobs.requeue_stale(60), 1)
+        self.assertEqual(Job.objects.get(pk=job.pk).status, Job.Status.QUEUED)
+
+
+class RunWorkersCommandTests(TransactionTestCase):
+    def test_run_workers_burst_drains_queue(self):
+        for i in range(3):
+            jobs.enqueue('tests.echo', {'value': i})
+
+        out = StringIO()
+        call_command('run_workers', workers=1, burst=True, stdout=out)
+
+        self.assertEqual(Job.objects.filter(status=Job.Status.SUCCEEDED).count(), 3)
+        self.assertIn('3 succeeded', out.getvalue())
+
+
+class JobApiTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+
+    def test_async_bulk_update_queues_job(self):
+        response = self.client.post(
+            '/contracts/api/contracts/bulk-update/',
+            data=json.dumps({'ids': ['1', '2'], 'patch': {'status': 'DRAFT'}, 'async': True}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 202)
+        job = Job.objects.get(pk=response.json()['job_id'])
+        self.assertEqual(job.name, 'contracts.bulk_update')
+        self.assertEqual(job.payload['user_id'], self.user.pk)
+
+    def test_job_status_endpoint(self):
+        job = jobs.enqueue('tests.echo', user=self.user)
+        response = self.client.get(f'/contracts/api/jobs/{job.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['status'], Job.Status.QUEUED)
+
+        other = User.objects.create_user(username='other', password='x')
+        foreign = jobs.enqueue('tests.echo', user=other)
+        self.assertEqual(self.client.get(f'/contracts/api/jobs/{foreign.pk}/').status_code, 404)
@@ -0,0 +1,148 @@
+"""
+Tests for kanban rank keys and the legal task move API
+"""
+import json
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from contracts.domain.ranking import key_between, spread_keys
+from contracts.models import LegalTask
+from contracts.services import kanban
+
+
+class RankKeyTests(SimpleTestCase):
+    def test_key_between_is_strictly_ordered(self):
+        keys = spread_keys(3)
+        self.assertEqual(keys, sorted(keys))
+        middle = key_between(keys[0], keys[1])
+        self.assertTrue(keys[0] < middle < keys[1])
+
+    def test_open_ended_keys(self):
+        first = key_between(None, None)
+        self.assertLess(key_between(None, first), first)
+        self.assertGreater(key_between(first, None), first)
+
+    def test_repeated_appends_stay_short(self):
+        key = key_between(None, None)
+        for _ in range(1000):
+            key = key_between(key, None)
+        self.assertLessEqual(len(key), 6)
+
+    def test_out_of_order_bounds_are_rejected(self):
+        with self.assertRaises(ValueError):
+            key_between('b', 'a')
+
+
+class LegalTaskMoveTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+        self.tasks = [
+            LegalTask.objects.create(title=f'Task {i}', description='', due_date=date.today())
+            for i in range(3)
+        ]
+
+    def column(self, status):
+        return list(LegalTask.objects.filter(status=status).order_by('rank').values_list('title', flat=True))
+
+    def post_moves(self, moves):
+        return self.client.post(
+            '/contracts/api/legal-tasks/moves/',
+            data=json.dumps({'moves': moves}),
+            content_type='application/json'
+        )
+
+    def test_new_tasks_are_appended(self):
+        self.assertEqual(self.column('PENDING'), ['Task 0', 'Task 1', 'Task 2'])
+
+    def test_reorder_within_column_updates_one_row(self):
+        first, second, third = self.tasks
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post_moves([{'id': third.pk, 'after_id': first.pk, 'before_id': second.pk}])
+        self.assertEqual(response.status_code, 200)
+        updates = [q for q in queries.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(self.column('PENDING'), ['Task 0', 'Task 2', 'Task 1'])
+
+    def test_batch_moves_across_columns(self):
+        first, second, third = self.tasks
+        response = self.post_moves([
+            {'id': first.pk, 'status': 'IN_PROGRESS'},
+            {'id': third.pk, 'status': 'IN_PROGRESS', 'position': 0},
+        ])
+        self.assertTrue(response.json()['success'])
+        self.assertEqual(self.column('IN_PROGRESS'), ['Task 2', 'Task 0'])
+        self.assertEqual(self.column('PENDING'), ['Task 1'])
+
+    def test_invalid_batch_is_rolled_back(self):
+        first = self.tasks[0]
+        response = self.post_moves([
+            {'id': first.pk, 'status': 'COMPLETED'},
+            {'id': 999999, 'status': 'COMPLETED'},
+        ])
+        self.assertEqual(response.status_code, 400)
+        first.refresh_from_db()
+        self.assertEqual(first.status, 'PENDING')
+
+    def test_single_card_status_endpoint(self):
+        task = self.tasks[1]
+        response = self.client.post(
+            f'/contracts/legal-tasks/{task.pk}/update-status/',
+            data=json.dumps({'status': 'COMPLETED'}),
+            content_type='application/json'
+        )
+        self.assertTrue(response.json()['success'])
+        task.refresh_from_db()
+        self.assertEqual(task.status, 'COMPLETED')
+
+
+class KanbanBoardQueryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+        for i in range(5):
+            LegalTask.objects.create(title=f'Done {i}', description='', status='COMPLETED',
+                                     assigned_to=self.user, due_date=date.today())
+        LegalTask.objects.create(title='Open', description='', due_date=date.today())
+
+    def test_board_is_bounded_per_column(self):
+        with self.assertNumQueries(2):
+            columns = {c['status']: c for c in kanban.board_columns(per_column=2)}
+            [t.assigned_to for c in columns.values() for t in c['tasks']]
+
+        completed = columns['COMPLETED']
+        self.assertEqual(completed['total'], 5)
+        self.assertEqual([t.title for t in completed['tasks']], ['Done 0', 'Done 1'])
+        self.assertIsNotNone(completed['next_cursor'])
+        self.assertEqual(columns['PENDING']['total'], 1)
+        self.assertIsNone(columns['PENDING']['next_cursor'])
+        self.assertEqual(columns['CANCELLED']['tasks'], [])
+
+    def test_column_pages_follow_cursor(self):
+        first = kanban.column_page('COMPLETED', limit=2)
+        second = kanban.column_page('COMPLETED', first['next_cursor'], limit=2)
+        third = kanban.column_page('COMPLETED', second['next_cursor'], limit=2)
+
+        titles = [t.title for page in (first, second, third) for t in page['tasks']]
+        self.assertEqual(titles, [f'Done {i}' for i in range(5)])
+        self.assertIsNone(third['next_cursor'])
+
+    def test_load_more_endpoint_renders_cards(self):
+        page = kanban.column_page('COMPLETED', limit=1)
+        response = self.client.get(
+            f"/contracts/api/legal-tasks/columns/COMPLETED/?cursor={page['next_cursor']}&limit=2"
+        )
+        data = response.json()['data']
+        self.assertEqual(len(data['ids']), 2)
+        self.assertIn('Done 1', data['html'])
+        self.assertIsNotNone(data['next_cursor'])
+
+    def test_board_page_renders_columns(self):
+        response = self.client.get('/contracts/legal-tasks/')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Done 0')
+        self.assertContains(response, 'data-status="CANCELLED"')
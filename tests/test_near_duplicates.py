@@ -0,0 +1,102 @@
+"""
+Tests for MinHash/LSH near-duplicate detection
+"""
+import io
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from contracts.domain import minhash
+from contracts.models import Contract, SignatureBand, TextSignature
+from contracts.services import near_duplicates
+from contracts.services.clause_usage import library_patterns
+
+BASE = (
+    'The Supplier shall deliver the goods described in Schedule A to the premises of the Customer '
+    'within thirty days of the order date, and shall bear all costs of carriage and insurance until '
+    'the goods are accepted in writing by an authorised representative of the Customer.'
+)
+VARIANT = BASE.replace('thirty days', 'forty five days')
+OTHER = (
+    'Either party may terminate this agreement by giving ninety days written notice to the other '
+    'party, provided that all fees accrued up to the termination date remain payable in full.'
+)
+
+
+class MinHashTests(SimpleTestCase):
+    def test_signatures_estimate_jaccard_similarity(self):
+        base, variant, other = (minhash.signature(text) for text in (BASE, VARIANT, OTHER))
+        self.assertEqual(minhash.estimate_similarity(base, minhash.signature(BASE.upper())), 1.0)
+        self.assertGreater(minhash.estimate_similarity(base, variant), 0.6)
+        self.assertLess(minhash.estimate_similarity(base, other), 0.2)
+
+    def test_signature_round_trips_through_bytes(self):
+        sig = minhash.signature(BASE)
+        data = minhash.to_bytes(sig)
+        self.assertEqual(len(data), minhash.NUM_PERM * 4)
+        self.assertTrue((minhash.from_bytes(data) == sig).all())
+        self.assertEqual(len(minhash.band_keys(sig)), minhash.BANDS)
+
+    def test_text_without_words_is_empty(self):
+        self.assertTrue(minhash.is_empty(minhash.signature(' -- ')))
+        self.assertFalse(minhash.is_empty(minhash.signature('net thirty')))
+
+
+class NearDuplicateTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+        self.base = Contract.objects.create(title='Supply', content=BASE)
+        self.copy = Contract.objects.create(title='Supply copy', content=BASE + ' ')
+        self.other = Contract.objects.create(title='Termination', content=OTHER)
+
+    def test_contracts_are_signed_on_save_and_delete(self):
+        self.assertEqual(TextSignature.objects.filter(kind=TextSignature.Kind.CONTRACT).count(), 3)
+        self.assertEqual(SignatureBand.objects.count(), 3 * minhash.BANDS)
+        self.other.delete()
+        self.assertFalse(TextSignature.objects.filter(object_id=str(self.other.pk)).exists())
+
+    def test_unchanged_content_is_not_resigned(self):
+        self.assertFalse(near_duplicates.update_contract(self.base))
+        self.other.content = BASE
+        self.other.save(update_fields=['content'])
+        ids = [match.object_id for match in near_duplicates.find_near_duplicates('contract', self.base.pk)]
+        self.assertEqual(ids, [str(self.copy.pk), str(self.other.pk)])
+
+    def test_find_near_duplicates(self):
+        matches = near_duplicates.find_near_duplicates('contract', self.base.pk)
+        self.assertEqual([(m.object_id, m.title, m.similarity) for m in matches],
+                         [(str(self.copy.pk), 'Supply copy', 1.0)])
+        self.assertEqual(near_duplicates.find_near_duplicates('contract', self.other.pk), [])
+
+    def test_duplicate_clusters(self):
+        Contract.objects.create(title='Supply v2', content=VARIANT)
+        clusters = near_duplicates.duplicate_clusters('contract', threshold=0.5)
+        self.assertEqual(len(clusters), 1)
+        self.assertEqual([title for _, title in clusters[0].members], ['Supply', 'Supply copy', 'Supply v2'])
+
+    def test_clause_signatures_follow_the_library(self):
+        near_duplicates.sync_clauses()
+        self.assertEqual(
+            set(TextSignature.objects.filter(kind=TextSignature.Kind.CLAUSE).values_list('object_id', flat=True)),
+            {clause_id for clause_id, _ in library_patterns()},
+        )
+
+    def test_build_command_rebuilds_missing_signatures(self):
+        TextSignature.objects.all().delete()
+        out = io.StringIO()
+        call_command('build_minhash_index', stdout=out)
+        self.assertIn(f'Signed 3 contracts and {len(library_patterns())} clauses', out.getvalue())
+        call_command('build_minhash_index', stdout=out)
+        self.assertIn('Signed 0 contracts and 0 clauses', out.getvalue())
+
+    def test_api(self):
+        response = self.client.get('/contracts/api/near-duplicates/', {'kind': 'contract', 'id': self.copy.pk})
+        self.assertEqual([r['id'] for r in response.json()['data']['results']], [str(self.base.pk)])
+
+        response = self.client.get('/contracts/api/near-duplicates/clusters/')
+        self.assertEqual(response.json()['data']['clusters'][0]['size'], 2)
+
+        response = self.client.get('/contracts/api/near-duplicates/', {'kind': 'memo', 'id': 1})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,109 @@
+"""
+Tests for rule-based obligation extraction
+"""
+import io
+import json
+from datetime import date, datetime
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from contracts.domain import obligation_rules
+from contracts.models import Contract, ContractScan, ObligationCandidate
+from contracts.services import obligation_extraction
+from contracts.services.obligations import obligation_service
+
+TEXT = '''1. The Supplier shall deliver the goods within thirty (30) days of the order date.
+2. The Customer must pay each invoice within 10 business days of receipt.
+3. The Supplier shall renew its insurance certificate annually on June 30.
+4. The Licensee agrees to submit a usage report no later than March 1, 2025.
+5. The Supplier will provide service reports quarterly.
+6. Notices may be sent by email within 5 days.'''
+
+
+class ObligationRuleTests(SimpleTestCase):
+    def test_deadline_phrases_are_resolved(self):
+        found = obligation_rules.extract(TEXT, date(2024, 1, 5))
+        self.assertEqual(
+            [(c.rule, c.title, c.due_date) for c in found],
+            [
+                ('relative', 'Deliver the goods', date(2024, 2, 4)),
+                ('relative', 'Pay each invoice', date(2024, 1, 19)),
+                ('anniversary', 'Renew its insurance certificate', date(2024, 6, 30)),
+                ('absolute', 'Submit a usage report', date(2025, 3, 1)),
+                ('recurring', 'Provide service reports', date(2024, 4, 5)),
+            ],
+        )
+
+    def test_anniversary_rolls_over_to_next_year(self):
+        found = obligation_rules.extract('Rent shall be reviewed on the 1st of April of each year.', date(2024, 5, 1))
+        self.assertEqual(found[0].due_date, date(2025, 4, 1))
+
+    def test_months_are_clamped_to_month_end(self):
+        self.assertEqual(obligation_rules.add_months(date(2024, 1, 31), 1), date(2024, 2, 29))
+
+
+class ObligationExtractionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+        self.contract = Contract.objects.create(title='Supply', content=TEXT)
+        Contract.objects.filter(pk=self.contract.pk).update(
+            created_at=timezone.make_aware(datetime(2024, 1, 5, 12))
+        )
+        self.contract.refresh_from_db()
+        self.other = Contract.objects.create(title='Letter', content='Thanks for your business.')
+
+    def titles(self, status=ObligationCandidate.Status.PROPOSED):
+        return list(self.contract.obligation_candidates.filter(status=status).values_list('title', flat=True))
+
+    def test_extract_all_is_incremental(self):
+        stats = obligation_extraction.extract_all()
+        self.assertEqual(stats, {'scanned': 2, 'skipped': 0, 'candidates': 5})
+        self.assertEqual(len(self.titles()), 5)
+
+        Contract.objects.filter(pk=self.other.pk).update(content='The Buyer shall pay monthly.')
+        stats = obligation_extraction.extract_all()
+        self.assertEqual(stats, {'scanned': 1, 'skipped': 1, 'candidates': 1})
+        self.assertTrue(ContractScan.objects.filter(
+            contract=self.other, analyzer=ContractScan.Analyzer.OBLIGATIONS,
+        ).exists())
+
+    def test_extract_all_with_process_pool(self):
+        stats = obligation_extraction.extract_all(workers=2, batch_size=1)
+        self.assertEqual(stats, {'scanned': 2, 'skipped': 0, 'candidates': 5})
+
+    def test_reviewed_candidates_are_not_proposed_again(self):
+        obligation_extraction.extract_contract(self.contract)
+        deliver = self.contract.obligation_candidates.get(title='Deliver the goods')
+        obligation_extraction.reject(deliver, self.user)
+
+        self.assertFalse(obligation_extraction.extract_contract(self.contract))
+        self.assertTrue(obligation_extraction.extract_contract(self.contract, force=True))
+        self.assertNotIn('Deliver the goods', self.titles())
+        self.assertEqual(self.titles(ObligationCandidate.Status.REJECTED), ['Deliver the goods'])
+
+    def test_review_api_accepts_into_obligation_service(self):
+        obligation_extraction.extract_contract(self.contract)
+        data = self.client.get('/contracts/api/obligations/candidates/', {'contract_id': self.contract.pk}).json()
+        candidate = data['data']['candidates'][0]
+        self.assertEqual((candidate['title'], candidate['due_date']), ('Deliver the goods', '2024-02-04'))
+
+        response = self.client.post(f"/contracts/api/obligations/candidates/{candidate['id']}/review/",
+                                    json.dumps({'action': 'accept', 'priority': 'high'}),
+                                    content_type='application/json')
+        obligation_id = response.json()['data']['obligation_id']
+        obligation = obligation_service._obligations[obligation_id]
+        self.assertEqual((obligation.title, obligation.due_date, obligation.contract_id),
+                         ('Deliver the goods', '2024-02-04', str(self.contract.pk)))
+
+        response = self.client.post(f"/contracts/api/obligations/candidates/{candidate['id']}/review/",
+                                    json.dumps({'action': 'reject'}), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_extract_command(self):
+        out = io.StringIO()
+        call_command('extract_obligations', '--workers', '1', stdout=out)
+        self.assertIn('Extracted 2 contracts (0 unchanged), proposed 5 obligations.', out.getvalue())
@@ -0,0 +1,93 @@
+"""
+Tests for contract risk scoring
+"""
+import io
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from contracts.models import Contract, DueDiligenceProcess, DueDiligenceRisk, RiskLog
+from contracts.services import risk_scoring
+
+LIABILITY = 'In no event shall the Company be liable for indirect damages.'
+
+
+class ComputeScoresTests(SimpleTestCase):
+    def test_scores_rise_with_each_feature(self):
+        base = dict(status=np.array([0.3]), value=np.array([0.0]), library_clauses=np.array([1.0]),
+                    missing_standard=np.array([0.0]), risk_points=np.array([0.0]), standard_total=3)
+        baseline = risk_scoring.compute_scores(**base)[0]
+        for feature, worse in [('status', 1.0), ('value', 1e6), ('library_clauses', 0.0),
+                               ('missing_standard', 3.0), ('risk_points', 6.0)]:
+            scores = risk_scoring.compute_scores(**{**base, feature: np.array([worse])})
+            self.assertGreater(scores[0], baseline, feature)
+
+    def test_scores_are_bounded(self):
+        scores = risk_scoring.compute_scores(
+            status=np.array([1.0, 0.0]), value=np.array([1e12, 0.0]), library_clauses=np.array([0.0, 50.0]),
+            missing_standard=np.array([3.0, 0.0]), risk_points=np.array([100.0, 0.0]), standard_total=3,
+        )
+        self.assertEqual(scores[0], 100.0)
+        self.assertGreaterEqual(scores[1], 0.0)
+
+
+class RiskScoringTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+        self.safe = Contract.objects.create(title='Safe', content=LIABILITY, status=Contract.Status.EXPIRED)
+        self.risky = Contract.objects.create(title='Risky', content='No standard terms.',
+                                             status=Contract.Status.EXECUTED, value=Decimal('2500000'))
+
+    def score(self, contract):
+        return Contract.objects.values_list('risk_score', flat=True).get(pk=contract.pk)
+
+    def test_scores_are_stored_on_save(self):
+        self.assertGreater(self.score(self.risky), self.score(self.safe))
+        self.assertEqual(self.risky.risk_score, self.score(self.risky))
+
+        before = self.score(self.safe)
+        self.safe.status = Contract.Status.EXECUTED
+        self.safe.save(update_fields=['status'])
+        self.assertGreater(self.score(self.safe), before)
+
+    def test_linked_risks_rescore_their_contract(self):
+        before = self.score(self.safe)
+        risk = RiskLog.objects.create(title='Key person', description='-', risk_level='HIGH',
+                                      linked_contract=self.safe)
+        raised = self.score(self.safe)
+        self.assertGreater(raised, before)
+
+        process = DueDiligenceProcess.objects.create(
+            title='Deal', transaction_type='MERGER', target_company='Target',
+            start_date=date(2024, 1, 1), target_completion_date=date(2024, 6, 1),
+        )
+        dd_risk = DueDiligenceRisk.objects.create(
+            process=process, contract=self.safe, title='Change of control', category='LEGAL',
+            description='-', risk_level='MEDIUM', likelihood='LOW', impact='MEDIUM',
+        )
+        self.assertGreater(self.score(self.safe), raised)
+
+        # Moving a risk rescores both contracts
+        risk.linked_contract = self.risky
+        risk.save()
+        dd_risk.status = 'CLOSED'
+        dd_risk.save()
+        self.assertAlmostEqual(self.score(self.safe), before)
+
+    def test_list_sorts_and_filters_by_risk(self):
+        response = self.client.get('/contracts/?sort=risk')
+        self.assertEqual([c.title for c in response.context['contracts']], ['Risky', 'Safe'])
+        response = self.client.get(f'/contracts/?min_risk={self.score(self.risky)}')
+        self.assertEqual([c.title for c in response.context['contracts']], ['Risky'])
+
+    def test_score_command(self):
+        Contract.objects.update(risk_score=0)
+        out = io.StringIO()
+        call_command('score_contract_risk', '--batch-size', '1', stdout=out)
+        self.assertIn('Scored 2 contracts, 2 changed.', out.getvalue())
+        self.assertGreater(self.score(self.risky), 0)
@@ -0,0 +1,119 @@
+"""
+Tests for server-side saved views and their cached results
+"""
+import json
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from contracts.domain.contracts import ContractStatus, ListParams
+from contracts.models import Contract, Job, SavedView
+from contracts.services import jobs, saved_views
+
+
+class SavedViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+        for title, status in [('A', Contract.Status.DRAFT), ('B', Contract.Status.DRAFT),
+                              ('C', Contract.Status.EXECUTED)]:
+            Contract.objects.create(title=title, content='-', status=status, created_by=self.user)
+        self.view = SavedView.objects.create(user=self.user, name='Drafts', params={'status': ['DRAFT']},
+                                             starred=True)
+
+    def test_params_round_trip(self):
+        params = ListParams(q='acme', status=[ContractStatus.DRAFT], value_min=10.0, page=3)
+        data = saved_views.params_to_dict(params)
+        self.assertEqual(data, {'q': 'acme', 'status': ['DRAFT'], 'value_min': 10.0})
+        restored = saved_views.params_from_dict(data)
+        self.assertEqual((restored.status, restored.page), ([ContractStatus.DRAFT], 1))
+        with self.assertRaises(ValueError):
+            saved_views.params_from_dict({'page': 2})
+
+    def test_results_cached_until_a_contract_changes(self):
+        result, cached = saved_views.results(self.view)
+        self.assertEqual((result['count'], cached), (2, False))
+        with self.assertNumQueries(1):  # The owner's generation
+            result, cached = saved_views.results(self.view)
+        self.assertTrue(cached)
+
+        Contract.objects.create(title='D', content='-', created_by=self.user)
+        result, cached = saved_views.results(self.view)
+        self.assertEqual((result['count'], cached), (3, False))
+
+    def test_generation_is_read_from_the_database(self):
+        saved_views.refresh(self.view)
+        # A write through another worker leaves this process's cache untouched
+        Contract.objects.filter(title='C').update(status=Contract.Status.DRAFT, updated_at=timezone.now())
+        self.assertIsNone(saved_views.cached_count(self.view))
+        self.assertEqual(saved_views.results(self.view)[0]['count'], 3)
+
+        Contract.objects.filter(title='C').delete()
+        self.assertEqual(saved_views.results(self.view)[0]['count'], 2)
+
+    def test_no_refresh_job_with_a_process_local_cache(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Contract.objects.create(title='D', content='-', created_by=self.user)
+        self.assertFalse(Job.objects.filter(name=saved_views.REFRESH_JOB).exists())
+
+    def test_contract_changes_schedule_one_refresh(self):
+        shared = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                              'LOCATION': tempfile.mkdtemp()}}
+        with override_settings(CACHES=shared):
+            self._check_one_refresh()
+
+    def _check_one_refresh(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Contract.objects.create(title='D', content='-', created_by=self.user)
+            Contract.objects.filter(title='A').first().save()
+        job = Job.objects.get(name=saved_views.REFRESH_JOB)
+        self.assertEqual(job.payload, {'user_id': self.user.pk})
+
+        jobs.run_job(job)
+        self.assertEqual(saved_views.cached_count(self.view), 3)
+        result, cached = saved_views.results(self.view)
+        self.assertTrue(cached)
+
+    def test_bulk_update_invalidates(self):
+        saved_views.refresh(self.view)
+        self.client.post(reverse('contracts:bulk_update_contracts'), json.dumps({
+            'ids': list(Contract.objects.values_list('pk', flat=True)), 'patch': {'status': 'DRAFT'},
+        }), content_type='application/json')
+        self.assertIsNone(saved_views.cached_count(self.view))
+        self.assertEqual(saved_views.results(self.view)[0]['count'], 3)
+
+    def test_api(self):
+        url = reverse('contracts:saved_views_api')
+        response = self.client.post(url, json.dumps({
+            'name': 'Executed', 'params': {'status': ['EXECUTED'], 'q': ''}, 'starred': True,
+        }), content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        created = response.json()['data']
+        self.assertEqual((created['params'], created['count']), ({'status': ['EXECUTED']}, 1))
+
+        views = self.client.get(url).json()['data']['views']
+        self.assertEqual([view['name'] for view in views], ['Drafts', 'Executed'])
+
+        detail = reverse('contracts:saved_view_api', args=[created['id']])
+        response = self.client.patch(detail, json.dumps({'name': 'Signed'}), content_type='application/json')
+        self.assertEqual(response.json()['data']['name'], 'Signed')
+
+        response = self.client.get(reverse('contracts:saved_view_results_api', args=[created['id']]))
+        data = response.json()['data']
+        self.assertEqual(([row['title'] for row in data['rows']], data['cached']), (['C'], True))
+
+        self.assertEqual(self.client.delete(detail).status_code, 200)
+        self.assertFalse(SavedView.objects.filter(pk=created['id']).exists())
+
+        other = User.objects.create_user(username='other', password='testpass123')
+        theirs = SavedView.objects.create(user=other, name='Theirs')
+        response = self.client.get(reverse('contracts:saved_view_results_api', args=[theirs.pk]))
+        self.assertEqual(response.status_code, 404)
+        response = self.client.post(url, json.dumps({'name': 'Bad', 'params': {'page': 2}}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
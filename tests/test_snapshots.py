@@ -0,0 +1,71 @@
+"""
+Tests for daily status snapshots and trend reports
+"""
+import io
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from contracts.models import Contract, LegalTask, StatusSnapshot
+from contracts.services import snapshots
+
+
+class SnapshotTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+        Contract.objects.create(title='A', content='-', value=Decimal('100'))
+        Contract.objects.create(title='B', content='-', value=Decimal('250.50'))
+        Contract.objects.create(title='C', content='-', status=Contract.Status.EXECUTED)
+        for status in ('PENDING', 'PENDING', 'COMPLETED'):
+            LegalTask.objects.create(title='T', description='-', status=status, assigned_to=self.user,
+                                     due_date=date(2024, 1, 1))
+
+    def test_snapshot_groups_by_status_and_owner(self):
+        # Savepoint, delete and release, one grouped query per source and
+        # an insert for each of the two sources that have rows
+        with self.assertNumQueries(3 + len(snapshots.SOURCES) + 2):
+            written = snapshots.take_snapshot(date(2024, 1, 1))
+        self.assertEqual(written['contracts'], 2)
+        self.assertEqual(written['legal_tasks'], 2)
+
+        draft = StatusSnapshot.objects.get(date=date(2024, 1, 1), source='contracts', status='DRAFT')
+        self.assertEqual((draft.count, draft.total), (2, Decimal('350.50')))
+        pending = StatusSnapshot.objects.get(source='legal_tasks', status='PENDING')
+        self.assertEqual((pending.owner, pending.count), (self.user, 2))
+
+    def test_snapshot_for_a_day_is_rewritten(self):
+        snapshots.take_snapshot(date(2024, 1, 1))
+        Contract.objects.create(title='D', content='-')
+        snapshots.take_snapshot(date(2024, 1, 1))
+        self.assertEqual(
+            StatusSnapshot.objects.get(date=date(2024, 1, 1), source='contracts', status='DRAFT').count, 3
+        )
+
+    def test_trend_reads_snapshots_only(self):
+        snapshots.take_snapshot(date(2024, 1, 1))
+        Contract.objects.filter(title='A').update(status=Contract.Status.EXECUTED)
+        snapshots.take_snapshot(date(2024, 1, 2))
+
+        with self.assertNumQueries(1):
+            data = snapshots.trend('contracts', end=date(2024, 1, 2))
+        self.assertEqual(data['dates'], ['2024-01-01', '2024-01-02'])
+        self.assertEqual(data['series'], {'DRAFT': [2, 1], 'EXECUTED': [1, 2]})
+
+        totals = snapshots.trend('contracts', end=date(2024, 1, 2), metric='total')
+        self.assertEqual(totals['series']['DRAFT'], [350.5, 250.5])
+
+    def test_trend_api(self):
+        snapshots.take_snapshot()
+        data = self.client.get('/contracts/api/trends/legal_tasks/', {'owner': self.user.pk}).json()['data']
+        self.assertEqual(data['series'], {'COMPLETED': [1], 'PENDING': [2]})
+        self.assertEqual(self.client.get('/contracts/api/trends/nothing/').status_code, 400)
+
+    def test_snapshot_command(self):
+        out = io.StringIO()
+        call_command('take_snapshots', '--date', '2024-03-01', stdout=out)
+        self.assertIn(f'for {len(snapshots.SOURCES)} sources', out.getvalue())
+        self.assertTrue(StatusSnapshot.objects.filter(date=date(2024, 3, 1)).exists())
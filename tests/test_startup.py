@@ -0,0 +1,49 @@
+"""
+Tests for lazy service loading and the startup profile command
+"""
+import io
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from contracts.management.commands.startup_profile import group_self_time, parse_importtime
+from contracts.services import clauses, get_clause_service
+
+
+class LazyStartupTests(SimpleTestCase):
+    def test_service_singletons(self):
+        self.assertIs(clauses.clause_service, clauses.get_clause_service())
+        self.assertIs(get_clause_service(), clauses.clause_service)
+        with self.assertRaises(AttributeError):
+            clauses.template_service
+
+    def test_web_worker_start_skips_heavy_modules(self):
+        code = (
+            'import django, importlib, sys; django.setup(); importlib.import_module("config.urls"); '
+            'print(sorted(m for m in ("numpy", "django_browser_reload") if m in sys.modules))'
+        )
+        result = subprocess.run([sys.executable, '-c', code], cwd=settings.BASE_DIR, capture_output=True,
+                                text=True, env={'DJANGO_SETTINGS_MODULE': 'config.settings', 'PATH': ''})
+        self.assertEqual(result.stdout.strip(), '[]', result.stderr)
+
+
+class StartupProfileTests(SimpleTestCase):
+    def test_parse_and_group(self):
+        rows = parse_importtime(
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       100 |        100 |     django.utils\n'
+            'import time:        50 |        250 |   django.db.models\n'
+            'import time:        20 |         20 | contracts\n'
+        )
+        self.assertEqual(rows[1], ('django.db.models', 50, 250))
+        self.assertEqual(group_self_time(rows, 1), {'django': 150, 'contracts': 20})
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command('startup_profile', 'setup', '--limit', '3', stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertIn("'setup':", lines[-1])
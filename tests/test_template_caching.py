@@ -0,0 +1,83 @@
+"""
+Tests for the production template loader and cached template fragments
+"""
+import importlib
+import os
+import sys
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from config import settings as base_settings
+from contracts.models import Contract, LegalTask
+from contracts.services import dashboard
+
+
+class ProductionSettingsTests(SimpleTestCase):
+    def test_cached_loader_without_debug(self):
+        sys.modules.pop('config.production', None)
+        with mock.patch.dict(os.environ, {'DJANGO_SECRET_KEY': 'secret', 'DJANGO_ALLOWED_HOSTS': 'a.example,b.example'}):
+            production = importlib.import_module('config.production')
+        self.assertFalse(production.DEBUG)
+        self.assertEqual(production.ALLOWED_HOSTS, ['a.example', 'b.example'])
+        template_settings = production.TEMPLATES[0]
+        self.assertFalse(template_settings['APP_DIRS'])
+        loader, wrapped = template_settings['OPTIONS']['loaders'][0]
+        self.assertEqual(loader, 'django.template.loaders.cached.Loader')
+        self.assertIn('django.template.loaders.app_directories.Loader', wrapped)
+        # The development settings are left as they were
+        self.assertTrue(base_settings.TEMPLATES[0]['APP_DIRS'])
+        self.assertNotIn('loaders', base_settings.TEMPLATES[0]['OPTIONS'])
+
+
+class FragmentCachingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+        cache.clear()
+
+    def test_task_card_follows_updated_at(self):
+        task = LegalTask.objects.create(title='Review NDA', description='-', due_date='2030-01-01')
+        self.assertContains(self.client.get(reverse('contracts:legal_task_board')), 'Review NDA')
+
+        # A write that leaves updated_at alone is not seen by the cached card
+        LegalTask.objects.filter(pk=task.pk).update(title='Review MSA')
+        response = self.client.get(reverse('contracts:legal_task_board'))
+        self.assertContains(response, 'Review NDA')
+
+        task.refresh_from_db()
+        task.save()
+        response = self.client.get(reverse('contracts:legal_task_board'))
+        self.assertContains(response, 'Review MSA')
+        self.assertNotContains(response, 'Review NDA')
+
+    def test_contract_rows_follow_bulk_updates(self):
+        contract = Contract.objects.create(title='MSA', content='-', created_by=self.user)
+        self.assertContains(self.client.get(reverse('contracts:contract_list')), 'MSA')
+        response = self.client.post(
+            reverse('contracts:bulk_update_contracts'),
+            {'ids': [str(contract.pk)], 'patch': {'title': 'Master agreement'}},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(self.client.get(reverse('contracts:contract_list')), 'Master agreement')
+
+    def test_navigation_counts_follow_writes(self):
+        LegalTask.objects.create(title='One', description='-', due_date='2030-01-01')
+        url = reverse('contracts:legal_task_board')
+        self.assertRegex(self.client.get(url).content.decode(), r'Legal Tasks\s*<span[^>]*>1</span>')
+
+        # The cached navigation never reads the counts
+        with mock.patch.object(dashboard, 'counters', side_effect=AssertionError):
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+        two = LegalTask.objects.create(title='Two', description='-', due_date='2030-01-01')
+        self.assertRegex(self.client.get(url).content.decode(), r'Legal Tasks\s*<span[^>]*>2</span>')
+
+        # Completing a card on the board is a queryset update, which sends no signals
+        self.client.post(reverse('contracts:legal_task_moves_api'), {'moves': [{'id': two.pk, 'status': 'COMPLETED'}]},
+                         content_type='application/json')
+        self.assertRegex(self.client.get(url).content.decode(), r'Legal Tasks\s*<span[^>]*>1</span>')
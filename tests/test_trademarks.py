@@ -0,0 +1,91 @@
+"""
+Tests for the trademark similarity index
+"""
+import io
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from contracts.domain import similarity
+from contracts.models import TrademarkIndexEntry, TrademarkRequest
+from contracts.services import trademarks
+
+
+class SimilarityKeyTests(SimpleTestCase):
+    def test_soundex(self):
+        self.assertEqual(similarity.soundex('Robert'), 'R163')
+        self.assertEqual(similarity.soundex('Rupert'), 'R163')
+        self.assertEqual(similarity.soundex('Ashcraft'), 'A261')
+        self.assertEqual(similarity.soundex('Tymczak'), 'T522')
+
+    def test_trigrams_ignore_case_and_punctuation(self):
+        self.assertEqual(similarity.trigrams('Acme!'), similarity.trigrams('  acme '))
+        self.assertIn('  a', similarity.trigrams('Acme'))
+
+    def test_identical_marks_score_one(self):
+        grams, keys = similarity.trigrams('Bolt'), similarity.phonetic_keys('Bolt')
+        self.assertEqual(similarity.score(grams, keys, grams, keys), 1.0)
+
+
+class TrademarkSearchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+        for mark in ['Kool Breeze', 'Sunrise Coffee', 'Bolton Legal', 'Apex Logistics']:
+            TrademarkRequest.objects.create(mark_text=mark, description='', goods_services='', filing_basis='Use')
+
+    def test_marks_are_indexed_on_save(self):
+        mark = TrademarkRequest.objects.get(mark_text='Bolton Legal')
+        self.assertTrue(mark.index_entries.filter(kind='P').exists())
+        mark.mark_text = 'Bolton Law'
+        mark.save()
+        self.assertIn(' la', set(mark.index_entries.values_list('term', flat=True)))
+        self.assertNotIn('gal', set(mark.index_entries.values_list('term', flat=True)))
+
+    def test_find_similar_ranks_by_score(self):
+        with self.assertNumQueries(3):
+            matches = trademarks.find_similar('Cool Breeze')
+        self.assertEqual(matches[0].mark_text, 'Kool Breeze')
+        self.assertNotIn('Apex Logistics', [m.mark_text for m in matches])
+
+    def test_misspelled_mark_still_matches(self):
+        matches = trademarks.find_similar('Sunryse Kofee', min_score=0)
+        self.assertEqual(matches[0].mark_text, 'Sunrise Coffee')
+
+    def test_similar_api(self):
+        response = self.client.get('/contracts/api/trademarks/similar/?q=Bolton%20Legal')
+        results = response.json()['data']['results']
+        self.assertEqual(results[0]['mark_text'], 'Bolton Legal')
+        self.assertEqual(results[0]['score'], 1.0)
+
+    def test_create_view_requires_confirmation_for_conflicts(self):
+        data = {'mark_text': 'Kool Breeze', 'description': 'Drinks', 'goods_services': 'Class 32',
+                'filing_basis': 'Use'}
+        response = self.client.post('/contracts/trademarks/new/', data)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'confirm_similar')
+        self.assertEqual(TrademarkRequest.objects.filter(mark_text='Kool Breeze').count(), 1)
+
+        response = self.client.post('/contracts/trademarks/new/', {**data, 'confirm_similar': '1'})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(TrademarkRequest.objects.filter(mark_text='Kool Breeze').count(), 2)
+
+    def test_update_view_checks_only_a_changed_mark(self):
+        mark = TrademarkRequest.objects.create(mark_text='Kool Breez', description='', goods_services='',
+                                               filing_basis='Use')
+        url = f'/contracts/trademarks/{mark.pk}/edit/'
+        data = {'mark_text': 'Kool Breez', 'description': 'Drinks', 'goods_services': 'Class 32',
+                'filing_basis': 'Use'}
+        self.assertEqual(self.client.post(url, data).status_code, 302)
+        self.assertEqual(TrademarkRequest.objects.get(pk=mark.pk).description, 'Drinks')
+
+        response = self.client.post(url, {**data, 'mark_text': 'Sunrise Coffees'})
+        self.assertContains(response, 'confirm_similar')
+
+    def test_rebuild_command(self):
+        TrademarkIndexEntry.objects.all().delete()
+        out = io.StringIO()
+        call_command('rebuild_trademark_index', stdout=out)
+        self.assertIn('Indexed 4', out.getvalue())
+        self.assertEqual(trademarks.find_similar('Apex Logistics')[0].score, 1.0)
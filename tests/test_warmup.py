@@ -0,0 +1,40 @@
+"""
+Tests for the worker warm-up routine
+"""
+import io
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from contracts.models import Contract
+from contracts.services import dashboard, warmup
+
+
+class WarmUpTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+        Contract.objects.create(title='MSA', content='-', created_by=self.user)
+        cache.clear()
+
+    def test_command_primes_caches_and_reports_timings(self):
+        out = io.StringIO()
+        call_command('warm_up', stdout=out)
+        report = out.getvalue()
+        for name, _ in warmup.STEPS:
+            self.assertIn(f'{name} ', report)
+        self.assertIn('1 repository first pages', report)
+
+        with self.assertNumQueries(0):
+            dashboard.counters()
+        with self.assertNumQueries(2):  # Session and user only
+            response = self.client.get(reverse('contracts:contracts_api'))
+        self.assertEqual(response.json()['data']['total'], 1)
+
+    def test_url_step_counts_patterns(self):
+        timings = warmup.run([('urls', warmup.resolve_urls)])
+        self.assertEqual(timings[0].name, 'urls')
+        self.assertRegex(timings[0].detail, r'^\d+ patterns$')
@@ -401,6 +401,8 @@ class IroncladRepository {
     }
     
     loadSavedViews() {
+        // Render the last known views at once, then replace them with the server's
+        this.fetchSavedViews();
         try {
             return JSON.parse(localStorage.getItem('ironclad_saved_views') || '[]');
         } catch {
@@ -408,6 +410,20 @@ class IroncladRepository {
         }
     }
     
+    async fetchSavedViews() {
+        try {
+            const response = await fetch('/contracts/api/saved-views/');
+            const data = await response.json();
+            if (data.success) {
+                this.savedViews = data.data.views;
+                this.saveSavedViews();
+                this.renderSavedViews();
+            }
+        } catch (error) {
+            console.error('Failed to load saved views:', error);
+        }
+    }
+    
     saveSavedViews() {
         localStorage.setItem('ironclad_saved_views', JSON.stringify(this.savedViews));
     }